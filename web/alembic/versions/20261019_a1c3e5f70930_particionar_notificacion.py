@@ -0,0 +1,128 @@
+"""particionar notificacion por mes y crear notificacion_archivo
+
+En Postgres convierte `notificacion` en una tabla particionada por rango mensual
+de `fecha` (clave primaria (id_notificacion, fecha), partición por defecto para
+fechas sin partición) y copia las filas existentes. En otros motores solo crea el
+índice por usuario y fecha. En ambos casos crea la tabla de archivo.
+
+Revision ID: a1c3e5f70930
+Revises:
+Create Date: 2026-10-19 10:00:00
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "a1c3e5f70930"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Meses posteriores al actual que se dejan creados al migrar
+MESES_ADELANTE = 3
+
+COLUMNAS = """
+    id_notificacion UUID NOT NULL DEFAULT gen_random_uuid(),
+    id_usuario UUID REFERENCES usuario(id_usuario) ON DELETE CASCADE,
+    titulo VARCHAR(100) NOT NULL,
+    mensaje TEXT NOT NULL,
+    fecha TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    tipo VARCHAR(20) CHECK (tipo IN ('sistema', 'cita', 'material', 'calendario', 'mensaje', 'alerta', 'aviso')),
+    leida BOOLEAN NOT NULL DEFAULT FALSE,
+    accionable BOOLEAN DEFAULT FALSE,
+    accion VARCHAR(50),
+    accion_texto VARCHAR(50),
+    accion_icono VARCHAR(30),
+    referencia_id UUID,
+    referencia_tipo VARCHAR(30)
+"""
+
+
+def _sumar_meses(mes: date, meses: int) -> date:
+    indice = mes.year * 12 + mes.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def _es_particionada(conexion) -> bool:
+    relkind = conexion.execute(sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass('notificacion')")).scalar()
+    return relkind == "p"
+
+
+def _crear_tabla_archivo(conexion) -> None:
+    if sa.inspect(conexion).has_table("notificacion_archivo"):
+        return
+    op.create_table(
+        "notificacion_archivo",
+        sa.Column("id_notificacion", UUID(as_uuid=True), primary_key=True),
+        sa.Column("id_usuario", UUID(as_uuid=True), sa.ForeignKey("usuario.id_usuario", ondelete="CASCADE")),
+        sa.Column("titulo", sa.String(100), nullable=False),
+        sa.Column("mensaje", sa.Text, nullable=False),
+        sa.Column("fecha", sa.DateTime, nullable=False),
+        sa.Column("tipo", sa.String(20), nullable=False),
+        sa.Column("leida", sa.Boolean, nullable=False, server_default=sa.true()),
+        sa.Column("accionable", sa.Boolean, server_default=sa.false()),
+        sa.Column("accion", sa.String(50)),
+        sa.Column("accion_texto", sa.String(50)),
+        sa.Column("accion_icono", sa.String(30)),
+        sa.Column("referencia_id", UUID(as_uuid=True)),
+        sa.Column("referencia_tipo", sa.String(30)),
+        sa.Column("fecha_archivo", sa.DateTime, nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_notificacion_archivo_usuario_fecha", "notificacion_archivo", ["id_usuario", "fecha"])
+
+
+def upgrade() -> None:
+    conexion = op.get_bind()
+    _crear_tabla_archivo(conexion)
+
+    if conexion.dialect.name != "postgresql":
+        op.create_index("ix_notificacion_usuario_fecha", "notificacion", ["id_usuario", "fecha"])
+        return
+
+    if _es_particionada(conexion):
+        # La base se creó con script.sql, que ya define la tabla particionada
+        return
+
+    op.execute("ALTER TABLE notificacion RENAME TO notificacion_sin_particionar")
+    op.execute("ALTER TABLE notificacion_sin_particionar RENAME CONSTRAINT notificacion_pkey TO notificacion_sin_particionar_pkey")
+    op.execute(f"""
+        CREATE TABLE notificacion ({COLUMNAS},
+            PRIMARY KEY (id_notificacion, fecha)
+        ) PARTITION BY RANGE (fecha)
+    """)
+    op.execute("CREATE INDEX ix_notificacion_usuario_fecha ON notificacion (id_usuario, fecha)")
+    op.execute("CREATE TABLE notificacion_pdefault PARTITION OF notificacion DEFAULT")
+
+    primera = conexion.execute(sa.text("SELECT MIN(fecha) FROM notificacion_sin_particionar")).scalar()
+    actual = date.today().replace(day=1)
+    mes = primera.date().replace(day=1) if primera else actual
+    ultimo = _sumar_meses(actual, MESES_ADELANTE)
+    while mes <= ultimo:
+        siguiente = _sumar_meses(mes, 1)
+        op.execute(
+            f"CREATE TABLE notificacion_p{mes:%Y_%m} PARTITION OF notificacion "
+            f"FOR VALUES FROM ('{mes.isoformat()}') TO ('{siguiente.isoformat()}')"
+        )
+        mes = siguiente
+
+    op.execute("INSERT INTO notificacion SELECT * FROM notificacion_sin_particionar")
+    op.execute("DROP TABLE notificacion_sin_particionar")
+
+
+def downgrade() -> None:
+    conexion = op.get_bind()
+
+    if conexion.dialect.name == "postgresql" and _es_particionada(conexion):
+        op.execute("ALTER TABLE notificacion RENAME TO notificacion_particionada")
+        op.execute("ALTER TABLE notificacion_particionada RENAME CONSTRAINT notificacion_pkey TO notificacion_particionada_pkey")
+        op.execute(f"CREATE TABLE notificacion ({COLUMNAS}, PRIMARY KEY (id_notificacion))")
+        op.execute("INSERT INTO notificacion SELECT * FROM notificacion_particionada")
+        op.execute("DROP TABLE notificacion_particionada")
+    else:
+        op.drop_index("ix_notificacion_usuario_fecha", table_name="notificacion")
+
+    op.drop_index("ix_notificacion_archivo_usuario_fecha", table_name="notificacion_archivo")
+    op.drop_table("notificacion_archivo")
@@ -0,0 +1,35 @@
+"""índices compuestos para la paginación por cursor de los listados
+
+Revision ID: b2d4f6a81c41
+Revises: a1c3e5f70930
+Create Date: 2026-10-19 12:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "b2d4f6a81c41"
+down_revision: Union[str, None] = "a1c3e5f70930"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDICES = [
+    ("ix_aviso_fecha_envio_id", "aviso", ["fecha_envio", "id_aviso"]),
+    ("ix_documento_fecha_subida_id", "documento", ["fecha_subida", "id_documento"]),
+    ("ix_usuario_rol_nombre_id", "usuario", ["rol", "nombre", "id_usuario"]),
+    ("ix_estudiante_apellidos_nombre_id", "estudiante", ["primer_apellido", "segundo_apellido", "nombre", "id_estudiante"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for nombre, tabla, columnas in INDICES:
+        # Las bases creadas con script.sql ya los tienen
+        if nombre not in {indice["name"] for indice in inspector.get_indexes(tabla)}:
+            op.create_index(nombre, tabla, columnas)
+
+
+def downgrade() -> None:
+    for nombre, tabla, _ in reversed(INDICES):
+        op.drop_index(nombre, table_name=tabla)
@@ -0,0 +1,34 @@
+"""índices para los feeds paginados del contenido público (noticias, eventos, informes)
+
+Revision ID: c3e5a7b92d52
+Revises: b2d4f6a81c41
+Create Date: 2026-10-19 14:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "c3e5a7b92d52"
+down_revision: Union[str, None] = "b2d4f6a81c41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDICES = [
+    ("ix_noticia_fecha_publicacion_id", "noticia", ["fecha_publicacion", "id_noticia"]),
+    ("ix_evento_fecha_hora_id", "evento", ["fecha_hora", "id_evento"]),
+    ("ix_informe_junta_patronato_fecha_subida_id", "informe_junta_patronato", ["fecha_subida", "id_informe"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for nombre, tabla, columnas in INDICES:
+        # Las bases creadas con script.sql ya los tienen
+        if nombre not in {indice["name"] for indice in inspector.get_indexes(tabla)}:
+            op.create_index(nombre, tabla, columnas)
+
+
+def downgrade() -> None:
+    for nombre, tabla, _ in reversed(INDICES):
+        op.drop_index(nombre, table_name=tabla)
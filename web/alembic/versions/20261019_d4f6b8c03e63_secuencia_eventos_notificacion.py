@@ -0,0 +1,29 @@
+"""secuencia por usuario de los IDs de evento SSE (notificacion_contador.ultimo_evento)
+
+Revision ID: d4f6b8c03e63
+Revises: c3e5a7b92d52
+Create Date: 2026-10-19 16:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "d4f6b8c03e63"
+down_revision: Union[str, None] = "c3e5a7b92d52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Las bases creadas con script.sql ya la tienen
+    if "ultimo_evento" not in {columna["name"] for columna in inspector.get_columns("notificacion_contador")}:
+        op.add_column(
+            "notificacion_contador",
+            sa.Column("ultimo_evento", sa.BigInteger(), nullable=False, server_default="0")
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("notificacion_contador", "ultimo_evento")
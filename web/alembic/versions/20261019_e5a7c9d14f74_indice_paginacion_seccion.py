@@ -0,0 +1,28 @@
+"""índice compuesto para la paginación por cursor de secciones (grado, nombre, id)
+
+Revision ID: e5a7c9d14f74
+Revises: d4f6b8c03e63
+Create Date: 2026-10-19 17:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "e5a7c9d14f74"
+down_revision: Union[str, None] = "d4f6b8c03e63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDICE = "ix_seccion_grado_nombre_id"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Las bases creadas con script.sql ya lo tienen
+    if INDICE not in {indice["name"] for indice in inspector.get_indexes("seccion")}:
+        op.create_index(INDICE, "seccion", ["grado", "nombre", "id_seccion"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDICE, table_name="seccion")
@@ -1,19 +1,23 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.paginacion import agregar_cursor
 from app.modules.anio_lectivo import crud, schemas
 from app.modules.usuarios.schemas import UsuarioOut
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 
 @router.get("/obtener-anios-lectivos", response_model=List[schemas.AnioLectivo])
 def obtener_anios_lectivos(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: UsuarioOut = Depends(get_current_user)
 ):
@@ -22,6 +26,7 @@ def obtener_anios_lectivos(
     
     - **skip**: Número de registros a saltar (para paginación)
     - **limit**: Número máximo de registros a devolver
+    - **cursor**: Cursor de la cabecera X-Next-Cursor de la página anterior
     
     Requiere autenticación.
     """
@@ -32,7 +37,8 @@ def obtener_anios_lectivos(
             detail="No tiene permisos para realizar esta acción"
         )
     
-    anios_lectivos = crud.get_anios_lectivos(db, skip=skip, limit=limit)
+    anios_lectivos, next_cursor = crud.get_anios_lectivos(db, skip=skip, limit=limit, cursor=cursor)
+    agregar_cursor(response, next_cursor)
     return anios_lectivos
 
 
@@ -56,7 +62,7 @@ def obtener_anio_lectivo(
             detail="No tiene permisos para realizar esta acción"
         )
     
-    anio_lectivo = crud.get_anio_lectivo(db, id_anio=id_anio)
+    anio_lectivo = crud.get_anio_lectivo_ref(db, id_anio=id_anio)
     if anio_lectivo is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
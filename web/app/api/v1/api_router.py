@@ -1,8 +1,18 @@
 from fastapi import APIRouter
 from app.api.v1 import aviso, auth, usuario, materia, seccion, anio_lectivo, profesor, estudiante, padre, documento, notificacion
+from app.api.v1 import noticia, evento, junta_patronato
 
 api_router = APIRouter()
 
+# Rutas de datos de referencia servidas por la caché HTTP (app/core/cache_http.py)
+# y las etiquetas que las invalidan desde los crud
+RUTAS_CACHE_HTTP = {
+    "/materias/obtener-materias": ["materias"],
+    "/secciones/obtener-secciones": ["secciones"],
+    "/anios-lectivos/obtener-anios-lectivos": ["anios_lectivos"],
+    "/anios-lectivos/obtener-anio-lectivo-activo": ["anios_lectivos"],
+}
+
 api_router.include_router(
     auth.router,
     prefix="/auth",
@@ -69,6 +79,24 @@ api_router.include_router(
     tags=["Notificaciones"]
 )
 
+api_router.include_router(
+    noticia.router,
+    prefix="/noticias",
+    tags=["Noticias"]
+)
+
+api_router.include_router(
+    evento.router,
+    prefix="/eventos",
+    tags=["Eventos"]
+)
+
+api_router.include_router(
+    junta_patronato.router,
+    prefix="/junta-patronato",
+    tags=["Junta y Patronato"]
+)
+
 api_router.include_router(
     notificacion.router,
     prefix="/health",
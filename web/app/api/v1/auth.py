@@ -8,8 +8,9 @@ from app.db.session import SessionLocal
 from app.core.security import crear_token_acceso
 from app.core.email import send_welcome_email
 from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 @router.post("/login", response_model=dict)
 def login(usuario_login: UsuarioLogin, db: Session = Depends(get_db)):
@@ -22,7 +23,8 @@ def login(usuario_login: UsuarioLogin, db: Session = Depends(get_db)):
     if not usuario:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales inválidas")
     
-    access_token = crear_token_acceso({"sub": str(usuario.id_usuario)})
+    # El rol va en el token para que la caché HTTP pueda separar respuestas sin consultar la base de datos
+    access_token = crear_token_acceso({"sub": str(usuario.id_usuario), "rol": usuario.rol})
     
     # Incluir información del usuario en la respuesta
     return {
@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.modules.notificacion import crud as notificacion_crud
@@ -8,32 +8,41 @@ from app.modules.notificacion.schemas import NotificacionCreate
 from app.modules.usuarios import crud as usuarios_crud
 
 from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.paginacion import agregar_cursor
 from app.modules.avisos import crud, schemas
 from app.modules.usuarios.schemas import UsuarioOut
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 
 @router.get("/obtener-avisos", response_model=List[schemas.Aviso])
 def get_avisos(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: UsuarioOut = Depends(get_current_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     """
-    Obtener lista de avisos.
+    Obtener lista de avisos, más recientes primero.
+    El cursor de la página siguiente se devuelve en la cabecera X-Next-Cursor.
     """
-    return crud.get_avisos(db, skip=skip, limit=limit)
+    avisos, next_cursor = crud.get_avisos(db, skip=skip, limit=limit, cursor=cursor)
+    agregar_cursor(response, next_cursor)
+    return avisos
 
 
 @router.get("/obtener-avisos/{destinatario}", response_model=List[schemas.Aviso])
 def get_avisos_por_destinatario(
     destinatario: str,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: UsuarioOut = Depends(get_current_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     """
     Obtener avisos por destinatario (todos o para mi).
@@ -43,7 +52,11 @@ def get_avisos_por_destinatario(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Destinatario inválido. Debe ser 'todos' o 'para mi'"
         )
-    return crud.get_avisos_por_destinatario(db, destinatario=destinatario, skip=skip, limit=limit)
+    avisos, next_cursor = crud.get_avisos_por_destinatario(
+        db, destinatario=destinatario, skip=skip, limit=limit, cursor=cursor
+    )
+    agregar_cursor(response, next_cursor)
+    return avisos
 
 
 @router.post("/crear-aviso", response_model=schemas.Aviso, status_code=status.HTTP_201_CREATED)
@@ -70,35 +83,38 @@ async def create_aviso(
     # Generar notificaciones automáticas para los usuarios correspondientes
     try:
         # Determinar los usuarios que recibirán la notificación según el destinatario
+        # (solo hace falta su ID)
         if aviso_in.destinatario == "todos":
             # Obtener todos los usuarios activos
-            usuarios = usuarios_crud.get_usuarios_activos(db)
+            usuarios = usuarios_crud.get_usuarios_activos(db, campos=("id_usuario",))
         elif aviso_in.destinatario == "profesores":
             # Obtener usuarios con rol profesor
-            usuarios = usuarios_crud.get_usuarios_por_rol(db, "profesor")
+            usuarios = usuarios_crud.obtener_usuarios_por_rol(db, "profesor", campos=("id_usuario",))
         elif aviso_in.destinatario == "padres":
             # Obtener usuarios con rol padre
-            usuarios = usuarios_crud.get_usuarios_por_rol(db, "padre")
+            usuarios = usuarios_crud.obtener_usuarios_por_rol(db, "padre", campos=("id_usuario",))
         else:
             # Si el destinatario no es válido, no generar notificaciones
             return nuevo_aviso
         
-        # Crear notificaciones para cada usuario
+        # Crear notificaciones para cada usuario. En un savepoint: si fallan, se deshacen
+        # solo ellas y el aviso se confirma igual con el resto de la petición
         if usuarios:
             ids_usuarios = [usuario.id_usuario for usuario in usuarios]
-            await notificacion_crud.crear_notificacion_masiva(
-                db=db,
-                ids_usuarios=ids_usuarios,
-                titulo=f"Nuevo aviso: {aviso_in.titulo}",
-                mensaje=aviso_in.contenido,
-                tipo="aviso",
-                accionable=True,
-                accion="ver-aviso",
-                accion_texto="Ver aviso completo",
-                accion_icono="arrow-right",
-                referencia_id=nuevo_aviso.id_aviso,
-                referencia_tipo="aviso"
-            )
+            with db.begin_nested():
+                await notificacion_crud.crear_notificacion_masiva(
+                    db=db,
+                    ids_usuarios=ids_usuarios,
+                    titulo=f"Nuevo aviso: {aviso_in.titulo}",
+                    mensaje=aviso_in.contenido,
+                    tipo="aviso",
+                    accionable=True,
+                    accion="ver-aviso",
+                    accion_texto="Ver aviso completo",
+                    accion_icono="arrow-right",
+                    referencia_id=nuevo_aviso.id_aviso,
+                    referencia_tipo="aviso"
+                )
     except Exception as e:
         # Si hay un error al crear las notificaciones, registrarlo pero no fallar la creación del aviso
         print(f"Error al crear notificaciones para el aviso: {str(e)}")
@@ -1,13 +1,20 @@
-from fastapi import Depends, HTTPException, status
+from uuid import UUID
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
+from app.api.v1.unidad_trabajo import ATRIBUTO_SESION
+from app.db.cargadores import obtener_cargador
 from app.db.session import SessionLocal
 from app.modules.usuarios.models import Usuario
 from app.core.configs import settings
 
-def get_db():
+def get_db(request: Request):
+    # La sesión no toma conexión del pool hasta la primera sentencia (app/db/conexiones.py):
+    # una petición resuelta desde caché o rechazada antes de consultar no ocupa el pool
     db = SessionLocal()
+    # RutaUnidadTrabajo confirma o deshace esta sesión al terminar el endpoint
+    setattr(request.state, ATRIBUTO_SESION, db)
     try:
         yield db
     finally:
@@ -15,22 +22,36 @@ def get_db():
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="No se pudo validar el token",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="No se pudo validar el token",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
 
+def decodificar_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
     except JWTError:
         raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+
+def get_current_user_id(token: str = Depends(oauth2_scheme)) -> UUID:
+    """Obtiene el ID del usuario autenticado solo a partir del token, sin consultar la base de datos"""
+    try:
+        return UUID(decodificar_token(token)["sub"])
+    except ValueError:
+        raise credentials_exception
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    user_id = get_current_user_id(token)
 
-    usuario = db.query(Usuario).filter(Usuario.id_usuario == user_id).first()
+    # Por el cargador: otras búsquedas del mismo usuario en la petición no vuelven a consultar
+    usuario = obtener_cargador(db, Usuario).cargar(user_id)
     if usuario is None:
         raise credentials_exception
     return usuario
@@ -1,13 +1,16 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Body, status
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.campos import parsear_campos, responder_campos
+from app.core.paginacion import agregar_cursor
 from app.modules.documentos import crud, schemas
 from app.modules.usuarios.models import Usuario
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 
 @router.post("/subir-documento", response_model=schemas.DocumentoOut)
@@ -38,8 +41,11 @@ async def crear_documento(
 
 @router.get("/todos-documentos", response_model=List[schemas.DocumentoOut])
 def obtener_documentos(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas (por defecto todos)"),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
@@ -49,19 +55,27 @@ def obtener_documentos(
     - Dirección: puede ver todos los documentos
     - Profesores: puede ver documentos para profesores y todos
     - Padres: puede ver documentos para padres y todos
+    
+    El cursor de la página siguiente se devuelve en la cabecera X-Next-Cursor.
+    Con `fields` (por ejemplo `fields=id_documento,titulo`) solo se devuelven esos campos.
     """
+    campos = parsear_campos(fields, schemas.DocumentoOut)
     # Determinar qué documentos puede ver según su rol
     if current_user.rol == "direccion":
         # Dirección puede ver todos los documentos
-        return crud.get_documentos(db, skip=skip, limit=limit)
+        documentos, next_cursor = crud.get_documentos(db, skip=skip, limit=limit, cursor=cursor, campos=campos)
     else:
         # Otros roles solo ven los documentos dirigidos a su rol o a todos
-        return crud.get_documentos(
+        documentos, next_cursor = crud.get_documentos(
             db, 
             skip=skip, 
             limit=limit, 
-            destinatario=current_user.rol
+            destinatario=current_user.rol,
+            cursor=cursor,
+            campos=campos
         )
+    agregar_cursor(response, next_cursor)
+    return responder_campos(documentos, schemas.DocumentoOut, campos, response)
 
 
 @router.get("/obtener-documento/{id_documento}", response_model=schemas.DocumentoOut)
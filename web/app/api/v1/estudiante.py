@@ -1,21 +1,26 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.paginacion import agregar_cursor
 from app.modules.estudiantes import crud, schemas
+from app.modules.usuarios.autorizacion import RECURSO_ESTUDIANTE, Recurso, autorizar
 from app.modules.usuarios.schemas import UsuarioOut
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 
 @router.get("/obtener-estudiantes", response_model=List[schemas.Estudiante])
 def get_estudiantes(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: UsuarioOut = Depends(get_current_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     """
     Obtener lista de estudiantes.
@@ -27,7 +32,9 @@ def get_estudiantes(
             detail="No tiene permisos para ver la lista de estudiantes"
         )
     
-    return crud.get_estudiantes(db, skip=skip, limit=limit)
+    estudiantes, next_cursor = crud.get_estudiantes(db, skip=skip, limit=limit, cursor=cursor)
+    agregar_cursor(response, next_cursor)
+    return estudiantes
 
 
 @router.post("/crear-estudiante", response_model=schemas.EstudianteWithCredentials, status_code=status.HTTP_201_CREATED)
@@ -96,6 +103,13 @@ def get_estudiante(
             detail="No tiene permisos para ver estudiantes"
         )
     
+    # Si es un padre, solo puede ver a sus propios hijos (sin consultar el estudiante si no lo es)
+    if current_user.rol == "padre" and not autorizar(db, current_user, Recurso(RECURSO_ESTUDIANTE, id_estudiante)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tiene permisos para ver este estudiante"
+        )
+    
     db_estudiante = crud.get_estudiante(db, id_estudiante=id_estudiante)
     if db_estudiante is None:
         raise HTTPException(
@@ -103,13 +117,6 @@ def get_estudiante(
             detail="Estudiante no encontrado"
         )
     
-    # Si es un padre, solo puede ver a sus propios hijos
-    if current_user.rol == "padre" and db_estudiante.id_padre != current_user.id_usuario:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tiene permisos para ver este estudiante"
-        )
-    
     return db_estudiante
 
 
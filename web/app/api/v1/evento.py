@@ -0,0 +1,98 @@
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.paginacion import agregar_cursor
+from app.modules.eventos import crud, schemas
+from app.modules.usuarios.models import Usuario
+
+router = APIRouter(route_class=RutaUnidadTrabajo)
+
+
+@router.get("/obtener-eventos", response_model=List[schemas.EventoOut])
+def obtener_eventos(
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    proximos: bool = True,
+    db: Session = Depends(get_db)
+):
+    """
+    Eventos públicos (dirigidos a todos) en orden cronológico; por defecto solo los próximos.
+    El cursor de la página siguiente se devuelve en la cabecera X-Next-Cursor.
+    """
+    eventos, next_cursor = crud.get_eventos(
+        db, skip=skip, limit=limit, cursor=cursor, solo_publicos=True, solo_proximos=proximos
+    )
+    agregar_cursor(response, next_cursor)
+    return eventos
+
+
+@router.get("/todos-eventos", response_model=List[schemas.EventoOut])
+def obtener_todos_eventos(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Todos los eventos, incluidos los que no se muestran en el sitio público.
+    """
+    eventos, next_cursor = crud.get_eventos(db, skip=skip, limit=limit, cursor=cursor)
+    agregar_cursor(response, next_cursor)
+    return eventos
+
+
+@router.post("/crear-evento", response_model=schemas.EventoOut, status_code=status.HTTP_201_CREATED)
+def crear_evento(
+    evento: schemas.EventoCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    if current_user.rol != "direccion":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tiene permisos para crear eventos"
+        )
+    return crud.create_evento(db, evento=evento)
+
+
+@router.put("/actualizar-evento/{id_evento}", response_model=schemas.EventoOut)
+def actualizar_evento(
+    id_evento: UUID,
+    evento_update: schemas.EventoUpdate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    if current_user.rol != "direccion":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tiene permisos para actualizar eventos"
+        )
+    db_evento = crud.update_evento(db, id_evento=id_evento, evento=evento_update)
+    if not db_evento:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evento no encontrado")
+    return db_evento
+
+
+@router.delete("/eliminar-evento/{id_evento}", response_model=schemas.EventoOut)
+def eliminar_evento(
+    id_evento: UUID,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    if current_user.rol != "direccion":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tiene permisos para eliminar eventos"
+        )
+    db_evento = crud.get_evento(db, id_evento=id_evento)
+    if not db_evento:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evento no encontrado")
+    return crud.delete_evento(db, db_evento=db_evento)
@@ -0,0 +1,158 @@
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.paginacion import agregar_cursor
+from app.modules.junta_patronato import crud, schemas
+from app.modules.usuarios.models import Usuario
+
+router = APIRouter(route_class=RutaUnidadTrabajo)
+
+
+def _verificar_direccion(current_user: Usuario, accion: str) -> None:
+    if current_user.rol != "direccion":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"No tiene permisos para {accion}"
+        )
+
+
+# Miembros
+
+@router.get("/obtener-miembros", response_model=List[schemas.MiembroOut])
+def obtener_miembros(tipo: Optional[schemas.TipoMiembroEnum] = None, db: Session = Depends(get_db)):
+    """
+    Miembros de la junta y del patronato (o solo de `tipo`). Público.
+    """
+    return crud.get_miembros(db, tipo=tipo.value if tipo else None)
+
+
+@router.post("/crear-miembro", response_model=schemas.MiembroOut, status_code=status.HTTP_201_CREATED)
+def crear_miembro(
+    miembro: schemas.MiembroCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    _verificar_direccion(current_user, "agregar miembros")
+    return crud.create_miembro(db, miembro=miembro)
+
+
+@router.put("/actualizar-miembro/{id_miembro}", response_model=schemas.MiembroOut)
+def actualizar_miembro(
+    id_miembro: UUID,
+    miembro_update: schemas.MiembroUpdate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    _verificar_direccion(current_user, "actualizar miembros")
+    db_miembro = crud.update_miembro(db, id_miembro=id_miembro, miembro=miembro_update)
+    if not db_miembro:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Miembro no encontrado")
+    return db_miembro
+
+
+@router.delete("/eliminar-miembro/{id_miembro}", response_model=schemas.MiembroOut)
+def eliminar_miembro(
+    id_miembro: UUID,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    _verificar_direccion(current_user, "eliminar miembros")
+    db_miembro = crud.get_miembro(db, id_miembro=id_miembro)
+    if not db_miembro:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Miembro no encontrado")
+    return crud.delete_miembro(db, db_miembro=db_miembro)
+
+
+# Informes
+
+@router.get("/obtener-informes", response_model=List[schemas.InformeOut])
+def obtener_informes(
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Informes de la junta y el patronato, más recientes primero. Público.
+    El cursor de la página siguiente se devuelve en la cabecera X-Next-Cursor.
+    """
+    informes, next_cursor = crud.get_informes(db, skip=skip, limit=limit, cursor=cursor)
+    agregar_cursor(response, next_cursor)
+    return informes
+
+
+@router.post("/subir-informe", response_model=schemas.InformeOut, status_code=status.HTTP_201_CREATED)
+def subir_informe(
+    informe: schemas.InformeCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    _verificar_direccion(current_user, "subir informes")
+    if informe.id_miembro is not None and crud.get_miembro(db, id_miembro=informe.id_miembro) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Miembro no encontrado")
+    return crud.create_informe(db, informe=informe)
+
+
+@router.delete("/eliminar-informe/{id_informe}", response_model=schemas.InformeOut)
+def eliminar_informe(
+    id_informe: UUID,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    _verificar_direccion(current_user, "eliminar informes")
+    db_informe = crud.get_informe(db, id_informe=id_informe)
+    if not db_informe:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Informe no encontrado")
+    return crud.delete_informe(db, db_informe=db_informe)
+
+
+# Cuentas de donación
+
+@router.get("/obtener-cuentas-donacion", response_model=List[schemas.CuentaDonacionOut])
+def obtener_cuentas_donacion(db: Session = Depends(get_db)):
+    """
+    Cuentas de donación activas. Público.
+    """
+    return crud.get_cuentas_donacion(db, solo_activas=True)
+
+
+@router.post("/crear-cuenta-donacion", response_model=schemas.CuentaDonacionOut, status_code=status.HTTP_201_CREATED)
+def crear_cuenta_donacion(
+    cuenta: schemas.CuentaDonacionCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    _verificar_direccion(current_user, "crear cuentas de donación")
+    return crud.create_cuenta_donacion(db, cuenta=cuenta)
+
+
+@router.put("/actualizar-cuenta-donacion/{id_cuenta}", response_model=schemas.CuentaDonacionOut)
+def actualizar_cuenta_donacion(
+    id_cuenta: UUID,
+    cuenta_update: schemas.CuentaDonacionUpdate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    _verificar_direccion(current_user, "actualizar cuentas de donación")
+    db_cuenta = crud.update_cuenta_donacion(db, id_cuenta=id_cuenta, cuenta=cuenta_update)
+    if not db_cuenta:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cuenta de donación no encontrada")
+    return db_cuenta
+
+
+@router.delete("/eliminar-cuenta-donacion/{id_cuenta}", response_model=schemas.CuentaDonacionOut)
+def eliminar_cuenta_donacion(
+    id_cuenta: UUID,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    _verificar_direccion(current_user, "eliminar cuentas de donación")
+    db_cuenta = crud.get_cuenta_donacion(db, id_cuenta=id_cuenta)
+    if not db_cuenta:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cuenta de donación no encontrada")
+    return crud.delete_cuenta_donacion(db, db_cuenta=db_cuenta)
@@ -1,19 +1,30 @@
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.v1.deps import get_current_user, get_db
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.filas import responder_filas
+from app.core.paginacion import agregar_cursor
 from app.modules.materias import crud, schemas
-from app.modules.materias.models import Materia
+from app.modules.profesores.schemas import ProfesorFila
 from app.modules.usuarios.schemas import UsuarioOut
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 
 @router.get("/obtener-materias", response_model=List[schemas.Materia])
-def get_materias(db: Session = Depends(get_db), current_user: UsuarioOut = Depends(get_current_user)):
-    materias = db.query(Materia).all()
+def get_materias(
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = Query(None, description="Sin límite se devuelven todas las materias"),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: UsuarioOut = Depends(get_current_user)
+):
+    materias, next_cursor = crud.get_materias(db, skip=skip, limit=limit, cursor=cursor)
+    agregar_cursor(response, next_cursor)
     return materias
 
 
@@ -37,7 +48,7 @@ def create_materia(materia_in: schemas.MateriaCreate, db: Session = Depends(get_
 
 @router.get("/obtener-materia/{id_materia}", response_model=schemas.Materia)
 def get_materia(id_materia: UUID, db: Session = Depends(get_db), current_user: UsuarioOut = Depends(get_current_user)):
-    db_materia = crud.get_materia(db, id_materia=id_materia)
+    db_materia = crud.get_materia_ref(db, id_materia=id_materia)
     if db_materia is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -95,7 +106,7 @@ def delete_materia(id_materia: UUID, db: Session = Depends(get_db), current_user
 
 @router.get("/obtener-profesores-materia/{id_materia}", response_model=List[schemas.ProfesorBase])
 def get_profesores_by_materia(id_materia: UUID, db: Session = Depends(get_db), current_user: UsuarioOut = Depends(get_current_user)):
-    db_materia = crud.get_materia(db, id_materia=id_materia)
+    db_materia = crud.get_materia_ref(db, id_materia=id_materia)
     if db_materia is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -103,4 +114,4 @@ def get_profesores_by_materia(id_materia: UUID, db: Session = Depends(get_db), c
         )
     
     profesores = crud.get_profesores_by_materia(db=db, id_materia=id_materia)
-    return profesores
+    return responder_filas(profesores, ProfesorFila)
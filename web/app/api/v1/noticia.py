@@ -0,0 +1,90 @@
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.paginacion import agregar_cursor
+from app.modules.noticias import crud, schemas
+from app.modules.usuarios.models import Usuario
+
+router = APIRouter(route_class=RutaUnidadTrabajo)
+
+
+@router.get("/obtener-noticias", response_model=List[schemas.NoticiaOut])
+def obtener_noticias(
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Feed público de noticias, más recientes primero (no requiere sesión).
+    El cursor de la página siguiente se devuelve en la cabecera X-Next-Cursor.
+    """
+    noticias, next_cursor = crud.get_noticias(db, skip=skip, limit=limit, cursor=cursor)
+    agregar_cursor(response, next_cursor)
+    return noticias
+
+
+@router.get("/obtener-noticia/{id_noticia}", response_model=schemas.NoticiaOut)
+def obtener_noticia(id_noticia: UUID, db: Session = Depends(get_db)):
+    noticia = crud.get_noticia(db, id_noticia=id_noticia)
+    if not noticia:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Noticia no encontrada")
+    return noticia
+
+
+@router.post("/publicar-noticia", response_model=schemas.NoticiaOut, status_code=status.HTTP_201_CREATED)
+def publicar_noticia(
+    noticia: schemas.NoticiaCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Publicar una noticia en el sitio público. Solo dirección.
+    La portada y /noticias se regeneran con la primera visita después de publicar.
+    """
+    if current_user.rol != "direccion":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tiene permisos para publicar noticias"
+        )
+    return crud.create_noticia(db, noticia=noticia, id_usuario=current_user.id_usuario)
+
+
+@router.put("/actualizar-noticia/{id_noticia}", response_model=schemas.NoticiaOut)
+def actualizar_noticia(
+    id_noticia: UUID,
+    noticia_update: schemas.NoticiaUpdate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    if current_user.rol != "direccion":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tiene permisos para actualizar noticias"
+        )
+    db_noticia = crud.get_noticia(db, id_noticia=id_noticia)
+    if not db_noticia:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Noticia no encontrada")
+    return crud.update_noticia(db, db_noticia=db_noticia, noticia=noticia_update)
+
+
+@router.delete("/eliminar-noticia/{id_noticia}", response_model=schemas.NoticiaOut)
+def eliminar_noticia(
+    id_noticia: UUID,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    if current_user.rol != "direccion":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tiene permisos para eliminar noticias"
+        )
+    db_noticia = crud.get_noticia(db, id_noticia=id_noticia)
+    if not db_noticia:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Noticia no encontrada")
+    return crud.delete_noticia(db, db_noticia=db_noticia)
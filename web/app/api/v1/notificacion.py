@@ -1,27 +1,43 @@
+import asyncio
+import json
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from uuid import UUID
 from pydantic import BaseModel
 
-from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.deps import get_db, get_current_user, get_current_user_id, decodificar_token, credentials_exception
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.campos import parsear_campos, responder_json, serializar_campos
+from app.core.configs import settings
+from app.core.paginacion import CursorInvalido
+from app.db.session import SessionLocal
 from app.modules.notificacion import crud
+from app.modules.notificacion.buffer_lectura import obtener_buffer_lecturas
+from app.modules.notificacion.eventos import obtener_broker
 from app.modules.notificacion.schemas import (
+    ContadorNotificaciones,
     NotificacionCreate,
     NotificacionOut,
     NotificacionUpdate,
-    NotificacionesResponse
+    NotificacionesLote,
+    NotificacionesResponse,
+    ResultadoLote
 )
 from app.modules.usuarios.schemas import UsuarioOut
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 
 @router.get("/obtener-notificaciones", response_model=NotificacionesResponse)
 async def obtener_notificaciones(
     skip: int = Query(0, description="Número de registros a omitir para paginación"),
     limit: int = Query(100, description="Número máximo de registros a devolver"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en next_cursor por la página anterior"),
     solo_no_leidas: bool = Query(False, description="Si es True, solo devuelve notificaciones no leídas"),
+    fields: Optional[str] = Query(None, description="Campos de cada notificación, separados por comas (por defecto todos)"),
     db: Session = Depends(get_db),
     usuario_actual: UsuarioOut = Depends(get_current_user)
 ):
@@ -30,27 +46,46 @@ async def obtener_notificaciones(
     
     - **skip**: Número de registros a omitir (paginación)
     - **limit**: Número máximo de registros a devolver
+    - **cursor**: Continúa desde la página anterior (más eficiente que skip en páginas profundas)
     - **solo_no_leidas**: Si es True, solo devuelve notificaciones no leídas
+    - **fields**: Campos de cada notificación (por ejemplo `id_notificacion,titulo,leida`)
     
     Retorna un objeto con:
     - **notificaciones**: Lista de notificaciones
     - **total**: Número total de notificaciones (con filtros aplicados)
     - **no_leidas**: Número de notificaciones no leídas (sin filtros)
+    - **next_cursor**: Cursor de la página siguiente, o null si no hay más
     """
+    campos = parsear_campos(fields, NotificacionOut)
     try:
         resultado = await crud.obtener_notificaciones_usuario(
             db=db,
             id_usuario=usuario_actual.id_usuario,
             skip=skip,
             limit=limit,
-            solo_no_leidas=solo_no_leidas
+            solo_no_leidas=solo_no_leidas,
+            cursor=cursor,
+            campos=campos
         )
         
-        return NotificacionesResponse(
-            notificaciones=resultado["notificaciones"],
-            total=resultado["total"],
-            no_leidas=resultado["no_leidas"]
-        )
+        # Reflejar las marcas de lectura que el buffer aún no ha escrito
+        pendientes = obtener_buffer_lecturas().pendientes(usuario_actual.id_usuario)
+        if pendientes:
+            for notificacion in resultado["notificaciones"]:
+                if notificacion.id_notificacion in pendientes and not notificacion.leida:
+                    db.expunge(notificacion)
+                    notificacion.leida = True
+            # Solo cuentan las que de verdad pasan de no leída a leída
+            resultado["no_leidas"] = max(0, resultado["no_leidas"] - crud.contar_no_leidas(db, usuario_actual.id_usuario, pendientes))
+        
+        if campos is not None:
+            resultado["notificaciones"] = serializar_campos(resultado["notificaciones"], NotificacionOut, campos)
+            return responder_json(resultado)
+        
+        # from_attributes: las notificaciones son objetos ORM y se validan leyendo sus atributos
+        return NotificacionesResponse.model_validate(resultado, from_attributes=True)
+    except CursorInvalido:
+        raise
     except Exception as e:
         # Registrar el error para depuración
         print(f"Error al obtener notificaciones: {str(e)}")
@@ -62,6 +97,136 @@ async def obtener_notificaciones(
         )
 
 
+@router.get("/contador", response_model=ContadorNotificaciones)
+async def obtener_contador(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    id_usuario: UUID = Depends(get_current_user_id)
+):
+    """
+    Obtiene el número de notificaciones no leídas y el total del usuario actual.
+    
+    Pensado para el polling del badge: soporta `If-None-Match` y responde 304 sin
+    consultar la base de datos mientras el contador del worker siga vigente.
+    """
+    contador = crud.obtener_contador_cacheado(id_usuario)
+    if contador is None:
+        db = SessionLocal()
+        try:
+            contador = await crud.obtener_contador(db, id_usuario)
+            # Sesión propia (fuera de get_db): confirma la fila de contador si se creó
+            db.commit()
+        finally:
+            db.close()
+    
+    no_leidas, total = contador
+    # Descontar las marcas de lectura que el buffer aún no ha escrito (solo las que
+    # siguen sin leer en la base de datos; las ya leídas o ajenas no cambian el contador)
+    pendientes = obtener_buffer_lecturas().pendientes(id_usuario)
+    if pendientes:
+        db = SessionLocal()
+        try:
+            no_leidas = max(0, no_leidas - crud.contar_no_leidas(db, id_usuario, pendientes))
+        finally:
+            db.close()
+    etag = f'"{no_leidas}-{total}"'
+    if if_none_match and etag in [valor.strip() for valor in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return ContadorNotificaciones(no_leidas=no_leidas, total=total)
+
+
+oauth2_scheme_opcional = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
+
+
+def _formatear_evento(id_evento: int, datos: dict) -> str:
+    return f"id: {id_evento}\nevent: notificacion\ndata: {json.dumps(datos, default=str)}\n\n"
+
+
+@router.get("/stream")
+async def stream_notificaciones(
+    request: Request,
+    token: Optional[str] = Query(None, description="Token de acceso (EventSource no permite enviar cabeceras)"),
+    token_cabecera: Optional[str] = Depends(oauth2_scheme_opcional),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Stream Server-Sent Events con las notificaciones nuevas del usuario actual.
+    
+    - Envía un comentario de latido cada `NOTIFICACION_STREAM_HEARTBEAT` segundos.
+    - Con `Last-Event-ID` reenvía los eventos del historial del worker; si no alcanza,
+      envía un evento `resync` para que el cliente recargue la lista.
+    - Si el cliente no consume a tiempo se envía `resync` y se cierra la conexión.
+    """
+    token = token_cabecera or token
+    if not token:
+        raise credentials_exception
+    try:
+        id_usuario = UUID(decodificar_token(token)["sub"])
+    except ValueError:
+        raise credentials_exception
+    
+    broker = obtener_broker()
+    suscripcion = broker.suscribir(id_usuario)
+    
+    pendientes = []
+    resync = False
+    if last_event_id:
+        try:
+            ultimo_id = int(last_event_id)
+            pendientes, completo = broker.eventos_desde(id_usuario, ultimo_id)
+            if not completo and not pendientes:
+                # Sin historial en este worker: no se perdió nada si el cliente va al día
+                db = SessionLocal()
+                try:
+                    completo = crud.obtener_ultimo_evento(db, id_usuario) == ultimo_id
+                finally:
+                    db.close()
+            resync = not completo
+        except ValueError:
+            resync = True
+    
+    async def generar():
+        try:
+            yield "retry: 3000\n\n"
+            if resync:
+                yield "event: resync\ndata: {}\n\n"
+            reenviados = set()
+            for id_evento, datos in pendientes:
+                reenviados.add(id_evento)
+                yield _formatear_evento(id_evento, datos)
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    id_evento, datos = await asyncio.wait_for(
+                        suscripcion.cola.get(), timeout=settings.NOTIFICACION_STREAM_HEARTBEAT
+                    )
+                except asyncio.TimeoutError:
+                    if suscripcion.desbordada:
+                        yield "event: resync\ndata: {}\n\n"
+                        break
+                    yield ": ping\n\n"
+                    continue
+                # Un evento pudo llegar por la cola y también por el historial al reanudar
+                if id_evento in reenviados:
+                    continue
+                yield _formatear_evento(id_evento, datos)
+                if suscripcion.desbordada and suscripcion.cola.empty():
+                    yield "event: resync\ndata: {}\n\n"
+                    break
+        finally:
+            broker.desuscribir(suscripcion)
+    
+    return StreamingResponse(
+        generar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/crear-notificacion", response_model=NotificacionOut)
 async def crear_notificacion(
     notificacion: NotificacionCreate,
@@ -195,23 +360,18 @@ async def actualizar_notificacion(
     - **id_notificacion**: ID de la notificación a actualizar
     - **datos_actualizacion**: Datos a actualizar
     """
-    notificacion = await crud.obtener_notificacion(db=db, id_notificacion=id_notificacion)
+    # La pertenencia al usuario actual se verifica en la misma sentencia UPDATE
+    notificacion = await crud.actualizar_notificacion(
+        db=db,
+        id_notificacion=id_notificacion,
+        datos_actualizacion=datos_actualizacion,
+        id_usuario=usuario_actual.id_usuario
+    )
     
     if not notificacion:
         raise HTTPException(status_code=404, detail="Notificación no encontrada")
     
-    # Verificar que la notificación pertenezca al usuario actual
-    if notificacion.id_usuario != usuario_actual.id_usuario:
-        raise HTTPException(
-            status_code=403,
-            detail="No tiene permisos para actualizar esta notificación"
-        )
-    
-    return await crud.actualizar_notificacion(
-        db=db,
-        id_notificacion=id_notificacion,
-        datos_actualizacion=datos_actualizacion
-    )
+    return notificacion
 
 
 @router.patch("/marcar-como-leida/{id_notificacion}", response_model=NotificacionOut)
@@ -225,19 +385,45 @@ async def marcar_como_leida(
     
     - **id_notificacion**: ID de la notificación a marcar como leída
     """
-    notificacion = await crud.obtener_notificacion(db=db, id_notificacion=id_notificacion)
+    # Las marcas de una ráfaga se agrupan en un solo UPDATE; se responde tras su commit
+    notificacion = await obtener_buffer_lecturas().marcar(usuario_actual.id_usuario, id_notificacion)
     
     if not notificacion:
         raise HTTPException(status_code=404, detail="Notificación no encontrada")
     
-    # Verificar que la notificación pertenezca al usuario actual
-    if notificacion.id_usuario != usuario_actual.id_usuario:
-        raise HTTPException(
-            status_code=403,
-            detail="No tiene permisos para actualizar esta notificación"
-        )
+    return notificacion
+
+
+@router.patch("/marcar-como-leidas", response_model=ResultadoLote)
+async def marcar_como_leidas(
+    datos: NotificacionesLote,
+    db: Session = Depends(get_db),
+    usuario_actual: UsuarioOut = Depends(get_current_user)
+):
+    """
+    Marca varias notificaciones del usuario actual como leídas en una sola sentencia.
+    
+    Los IDs que no pertenecen al usuario o ya estaban leídos se ignoran.
+    Retorna los IDs que cambiaron de estado.
+    """
+    ids = await crud.marcar_lote(db=db, id_usuario=usuario_actual.id_usuario, ids=datos.ids, leida=True)
+    return ResultadoLote(cantidad=len(ids), ids=ids)
+
+
+@router.patch("/marcar-como-no-leidas", response_model=ResultadoLote)
+async def marcar_como_no_leidas(
+    datos: NotificacionesLote,
+    db: Session = Depends(get_db),
+    usuario_actual: UsuarioOut = Depends(get_current_user)
+):
+    """
+    Marca varias notificaciones del usuario actual como no leídas en una sola sentencia.
     
-    return await crud.marcar_como_leida(db=db, id_notificacion=id_notificacion)
+    Los IDs que no pertenecen al usuario o ya estaban sin leer se ignoran.
+    Retorna los IDs que cambiaron de estado.
+    """
+    ids = await crud.marcar_lote(db=db, id_usuario=usuario_actual.id_usuario, ids=datos.ids, leida=False)
+    return ResultadoLote(cantidad=len(ids), ids=ids)
 
 
 @router.patch("/marcar-todas-como-leidas", response_model=dict)
@@ -269,21 +455,28 @@ async def eliminar_notificacion(
     
     - **id_notificacion**: ID de la notificación a eliminar
     """
-    notificacion = await crud.obtener_notificacion(db=db, id_notificacion=id_notificacion)
+    resultado = await crud.eliminar_notificacion(
+        db=db,
+        id_notificacion=id_notificacion,
+        id_usuario=usuario_actual.id_usuario
+    )
     
-    if not notificacion:
+    if not resultado:
         raise HTTPException(status_code=404, detail="Notificación no encontrada")
     
-    # Verificar que la notificación pertenezca al usuario actual
-    if notificacion.id_usuario != usuario_actual.id_usuario:
-        raise HTTPException(
-            status_code=403,
-            detail="No tiene permisos para eliminar esta notificación"
-        )
-    
-    resultado = await crud.eliminar_notificacion(db=db, id_notificacion=id_notificacion)
+    return {"mensaje": "Notificación eliminada correctamente"}
+
+
+@router.post("/eliminar-notificaciones", response_model=ResultadoLote)
+async def eliminar_notificaciones(
+    datos: NotificacionesLote,
+    db: Session = Depends(get_db),
+    usuario_actual: UsuarioOut = Depends(get_current_user)
+):
+    """
+    Elimina varias notificaciones del usuario actual en una sola sentencia.
     
-    if resultado:
-        return {"mensaje": "Notificación eliminada correctamente"}
-    else:
-        raise HTTPException(status_code=500, detail="Error al eliminar la notificación")
+    Los IDs que no pertenecen al usuario se ignoran. Retorna los IDs eliminados.
+    """
+    ids = await crud.eliminar_lote(db=db, id_usuario=usuario_actual.id_usuario, ids=datos.ids)
+    return ResultadoLote(cantidad=len(ids), ids=ids)
@@ -1,13 +1,17 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 
 from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.filas import responder_filas
+from app.core.paginacion import agregar_cursor
 from app.modules.padres import crud, schemas
+from app.modules.usuarios.autorizacion import RECURSO_ESTUDIANTE, Recurso, autorizar
 from app.modules.usuarios.schemas import UsuarioOut
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 
 @router.get("/mis-hijos", response_model=List[schemas.EstudianteHijo])
@@ -46,14 +50,14 @@ def get_notas_estudiante(
         )
     
     # Verificar que el estudiante pertenece al padre autenticado
-    estudiante = crud.get_hijo_por_id(db, id_estudiante=id_estudiante, id_padre=current_user.id_usuario)
-    if not estudiante:
+    if not autorizar(db, current_user, Recurso(RECURSO_ESTUDIANTE, id_estudiante)):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Estudiante no encontrado o no tiene permisos para ver sus notas"
         )
     
-    return crud.get_notas_estudiante(db, id_estudiante=id_estudiante, id_anio=id_anio)
+    notas = crud.get_notas_estudiante(db, id_estudiante=id_estudiante, id_anio=id_anio)
+    return responder_filas(notas, schemas.NotaFila)
 
 
 @router.get("/asistencias-estudiante/{id_estudiante}", response_model=List[schemas.AsistenciaEstudiante])
@@ -74,22 +78,24 @@ def get_asistencias_estudiante(
         )
     
     # Verificar que el estudiante pertenece al padre autenticado
-    estudiante = crud.get_hijo_por_id(db, id_estudiante=id_estudiante, id_padre=current_user.id_usuario)
-    if not estudiante:
+    if not autorizar(db, current_user, Recurso(RECURSO_ESTUDIANTE, id_estudiante)):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Estudiante no encontrado o no tiene permisos para ver sus asistencias"
         )
     
-    return crud.get_asistencias_estudiante(db, id_estudiante=id_estudiante, id_anio=id_anio)
+    asistencias = crud.get_asistencias_estudiante(db, id_estudiante=id_estudiante, id_anio=id_anio)
+    return responder_filas(asistencias, schemas.AsistenciaFila)
 
 
 # Endpoints para administración de padres (solo accesibles para dirección)
 
 @router.get("/obtener-padres", response_model=List[schemas.PadreOutWithHijos])
 def get_padres(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: UsuarioOut = Depends(get_current_user)
 ):
@@ -103,7 +109,9 @@ def get_padres(
             detail="Solo la dirección puede acceder a este recurso"
         )
     
-    return crud.get_padres_with_hijos(db, skip=skip, limit=limit)
+    padres, next_cursor = crud.get_padres_with_hijos(db, skip=skip, limit=limit, cursor=cursor)
+    agregar_cursor(response, next_cursor)
+    return padres
 
 
 @router.get("/obtener-padre/{id_padre}", response_model=schemas.PadreOutWithHijos)
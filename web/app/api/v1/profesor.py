@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from typing import List, Dict, Any
+from typing import List
 import uuid
 from app.modules.profesores.schemas import (
     ProfesorBase, 
@@ -12,7 +12,9 @@ from app.modules.profesores.schemas import (
     ProfesorSeccionesAsignacion,
     ProfesorConMaterias,
     ProfesorConSecciones,
-    ProfesorCompleto
+    ProfesorCompleto,
+    MateriaProfesorFila,
+    SeccionProfesorFila
 )
 from app.modules.profesores.crud import (
     obtener_profesores,
@@ -27,10 +29,12 @@ from app.modules.profesores.crud import (
     actualizar_profesor
 )
 from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
 from app.modules.usuarios.models import Usuario
 from app.core.email import send_welcome_email
+from app.core.filas import responder_filas
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 
 @router.post("/crear-profesor", response_model=ProfesorCreated)
@@ -66,7 +70,7 @@ async def create_profesor(profesor_data: ProfesorCreate,db: Session = Depends(ge
     }
 
 
-@router.get("/obtener-profesores")
+@router.get("/obtener-profesores", response_model=List[ProfesorBase])
 def get_profesores(db: Session = Depends(get_db), usuario_actual: Usuario = Depends(get_current_user)):
     if usuario_actual.rol != "direccion":
         raise HTTPException(
@@ -158,7 +162,7 @@ async def delete_profesor(id_profesor: uuid.UUID,db: Session = Depends(get_db),
     return {"mensaje": "Profesor eliminado correctamente"}
 
 
-@router.get("/obtener-materias-profesor/{id_profesor}", response_model=List[Dict[str, Any]])
+@router.get("/obtener-materias-profesor/{id_profesor}", response_model=List[MateriaProfesorFila])
 def get_materias_profesor(id_profesor: uuid.UUID, id_anio: uuid.UUID = None,db: Session = Depends(get_db), 
 usuario_actual: Usuario = Depends(get_current_user)):
 
@@ -176,10 +180,10 @@ usuario_actual: Usuario = Depends(get_current_user)):
         )
     
     materias = obtener_materias_profesor(db, id_profesor, id_anio)
-    return materias
+    return responder_filas(materias, MateriaProfesorFila)
 
 
-@router.get("/obtener-secciones-profesor/{id_profesor}", response_model=List[Dict[str, Any]])
+@router.get("/obtener-secciones-profesor/{id_profesor}", response_model=List[SeccionProfesorFila])
 def get_secciones_profesor(id_profesor: uuid.UUID,db: Session = Depends(get_db), usuario_actual: Usuario = Depends(get_current_user)):
     if usuario_actual.rol != "direccion" and str(usuario_actual.id_usuario) != str(id_profesor):
         raise HTTPException(
@@ -195,7 +199,7 @@ def get_secciones_profesor(id_profesor: uuid.UUID,db: Session = Depends(get_db),
         )
     
     secciones = obtener_secciones_profesor(db, id_profesor)
-    return secciones
+    return responder_filas(secciones, SeccionProfesorFila)
 
 
 @router.post("/asignar-materias")
@@ -1,75 +1,76 @@
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, joinedload
 
 from app.api.v1.deps import get_current_user, get_db
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.filas import responder_filas
+from app.core.paginacion import agregar_cursor, paginar
 from app.modules.secciones import crud, schemas
 from app.modules.secciones.models import Seccion
+from app.modules.profesores.schemas import ProfesorFila
 from app.modules.usuarios.schemas import UsuarioOut
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 
 @router.get("/obtener-secciones", response_model=List[schemas.Seccion])
-def get_secciones(db: Session = Depends(get_db), current_user: UsuarioOut = Depends(get_current_user)):
-    from sqlalchemy.orm import aliased
-    from app.modules.usuarios.models import Usuario
-    
-    ProfesorGuia = aliased(Usuario)
-    
-    query = db.query(
-        Seccion,
-        ProfesorGuia.nombre.label('profesor_guia_nombre')
-    ).outerjoin(
-        ProfesorGuia, Seccion.id_profesor_guia == ProfesorGuia.id_usuario
-    )
-    
-    result = query.all()
+def get_secciones(
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = Query(None, description="Sin límite se devuelven todas las secciones"),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: UsuarioOut = Depends(get_current_user)
+):
+    query = db.query(Seccion).options(joinedload(Seccion.profesor_guia))
+    
+    result, next_cursor = paginar(query, crud.ORDEN_SECCIONES, limit, cursor=cursor, skip=skip)
     
     secciones = []
-    for seccion, profesor_guia_nombre in result:
+    for seccion in result:
         seccion_dict = {
             "id_seccion": seccion.id_seccion,
             "nombre": seccion.nombre,
             "grado": seccion.grado,
             "id_profesor_guia": seccion.id_profesor_guia,
             "id_anio": seccion.id_anio,
-            "profesor_guia_nombre": profesor_guia_nombre
+            "profesor_guia_nombre": seccion.profesor_guia.nombre if seccion.profesor_guia else None
         }
         secciones.append(seccion_dict)
     
+    agregar_cursor(response, next_cursor)
     return secciones
 
 
 @router.get("/obtener-secciones-por-anio/{id_anio}", response_model=List[schemas.Seccion])
-def get_secciones_by_anio(id_anio: UUID, db: Session = Depends(get_db), current_user: UsuarioOut = Depends(get_current_user)):
-    from sqlalchemy.orm import aliased
-    from app.modules.usuarios.models import Usuario
-    
-    ProfesorGuia = aliased(Usuario)
-    
-    query = db.query(
-        Seccion,
-        ProfesorGuia.nombre.label('profesor_guia_nombre')
-    ).outerjoin(
-        ProfesorGuia, Seccion.id_profesor_guia == ProfesorGuia.id_usuario
-    ).filter(Seccion.id_anio == id_anio)
-    
-    result = query.all()
+def get_secciones_by_anio(
+    id_anio: UUID,
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = Query(None, description="Sin límite se devuelven todas las secciones"),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: UsuarioOut = Depends(get_current_user)
+):
+    query = db.query(Seccion).options(joinedload(Seccion.profesor_guia)).filter(Seccion.id_anio == id_anio)
+    
+    result, next_cursor = paginar(query, crud.ORDEN_SECCIONES, limit, cursor=cursor, skip=skip)
     
     secciones = []
-    for seccion, profesor_guia_nombre in result:
+    for seccion in result:
         seccion_dict = {
             "id_seccion": seccion.id_seccion,
             "nombre": seccion.nombre,
             "grado": seccion.grado,
             "id_profesor_guia": seccion.id_profesor_guia,
             "id_anio": seccion.id_anio,
-            "profesor_guia_nombre": profesor_guia_nombre
+            "profesor_guia_nombre": seccion.profesor_guia.nombre if seccion.profesor_guia else None
         }
         secciones.append(seccion_dict)
     
+    agregar_cursor(response, next_cursor)
     return secciones
 
 
@@ -95,12 +96,7 @@ def create_seccion(seccion_in: schemas.SeccionCreate, db: Session = Depends(get_
     
     nueva_seccion = crud.create_seccion(db=db, seccion=seccion_in)
     
-    profesor_guia_nombre = None
-    if nueva_seccion.id_profesor_guia:
-        from app.modules.usuarios.models import Usuario
-        profesor_guia = db.query(Usuario).filter(Usuario.id_usuario == nueva_seccion.id_profesor_guia).first()
-        if profesor_guia:
-            profesor_guia_nombre = profesor_guia.nombre
+    profesor_guia_nombre = crud.get_nombre_profesor_guia(db, nueva_seccion.id_profesor_guia)
     
     seccion_dict = {
         "id_seccion": nueva_seccion.id_seccion,
@@ -116,19 +112,14 @@ def create_seccion(seccion_in: schemas.SeccionCreate, db: Session = Depends(get_
 
 @router.get("/obtener-seccion/{id_seccion}", response_model=schemas.Seccion)
 def get_seccion(id_seccion: UUID, db: Session = Depends(get_db), current_user: UsuarioOut = Depends(get_current_user)):
-    db_seccion = crud.get_seccion(db, id_seccion=id_seccion)
+    db_seccion = crud.get_seccion_ref(db, id_seccion=id_seccion)
     if db_seccion is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Sección no encontrada"
         )
     
-    profesor_guia_nombre = None
-    if db_seccion.id_profesor_guia:
-        from app.modules.usuarios.models import Usuario
-        profesor_guia = db.query(Usuario).filter(Usuario.id_usuario == db_seccion.id_profesor_guia).first()
-        if profesor_guia:
-            profesor_guia_nombre = profesor_guia.nombre
+    profesor_guia_nombre = crud.get_nombre_profesor_guia(db, db_seccion.id_profesor_guia)
     
     seccion_dict = {
         "id_seccion": db_seccion.id_seccion,
@@ -173,12 +164,7 @@ def update_seccion(id_seccion: UUID, seccion_in: schemas.SeccionUpdate, db: Sess
     seccion_actualizada = crud.update_seccion(db=db, id_seccion=id_seccion, seccion_in=seccion_in)
     
     # Obtener el nombre del profesor guía si existe
-    profesor_guia_nombre = None
-    if seccion_actualizada.id_profesor_guia:
-        from app.modules.usuarios.models import Usuario
-        profesor_guia = db.query(Usuario).filter(Usuario.id_usuario == seccion_actualizada.id_profesor_guia).first()
-        if profesor_guia:
-            profesor_guia_nombre = profesor_guia.nombre
+    profesor_guia_nombre = crud.get_nombre_profesor_guia(db, seccion_actualizada.id_profesor_guia)
     
     # Crear un diccionario con los datos de la sección y el nombre del profesor guía
     seccion_dict = {
@@ -212,7 +198,7 @@ def delete_seccion(id_seccion: UUID, db: Session = Depends(get_db), current_user
 
 @router.get("/obtener-profesores-seccion/{id_seccion}", response_model=List[schemas.ProfesorBase])
 def get_profesores_by_seccion(id_seccion: UUID, db: Session = Depends(get_db), current_user: UsuarioOut = Depends(get_current_user)):
-    db_seccion = crud.get_seccion(db, id_seccion=id_seccion)
+    db_seccion = crud.get_seccion_ref(db, id_seccion=id_seccion)
     if db_seccion is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -220,4 +206,4 @@ def get_profesores_by_seccion(id_seccion: UUID, db: Session = Depends(get_db), c
         )
     
     profesores = crud.get_profesores_by_seccion(db=db, id_seccion=id_seccion)
-    return profesores
+    return responder_filas(profesores, ProfesorFila)
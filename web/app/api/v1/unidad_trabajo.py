@@ -0,0 +1,76 @@
+"""
+Unidad de trabajo por petición.
+
+Las funciones de crud solo hacen flush; la transacción de la sesión de `get_db` se
+confirma una vez, al terminar el endpoint y antes de enviar la respuesta, así que un
+error al confirmar llega al cliente como 500 en lugar de perderse. Una respuesta con
+estado >= 400 o una excepción deshacen todo lo escrito en la petición, y una petición
+que solo leyó no paga un commit.
+
+Los eventos que se publican con `publicar_al_confirmar` (las notificaciones, por
+ejemplo) no añaden commits: con el transporte local se entregan en proceso y con
+Postgres el NOTIFY va en la misma transacción. La excepción son las invalidaciones
+de caché del bus (app/core/invalidacion.py) con PUBSUB_BACKEND=postgres: se publican
+después del commit en una transacción propia, que solo hace NOTIFY y también se
+cuenta en X-DB-Commits. El bus numera sus mensajes en el orden en que los publica,
+así que no pueden ir dentro de transacciones que se confirman en otro orden.
+
+Cuando un paso puede fallar sin tumbar el resto (por ejemplo, las notificaciones de
+un aviso), el endpoint lo envuelve en un savepoint:
+
+    try:
+        with db.begin_nested():
+            ...
+    except Exception as e:
+        print(...)
+
+Todos los routers usan `APIRouter(route_class=RutaUnidadTrabajo)`.
+"""
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+# Atributo de request.state donde get_db deja la sesión de la petición
+ATRIBUTO_SESION = "db"
+# Marca en db.info: la transacción ejecutó algo distinto de un SELECT
+CLAVE_ESCRITURA = "unidad_trabajo_escritura"
+
+
+class RutaUnidadTrabajo(APIRoute):
+    def get_route_handler(self) -> Callable:
+        manejar = super().get_route_handler()
+
+        async def manejar_en_transaccion(request: Request) -> Response:
+            try:
+                respuesta = await manejar(request)
+            except BaseException:
+                await _terminar(request, confirmar=False)
+                raise
+            await _terminar(request, confirmar=respuesta.status_code < 400)
+            return respuesta
+
+        return manejar_en_transaccion
+
+
+async def _terminar(request: Request, confirmar: bool) -> None:
+    db = getattr(request.state, ATRIBUTO_SESION, None)
+    if db is None or not db.in_transaction():
+        return
+    escribio = db.info.pop(CLAVE_ESCRITURA, False)
+    await run_in_threadpool(db.commit if confirmar and escribio else db.rollback)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _marcar_sentencia(estado: ORMExecuteState) -> None:
+    # Cualquier sentencia que no sea SELECT (DML, text(...)) cuenta como escritura
+    if not estado.is_select:
+        estado.session.info[CLAVE_ESCRITURA] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _marcar_flush(session: Session, flush_context) -> None:
+    session.info[CLAVE_ESCRITURA] = True
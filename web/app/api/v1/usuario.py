@@ -1,22 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import Optional, Tuple, List
 import uuid
 from app.modules.usuarios.schemas import UsuarioBase
 from app.modules.usuarios.crud import eliminar_usuario_por_id, obtener_usuarios_por_rol
 from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.unidad_trabajo import RutaUnidadTrabajo
+from app.core.campos import parsear_campos, responder_campos
 
-router = APIRouter()
+router = APIRouter(route_class=RutaUnidadTrabajo)
 
 
 @router.get("/obtener-usuarios/{rol}", response_model=List[UsuarioBase])
-def obtener_usuarios(db: Session = Depends(get_db), usuario_actual = Depends(get_current_user), rol: str = "profesor"):
+def obtener_usuarios(
+    db: Session = Depends(get_db),
+    usuario_actual = Depends(get_current_user),
+    rol: str = "profesor",
+    fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas (por defecto todos)")
+):
     if usuario_actual.rol != "direccion":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="No tienes permisos para obtener usuarios"
         )
-    return obtener_usuarios_por_rol(db, rol)
+    campos = parsear_campos(fields, UsuarioBase)
+    return responder_campos(obtener_usuarios_por_rol(db, rol, campos), UsuarioBase, campos)
 
 
 @router.delete("/eliminar/{id_usuario}")
@@ -0,0 +1,239 @@
+"""
+Caché HTTP de respuestas para datos de referencia (materias, secciones, años lectivos).
+
+Un middleware ASGI guarda la respuesta 200 de las rutas registradas con la clave
+(ruta, query string, rol del token) y la sirve con un ETag fuerte y
+`Cache-Control: private, no-cache`. Un `If-None-Match` que coincide recibe 304 antes
+de resolver dependencias, es decir, sin abrir sesión de base de datos. El rol se lee
+del claim "rol" del JWT; los tokens sin ese claim pasan sin caché.
+
+Como las dependencias no llegan a ejecutarse, antes de usar la caché el middleware
+comprueba lo mismo que `get_current_user`: que el usuario del token siga existiendo,
+y además que su rol actual sea el del token. Lo hace con la copia por worker de
+app/modules/usuarios/autorizacion.py, que las eliminaciones de usuarios invalidan;
+si no, la petición sigue sin caché y la dependencia la rechaza.
+
+Cada ruta declara etiquetas ("materias", "secciones", ...). Las funciones de crud
+llaman a `invalidar_al_confirmar(db, etiqueta)` y, cuando la transacción se confirma,
+el bus de invalidación (app/core/invalidacion.py) descarta las entradas con esa
+etiqueta en todos los workers.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from jose import jwt
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.configs import settings
+from app.core.invalidacion import obtener_bus
+
+logger = logging.getLogger(__name__)
+
+NOMBRE_CACHE = "http"
+
+# Cabeceras de la respuesta original que no se guardan con la entrada
+CABECERAS_EXCLUIDAS = {b"content-length", b"etag", b"cache-control", b"date", b"server"}
+
+Clave = Tuple[str, str, str]
+
+
+class Entrada:
+    __slots__ = ("cuerpo", "etag", "cabeceras", "etiquetas", "creada", "expira")
+
+    def __init__(self, cuerpo: bytes, cabeceras: List[Tuple[bytes, bytes]], etiquetas: Set[str]):
+        self.cuerpo = cuerpo
+        self.etag = '"' + hashlib.sha256(cuerpo).hexdigest()[:32] + '"'
+        self.cabeceras = cabeceras
+        self.etiquetas = etiquetas
+        self.creada = time.monotonic()
+        # Instante (monotónico) en que caduca antes del TTL, si el contenido lo exige
+        self.expira: Optional[float] = None
+
+
+class CacheRespuestas:
+    def __init__(self, ttl: int, maximo_entradas: int):
+        self._ttl = ttl
+        self._maximo = maximo_entradas
+        self._entradas: "OrderedDict[Clave, Entrada]" = OrderedDict()
+        # Versión por etiqueta: una respuesta calculada mientras se invalidaba no se guarda
+        self._versiones: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: Clave) -> Optional[Entrada]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            ahora = time.monotonic()
+            if ahora - entrada.creada > self._ttl or (entrada.expira is not None and ahora >= entrada.expira):
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            return entrada
+
+    def versiones(self, etiquetas: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versiones.get(etiqueta, 0) for etiqueta in etiquetas)
+
+    def guardar(self, clave: Clave, entrada: Entrada, versiones: Tuple[int, ...]) -> None:
+        with self._lock:
+            if tuple(self._versiones.get(etiqueta, 0) for etiqueta in sorted(entrada.etiquetas)) != versiones:
+                return
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self._maximo:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, etiquetas: Iterable[str]) -> None:
+        etiquetas = set(etiquetas)
+        if not etiquetas:
+            return
+        with self._lock:
+            for etiqueta in etiquetas:
+                self._versiones[etiqueta] = self._versiones.get(etiqueta, 0) + 1
+            for clave in [clave for clave, entrada in self._entradas.items() if entrada.etiquetas & etiquetas]:
+                del self._entradas[clave]
+
+    def limpiar(self) -> None:
+        with self._lock:
+            for etiqueta in self._versiones:
+                self._versiones[etiqueta] += 1
+            self._entradas.clear()
+
+
+_cache: Optional[CacheRespuestas] = None
+_cache_lock = threading.Lock()
+
+
+def obtener_cache_http() -> CacheRespuestas:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheRespuestas(settings.HTTP_CACHE_TTL, settings.HTTP_CACHE_MAX_ENTRADAS)
+            obtener_bus().registrar(NOMBRE_CACHE, invalidar=_cache.invalidar, limpiar=_cache.limpiar)
+        return _cache
+
+
+def invalidar_al_confirmar(db: Session, *etiquetas: str) -> None:
+    """Marca etiquetas a invalidar en todos los workers cuando la transacción de `db` se confirme"""
+    obtener_cache_http()
+    obtener_bus().invalidar_al_confirmar(db, NOMBRE_CACHE, etiquetas)
+
+
+def coincide_etag(if_none_match: Optional[bytes], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    valores = [valor.strip() for valor in if_none_match.decode("latin-1").split(",")]
+    return "*" in valores or etag in valores
+
+
+def _cabeceras_cache(entrada: Entrada) -> List[Tuple[bytes, bytes]]:
+    return [
+        (b"etag", entrada.etag.encode()),
+        (b"cache-control", b"private, no-cache"),
+        (b"vary", b"Authorization"),
+    ]
+
+
+class MiddlewareCacheHttp:
+    """
+    Middleware ASGI. `rutas` asocia cada ruta (path exacto) con sus etiquetas de invalidación.
+    """
+
+    def __init__(self, app, rutas: Dict[str, Iterable[str]]):
+        self.app = app
+        self.rutas = {ruta: tuple(sorted(etiquetas)) for ruta, etiquetas in rutas.items()}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in self.rutas:
+            await self.app(scope, receive, send)
+            return
+
+        cabeceras = dict(scope["headers"])
+        usuario = self._usuario(cabeceras.get(b"authorization"))
+        if usuario is None or not await self._vigente(*usuario):
+            await self.app(scope, receive, send)
+            return
+        rol = usuario[1]
+
+        cache = obtener_cache_http()
+        etiquetas = self.rutas[scope["path"]]
+        clave = (scope["path"], scope.get("query_string", b"").decode("latin-1"), rol)
+        if_none_match = cabeceras.get(b"if-none-match")
+
+        entrada = cache.obtener(clave)
+        if entrada is not None:
+            await self._enviar(send, entrada, coincide_etag(if_none_match, entrada.etag))
+            return
+
+        versiones = cache.versiones(etiquetas)
+        inicio: dict = {}
+        partes: List[bytes] = []
+
+        async def capturar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                inicio.update(mensaje)
+                return
+            if mensaje["type"] != "http.response.body":
+                await send(mensaje)
+                return
+            if inicio.get("status") != 200:
+                if inicio:
+                    await send(inicio)
+                    inicio.clear()
+                await send(mensaje)
+                return
+            partes.append(mensaje.get("body", b""))
+            if mensaje.get("more_body", False):
+                return
+            guardadas = [(nombre, valor) for nombre, valor in inicio["headers"] if nombre.lower() not in CABECERAS_EXCLUIDAS]
+            nueva = Entrada(b"".join(partes), guardadas, set(etiquetas))
+            cache.guardar(clave, nueva, versiones)
+            await self._enviar(send, nueva, coincide_etag(if_none_match, nueva.etag))
+
+        await self.app(scope, receive, capturar)
+
+    @staticmethod
+    def _usuario(autorizacion: Optional[bytes]) -> Optional[Tuple[UUID, str]]:
+        """(id, rol) del token si la firma es válida; sin DB, igual que get_current_user_id"""
+        if not autorizacion or not autorizacion.lower().startswith(b"bearer "):
+            return None
+        token = autorizacion[7:].decode("latin-1").strip()
+        try:
+            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+            id_usuario = UUID(payload["sub"])
+        except Exception:
+            return None
+        rol = payload.get("rol")
+        if rol is None:
+            return None
+        return id_usuario, rol
+
+    @staticmethod
+    async def _vigente(id_usuario: UUID, rol: str) -> bool:
+        """El usuario sigue existiendo con el rol del token"""
+        from app.modules.usuarios.autorizacion import rol_en_cache, rol_vigente
+
+        encontrado, rol_actual = rol_en_cache(id_usuario)
+        if not encontrado:
+            # Solo la primera petición del usuario en el worker (o tras invalidarlo) consulta
+            rol_actual = await run_in_threadpool(rol_vigente, id_usuario)
+        return rol_actual == rol
+
+    @staticmethod
+    async def _enviar(send, entrada: Entrada, no_modificado: bool) -> None:
+        if no_modificado:
+            await send({"type": "http.response.start", "status": 304, "headers": _cabeceras_cache(entrada)})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        cabeceras = entrada.cabeceras + _cabeceras_cache(entrada) + [
+            (b"content-length", str(len(entrada.cuerpo)).encode())
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": cabeceras})
+        await send({"type": "http.response.body", "body": entrada.cuerpo})
@@ -0,0 +1,234 @@
+"""
+Caché de páginas completas para las páginas públicas (portada, noticias, Junta y Patronato).
+
+Un middleware ASGI guarda el HTML 200 de las rutas registradas, ya comprimido con
+cada codificación disponible, y en los aciertos lo envía desde memoria sin pasar por
+FastAPI, Jinja ni el middleware de compresión. La clave es (esquema y host, ruta, query
+string): el HTML lleva URLs absolutas. Las respuestas llevan un ETag fuerte con
+`Cache-Control: public, no-cache`, así que el navegador revalida y recibe 304.
+
+Cada ruta declara sus claves sustitutas (surrogate keys: "paginas", "inicio", ...),
+que también van en la cabecera `Surrogate-Key` por si hay un CDN delante. Para purgar:
+
+    purgar_paginas("inicio")                   # ya, en todos los workers
+    purgar_paginas_al_confirmar(db, "inicio")  # al confirmarse la transacción (crud)
+
+La purga usa el bus de invalidación (app/core/invalidacion.py) igual que la caché HTTP.
+Sin purga una página vive PAGINAS_CACHE_TTL segundos (el año del pie de página, por
+ejemplo, se actualiza así). Si su contenido cambia antes solo con el paso del tiempo
+(los próximos eventos de la portada), la ruta lo indica con `caducar_pagina_en`.
+"""
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.cache_http import CABECERAS_EXCLUIDAS, CacheRespuestas, Entrada, coincide_etag
+from app.core.compresion import BROTLI, codificaciones_disponibles, comprimir, elegir_codificacion
+from app.core.configs import settings
+from app.core.estaticos import CACHE_REVALIDAR
+from app.core.invalidacion import obtener_bus
+
+NOMBRE_CACHE = "paginas"
+
+# Clave que tienen todas las páginas: purgarla las descarta todas
+CLAVE_TODAS = "paginas"
+
+# Cabecera interna (no llega al cliente): segundos hasta que la página deja de ser válida
+CABECERA_CADUCA = "x-pagina-caduca"
+_CABECERA_CADUCA = CABECERA_CADUCA.encode()
+
+
+class EntradaPagina(Entrada):
+    __slots__ = ("comprimidos",)
+
+    def __init__(self, cuerpo: bytes, cabeceras: List[Tuple[bytes, bytes]], etiquetas: Set[str]):
+        super().__init__(cuerpo, cabeceras, etiquetas)
+        # Se comprime una sola vez, con el nivel máximo; solo si ahorra algo
+        self.comprimidos: Dict[str, bytes] = {}
+        for codificacion in codificaciones_disponibles():
+            comprimido = comprimir(cuerpo, codificacion, 11 if codificacion == BROTLI else 9)
+            if len(comprimido) < len(cuerpo):
+                self.comprimidos[codificacion] = comprimido
+
+
+class MetricasPaginas:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.purgas = 0
+
+    def registrar(self, acierto: bool) -> None:
+        with self._lock:
+            if acierto:
+                self.aciertos += 1
+            else:
+                self.fallos += 1
+
+    def registrar_purga(self) -> None:
+        with self._lock:
+            self.purgas += 1
+
+    def resumen(self) -> dict:
+        with self._lock:
+            return {"aciertos": self.aciertos, "fallos": self.fallos, "purgas": self.purgas}
+
+
+metricas = MetricasPaginas()
+
+_cache: Optional[CacheRespuestas] = None
+_cache_lock = threading.Lock()
+
+
+def obtener_cache_paginas() -> CacheRespuestas:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheRespuestas(settings.PAGINAS_CACHE_TTL, settings.PAGINAS_CACHE_MAX_ENTRADAS)
+
+            def invalidar(claves: Set[str]) -> None:
+                metricas.registrar_purga()
+                _cache.invalidar(claves)
+
+            def limpiar() -> None:
+                metricas.registrar_purga()
+                _cache.limpiar()
+
+            obtener_bus().registrar(NOMBRE_CACHE, invalidar=invalidar, limpiar=limpiar)
+        return _cache
+
+
+def purgar_paginas(*claves: str) -> None:
+    """Descarta en todos los workers las páginas con alguna de `claves` (todas si no se indica ninguna)"""
+    obtener_cache_paginas()
+    obtener_bus().invalidar(NOMBRE_CACHE, claves or (CLAVE_TODAS,))
+
+
+def purgar_paginas_al_confirmar(db: Session, *claves: str) -> None:
+    """Como `purgar_paginas`, cuando la transacción de `db` se confirme"""
+    obtener_cache_paginas()
+    obtener_bus().invalidar_al_confirmar(db, NOMBRE_CACHE, claves or (CLAVE_TODAS,))
+
+
+def caducar_pagina_en(respuesta, instante: datetime) -> None:
+    """La copia cacheada de `respuesta` caduca en `instante` si llega antes que el TTL"""
+    segundos = (instante - datetime.now(instante.tzinfo)).total_seconds()
+    respuesta.headers[CABECERA_CADUCA] = str(max(0.0, segundos))
+
+
+def _sin_cabecera_caduca(inicio: dict) -> dict:
+    cabeceras = inicio.get("headers", [])
+    if not any(nombre.lower() == _CABECERA_CADUCA for nombre, _ in cabeceras):
+        return inicio
+    return {**inicio, "headers": [(nombre, valor) for nombre, valor in cabeceras if nombre.lower() != _CABECERA_CADUCA]}
+
+
+class MiddlewareCachePaginas:
+    """
+    Middleware ASGI. `rutas` asocia cada ruta (path exacto) con sus claves sustitutas;
+    todas reciben además CLAVE_TODAS.
+    """
+
+    def __init__(self, app, rutas: Dict[str, Iterable[str]]):
+        self.app = app
+        self.rutas = {ruta: tuple(sorted({CLAVE_TODAS, *claves})) for ruta, claves in rutas.items()}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] != "GET" or scope["path"] not in self.rutas or not settings.PAGINAS_CACHE_ACTIVA:
+            # Sin guardar la página, la cabecera interna tampoco sale al cliente
+            async def enviar(mensaje):
+                if mensaje["type"] == "http.response.start":
+                    mensaje = _sin_cabecera_caduca(mensaje)
+                await send(mensaje)
+
+            await self.app(scope, receive, enviar)
+            return
+
+        cabeceras = dict(scope["headers"])
+        cache = obtener_cache_paginas()
+        claves = self.rutas[scope["path"]]
+        clave = (
+            scope.get("scheme", "http") + "://" + cabeceras.get(b"host", b"").decode("latin-1"),
+            scope["path"],
+            scope.get("query_string", b"").decode("latin-1"),
+        )
+        accept_encoding = cabeceras.get(b"accept-encoding", b"").decode("latin-1")
+        if_none_match = cabeceras.get(b"if-none-match")
+
+        entrada = cache.obtener(clave)
+        if entrada is not None:
+            metricas.registrar(acierto=True)
+            await self._enviar(send, entrada, accept_encoding, if_none_match)
+            return
+
+        metricas.registrar(acierto=False)
+        versiones = cache.versiones(claves)
+        inicio: dict = {}
+        partes: List[bytes] = []
+
+        async def capturar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                inicio.update(mensaje)
+                return
+            if mensaje["type"] != "http.response.body":
+                await send(mensaje)
+                return
+            if inicio.get("status") != 200 or not self._es_html(inicio):
+                if inicio:
+                    await send(_sin_cabecera_caduca(inicio))
+                    inicio.clear()
+                await send(mensaje)
+                return
+            partes.append(mensaje.get("body", b""))
+            if mensaje.get("more_body", False):
+                return
+            caduca = None
+            guardadas = []
+            for nombre, valor in inicio["headers"]:
+                if nombre.lower() == _CABECERA_CADUCA:
+                    caduca = float(valor)
+                elif nombre.lower() not in CABECERAS_EXCLUIDAS:
+                    guardadas.append((nombre, valor))
+            nueva = EntradaPagina(b"".join(partes), guardadas, set(claves))
+            if caduca is not None:
+                nueva.expira = nueva.creada + caduca
+            cache.guardar(clave, nueva, versiones)
+            await self._enviar(send, nueva, accept_encoding, if_none_match)
+
+        await self.app(scope, receive, capturar)
+
+    @staticmethod
+    def _es_html(inicio: dict) -> bool:
+        for nombre, valor in inicio.get("headers", []):
+            if nombre.lower() == b"content-type":
+                return valor.startswith(b"text/html")
+        return False
+
+    @staticmethod
+    async def _enviar(send, entrada: EntradaPagina, accept_encoding: str, if_none_match: Optional[bytes]) -> None:
+        codificacion = elegir_codificacion(accept_encoding, tuple(entrada.comprimidos))
+        # Mismo sufijo que el middleware de compresión, que lo quita del If-None-Match
+        etag = entrada.etag if codificacion is None else entrada.etag[:-1] + f'-{codificacion}"'
+        cabeceras = [
+            (b"etag", etag.encode()),
+            (b"cache-control", CACHE_REVALIDAR.encode()),
+            (b"vary", b"Accept-Encoding"),
+            (b"surrogate-key", " ".join(sorted(entrada.etiquetas)).encode()),
+        ]
+        if coincide_etag(if_none_match, entrada.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": cabeceras})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        cuerpo = entrada.cuerpo if codificacion is None else entrada.comprimidos[codificacion]
+        cabeceras = [(nombre, valor) for nombre, valor in entrada.cabeceras if nombre.lower() != b"vary"] + cabeceras
+        if codificacion is not None:
+            cabeceras.append((b"content-encoding", codificacion.encode()))
+        cabeceras.append((b"content-length", str(len(cuerpo)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": cabeceras})
+        await send({"type": "http.response.body", "body": cuerpo})
@@ -0,0 +1,107 @@
+"""
+Selección de campos (`?fields=`) en los listados.
+
+El cliente pide solo los campos que va a mostrar, separados por comas:
+
+    GET /documentos/todos-documentos?fields=id_documento,titulo,tipo
+
+`parsear_campos` los valida contra el esquema de respuesta del endpoint (un campo
+desconocido es un 400), el crud limita el SELECT a esas columnas con `load_only`
+(`proyectar`) y `responder_campos` serializa cada fila con un esquema reducido que
+solo contiene esos campos, así que las columnas no pedidas ni se leen ni viajan.
+Sin `fields` el endpoint responde como siempre, con el esquema completo.
+
+La clave primaria y las columnas del orden de paginación se cargan siempre (el
+identity map y el cursor las necesitan), aunque no se devuelvan.
+"""
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from pydantic_core import to_json
+from sqlalchemy import inspect
+from sqlalchemy.orm import Query, load_only
+
+from app.core.paginacion import columnas_orden
+
+Campos = Tuple[str, ...]
+
+
+class CamposInvalidos(ValueError):
+    """`fields` con campos que no existen en el esquema; main.py lo traduce a 400"""
+
+    def __init__(self, desconocidos: Sequence[str]):
+        super().__init__(", ".join(desconocidos))
+        self.desconocidos = list(desconocidos)
+
+
+def parsear_campos(fields: Optional[str], esquema: type[BaseModel]) -> Optional[Campos]:
+    """Campos pedidos en `fields` (en el orden del esquema), o None si no se pidió ninguno"""
+    if not fields:
+        return None
+    pedidos = {campo.strip() for campo in fields.split(",") if campo.strip()}
+    if not pedidos:
+        return None
+    desconocidos = sorted(pedidos - esquema.model_fields.keys())
+    if desconocidos:
+        raise CamposInvalidos(desconocidos)
+    return tuple(campo for campo in esquema.model_fields if campo in pedidos)
+
+
+def proyectar(query: Query, modelo, campos: Optional[Campos], orden: Sequence = ()) -> Query:
+    """Limita la consulta de `modelo` a las columnas de `campos` (más la clave primaria y `orden`)"""
+    if campos is None:
+        return query
+    mapper = inspect(modelo)
+    claves = set(campos)
+    claves.update(columna.key for columna in mapper.primary_key)
+    claves.update(columna.key for columna in columnas_orden(orden))
+    atributos = [atributo for atributo in mapper.column_attrs if atributo.key in claves]
+    return query.options(load_only(*[atributo.class_attribute for atributo in atributos]))
+
+
+@lru_cache(maxsize=256)
+def esquema_parcial(esquema: type[BaseModel], campos: Campos) -> type[BaseModel]:
+    """Esquema con solo `campos` de `esquema`, con los mismos tipos y validaciones"""
+    return create_model(
+        f"{esquema.__name__}Parcial",
+        __config__=ConfigDict(from_attributes=True),
+        **{campo: (esquema.model_fields[campo].annotation, esquema.model_fields[campo]) for campo in campos},
+    )
+
+
+@lru_cache(maxsize=256)
+def _adaptador_lista(esquema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[esquema])
+
+
+def serializar_campos(filas: Sequence[Any], esquema: type[BaseModel], campos: Campos) -> list:
+    """Filas (objetos ORM) validadas con el esquema reducido; solo lee los atributos pedidos"""
+    return _adaptador_lista(esquema_parcial(esquema, campos)).validate_python(list(filas), from_attributes=True)
+
+
+def responder_campos(
+    filas: Sequence[Any], esquema: type[BaseModel], campos: Optional[Campos], response: Optional[Response] = None
+):
+    """
+    Sin `campos` devuelve las filas tal cual (las valida el response_model); con
+    `campos`, una respuesta JSON con solo esos campos por fila
+    """
+    if campos is None:
+        return filas
+    return responder_json(serializar_campos(filas, esquema, campos), response)
+
+
+def responder_json(contenido: Any, response: Optional[Response] = None) -> Response:
+    """
+    Respuesta JSON de datos ya validados (por ejemplo, listas de `serializar_campos`).
+    `response` es el parámetro Response del endpoint: sus cabeceras (X-Next-Cursor) se
+    copian, porque FastAPI no las agrega cuando el endpoint devuelve su propia respuesta
+    """
+    respuesta = Response(content=to_json(contenido), media_type="application/json")
+    if response is not None:
+        for nombre, valor in response.headers.items():
+            if nombre not in ("content-length", "content-type"):
+                respuesta.headers.append(nombre, valor)
+    return respuesta
@@ -0,0 +1,220 @@
+"""
+Compresión gzip/brotli de las respuestas.
+
+Un middleware ASGI comprime las respuestas de texto (JSON, HTML, CSS, JS, SVG) que
+superan COMPRESION_MINIMO_BYTES, con la codificación que prefiera el cliente según
+`Accept-Encoding`: brotli si el paquete `brotli` está instalado y el cliente lo
+acepta, si no gzip. Lo que ya viene comprimido (imágenes, archivos estáticos
+precomprimidos, cualquier respuesta con `Content-Encoding`) y el stream SSE pasan sin
+tocar. Las respuestas por partes se comprimen en streaming.
+
+El ETag de una respuesta comprimida lleva el sufijo de la codificación (`"abc-gzip"`)
+para no confundirla con la versión sin comprimir; el middleware quita ese sufijo del
+`If-None-Match` de la petición, así que la caché HTTP (app/core/cache_http.py) y los
+archivos estáticos siguen respondiendo 304.
+"""
+import re
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+from app.core.configs import settings
+
+try:
+    import brotli
+except ImportError:  # Sin el paquete brotli solo se usa gzip
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+# Extensión de los archivos precomprimidos por codificación
+EXTENSIONES = {BROTLI: ".br", GZIP: ".gz"}
+
+TIPOS_COMPRIMIBLES = frozenset({
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+})
+
+_SUFIJO_ETAG = re.compile(r'-(?:gzip|br)"')
+
+
+def codificaciones_disponibles() -> Tuple[str, ...]:
+    """Codificaciones que el servidor puede producir, en orden de preferencia"""
+    return (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def elegir_codificacion(accept_encoding: str, disponibles: Iterable[str]) -> Optional[str]:
+    """Primera codificación de `disponibles` que el cliente acepta (q > 0) en `Accept-Encoding`"""
+    aceptadas = {}
+    for parte in accept_encoding.lower().split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        calidad = 1.0
+        parametro = parametros.strip()
+        if parametro.startswith("q="):
+            try:
+                calidad = float(parametro[2:])
+            except ValueError:
+                calidad = 0.0
+        if nombre:
+            aceptadas[nombre.strip()] = calidad
+    for codificacion in disponibles:
+        if aceptadas.get(codificacion, aceptadas.get("*", 0.0)) > 0:
+            return codificacion
+    return None
+
+
+def es_comprimible(tipo_contenido: str) -> bool:
+    return tipo_contenido.split(";", 1)[0].strip().lower() in TIPOS_COMPRIMIBLES
+
+
+def comprimir(datos: bytes, codificacion: str, nivel: Optional[int] = None) -> bytes:
+    """Comprime `datos` de una vez (nivel por defecto: el de la configuración)"""
+    compresor = Compresor(codificacion, nivel)
+    return compresor.comprimir(datos) + compresor.terminar()
+
+
+class Compresor:
+    """Compresión incremental con la misma interfaz para gzip y brotli"""
+
+    def __init__(self, codificacion: str, nivel: Optional[int] = None):
+        if codificacion == BROTLI:
+            self._objeto = brotli.Compressor(
+                quality=settings.COMPRESION_NIVEL_BROTLI if nivel is None else nivel
+            )
+            self._comprimir, self._terminar = self._objeto.process, self._objeto.finish
+        else:
+            # wbits=31: formato gzip (cabecera y CRC), no zlib
+            self._objeto = zlib.compressobj(
+                settings.COMPRESION_NIVEL_GZIP if nivel is None else nivel, zlib.DEFLATED, 31
+            )
+            self._comprimir, self._terminar = self._objeto.compress, self._objeto.flush
+
+    def comprimir(self, datos: bytes) -> bytes:
+        return self._comprimir(datos)
+
+    def terminar(self) -> bytes:
+        return self._terminar()
+
+
+def _agregar_vary(cabeceras: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    for indice, (nombre, valor) in enumerate(cabeceras):
+        if nombre.lower() == b"vary":
+            if b"accept-encoding" in valor.lower() or valor.strip() == b"*":
+                return cabeceras
+            cabeceras[indice] = (nombre, valor + b", Accept-Encoding")
+            return cabeceras
+    cabeceras.append((b"vary", b"Accept-Encoding"))
+    return cabeceras
+
+
+class MiddlewareCompresion:
+    """Middleware ASGI de compresión; va por fuera del resto para comprimir la respuesta final"""
+
+    def __init__(self, app, minimo: Optional[int] = None):
+        self.app = app
+        self.minimo = settings.COMPRESION_MINIMO_BYTES if minimo is None else minimo
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        if_none_match = None
+        for nombre, valor in scope["headers"]:
+            if nombre == b"accept-encoding":
+                accept_encoding = valor.decode("latin-1")
+            elif nombre == b"if-none-match":
+                if_none_match = valor
+        codificacion = elegir_codificacion(accept_encoding, codificaciones_disponibles())
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+
+        if if_none_match is not None:
+            normalizado = _SUFIJO_ETAG.sub('"', if_none_match.decode("latin-1")).encode("latin-1")
+            scope = {
+                **scope,
+                "headers": [
+                    (nombre, normalizado if nombre == b"if-none-match" else valor)
+                    for nombre, valor in scope["headers"]
+                ],
+            }
+
+        await self.app(scope, receive, _EnvioComprimido(send, codificacion, self.minimo))
+
+
+class _EnvioComprimido:
+    """`send` que retiene el inicio de la respuesta hasta saber si conviene comprimirla"""
+
+    def __init__(self, send, codificacion: str, minimo: int):
+        self._send = send
+        self._codificacion = codificacion
+        self._minimo = minimo
+        self._inicio = None
+        self._compresor: Optional[Compresor] = None
+        self._directo = False
+
+    async def __call__(self, mensaje):
+        tipo = mensaje["type"]
+        if tipo == "http.response.start":
+            self._inicio = mensaje
+            cabeceras = {nombre.lower(): valor for nombre, valor in mensaje.get("headers", [])}
+            tipo_contenido = cabeceras.get(b"content-type", b"").decode("latin-1")
+            if (
+                mensaje["status"] < 200 or mensaje["status"] in (204, 304)
+                or b"content-encoding" in cabeceras
+                or not es_comprimible(tipo_contenido)
+            ):
+                self._directo = True
+                await self._send(mensaje)
+            return
+
+        if tipo != "http.response.body" or self._directo:
+            await self._send(mensaje)
+            return
+
+        cuerpo = mensaje.get("body", b"")
+        mas = mensaje.get("more_body", False)
+
+        if self._inicio is not None:
+            inicio, self._inicio = self._inicio, None
+            cabeceras = _agregar_vary(list(inicio.get("headers", [])))
+            if not mas and len(cuerpo) < self._minimo:
+                await self._send({**inicio, "headers": cabeceras})
+                await self._send(mensaje)
+                return
+
+            self._compresor = Compresor(self._codificacion)
+            cabeceras = self._cabeceras_comprimidas(cabeceras)
+            if not mas:
+                cuerpo = self._compresor.comprimir(cuerpo) + self._compresor.terminar()
+                cabeceras.append((b"content-length", str(len(cuerpo)).encode()))
+                await self._send({**inicio, "headers": cabeceras})
+                await self._send({"type": "http.response.body", "body": cuerpo})
+                return
+            await self._send({**inicio, "headers": cabeceras})
+
+        datos = self._compresor.comprimir(cuerpo)
+        if not mas:
+            datos += self._compresor.terminar()
+        await self._send({"type": "http.response.body", "body": datos, "more_body": mas})
+
+    def _cabeceras_comprimidas(self, cabeceras: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+        resultado = []
+        for nombre, valor in cabeceras:
+            minuscula = nombre.lower()
+            if minuscula == b"content-length":
+                continue
+            if minuscula == b"etag" and valor.endswith(b'"'):
+                valor = valor[:-1] + b"-" + self._codificacion.encode() + b'"'
+            resultado.append((nombre, valor))
+        resultado.append((b"content-encoding", self._codificacion.encode()))
+        return resultado
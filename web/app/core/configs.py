@@ -9,5 +9,53 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Segundos que un worker reutiliza el contador de notificaciones sin consultar la base de datos
+    NOTIFICACION_CONTADOR_TTL: int = 10
+    # Transporte entre workers: "local" (un proceso) o "postgres" (LISTEN/NOTIFY)
+    PUBSUB_BACKEND: str = "local"
+    # Stream SSE de notificaciones: latido en segundos, eventos en cola por conexión e historial por usuario
+    NOTIFICACION_STREAM_HEARTBEAT: int = 15
+    NOTIFICACION_STREAM_COLA: int = 100
+    NOTIFICACION_STREAM_HISTORIAL: int = 50
+    # Ventana en milisegundos para agrupar las marcas de lectura en un solo UPDATE
+    NOTIFICACION_LECTURA_VENTANA_MS: int = 250
+    # Retención: las notificaciones leídas con más meses que este valor se archivan
+    # (o se eliminan si NOTIFICACION_ARCHIVAR es False); 0 desactiva la retención
+    NOTIFICACION_RETENCION_MESES: int = 12
+    NOTIFICACION_ARCHIVAR: bool = True
+    # Particiones mensuales que el mantenimiento crea por adelantado
+    NOTIFICACION_PARTICIONES_ADELANTE: int = 3
+    # Caché HTTP de datos de referencia: segundos máximos de vida y entradas por worker
+    HTTP_CACHE_TTL: int = 300
+    HTTP_CACHE_MAX_ENTRADAS: int = 1000
+    # Caché de consultas ORM: "memoria", "redis" o "" para desactivarla
+    QUERY_CACHE_BACKEND: str = "memoria"
+    QUERY_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    QUERY_CACHE_TTL: int = 300
+    QUERY_CACHE_MAX_ENTRADAS: int = 5000
+    # Segundos máximos que un worker reutiliza el año lectivo activo (se invalida al modificarlo)
+    ANIO_ACTIVO_CACHE_TTL: int = 3600
+    # Snapshot mapeado en memoria de materias, secciones, años lectivos y profesores,
+    # compartido por los workers de la máquina; "" usa el directorio temporal del sistema
+    REFERENCIA_SNAPSHOT_ACTIVO: bool = True
+    REFERENCIA_SNAPSHOT_DIR: str = ""
+    # Segundos que un worker reutiliza las relaciones de un usuario (hijos, secciones, materias)
+    # para autorizar; se invalidan al cambiar asignaciones
+    AUTORIZACION_CACHE_TTL: int = 300
+    # Compresión de respuestas: tamaño mínimo en bytes y niveles de gzip (1-9) y brotli (0-11)
+    COMPRESION_MINIMO_BYTES: int = 1024
+    COMPRESION_NIVEL_GZIP: int = 6
+    COMPRESION_NIVEL_BROTLI: int = 4
+    # Páginas públicas: CSS crítico en línea, hoja única sin bloquear, scripts con defer e
+    # imágenes del carrusel diferidas; solo tiene efecto si se hizo el build de estáticos
+    RENDER_OPTIMIZADO: bool = True
+    # Caché de páginas públicas completas en memoria: activa, segundos de vida y entradas por worker
+    PAGINAS_CACHE_ACTIVA: bool = True
+    PAGINAS_CACHE_TTL: int = 3600
+    PAGINAS_CACHE_MAX_ENTRADAS: int = 200
+    # Plantillas Jinja: revisar cambios en disco en cada render (solo en desarrollo) y
+    # directorio de la caché de bytecode ("" usa el directorio temporal del sistema)
+    PLANTILLAS_AUTO_RELOAD: bool = False
+    PLANTILLAS_BYTECODE_DIR: str = ""
 
 settings = Settings()
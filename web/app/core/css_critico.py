@@ -0,0 +1,178 @@
+"""
+Hoja de estilos única y CSS crítico de las páginas públicas (parte del build de
+app/core/estaticos.py).
+
+`construir_css` une las hojas de HOJAS_BUNDLE, en ese orden, en `css/bundle.css`
+(sin los @import entre ellas), y extrae de esa hoja el CSS crítico: las reglas cuyos
+selectores solo usan clases, IDs y etiquetas que aparecen en las regiones "arriba del
+pliegue" de las plantillas, marcadas con
+
+    {# critico #} ... {# /critico #}
+
+(el navbar y el hero de la portada). Ese CSS va en línea en el <head> y el bundle se
+carga sin bloquear el render. Las reglas de :hover/:focus/:active y los @import
+nunca son críticos; los @keyframes se incluyen si una regla crítica los usa.
+"""
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple, Union
+
+DIRECTORIO_PLANTILLAS = Path(__file__).resolve().parent.parent / "templates"
+
+# Hojas del bundle en orden de cascada
+HOJAS_BUNDLE = ("css/variables.css", "css/styles.css", "css/navbar.css", "css/home.css")
+BUNDLE = "css/bundle.css"
+CRITICO = "css/critico.css"
+
+# Siempre presentes en cualquier página
+ETIQUETAS_BASE = {"html", "body", "main", "img", "picture", "a", "button", "header", "nav"}
+
+_REGION = re.compile(r"\{#\s*critico\s*#\}(.*?)\{#\s*/critico\s*#\}", re.S)
+_COMENTARIO = re.compile(r"/\*.*?\*/", re.S)
+# class="..." del HTML y class='...' de los globales como imagen(...)
+_ATRIBUTO = re.compile(r"""\b(class|id)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_ETIQUETA = re.compile(r"<([a-zA-Z][a-zA-Z0-9-]*)")
+_IDENTIFICADOR = re.compile(r"[A-Za-z_-][A-Za-z0-9_-]*")
+_CLASE_O_ID = re.compile(r"([.#])([A-Za-z_-][A-Za-z0-9_-]*)")
+_TIPO = re.compile(r"(?:^|[\s>+~(])([a-zA-Z][a-zA-Z0-9-]*)")
+_PSEUDO_INTERACTIVO = re.compile(r":(hover|focus|focus-visible|focus-within|active|visited)\b")
+_PSEUDO = re.compile(r"::?[a-zA-Z-]+(\([^)]*\))?")
+_ANIMACION = re.compile(r"animation(?:-name)?\s*:\s*([^;]+)")
+
+# Regla: (selector, declaraciones) o bloque: (prelude de @, [reglas])
+Regla = Tuple[str, Union[str, list]]
+
+
+def parsear_css(texto: str) -> List[Regla]:
+    """Reglas de `texto`; los @media/@supports/@keyframes quedan como bloques anidados"""
+    texto = _COMENTARIO.sub("", texto)
+    reglas, _ = _parsear_bloque(texto, 0)
+    return reglas
+
+
+def _parsear_bloque(texto: str, posicion: int) -> Tuple[List[Regla], int]:
+    reglas: List[Regla] = []
+    inicio = posicion
+    while posicion < len(texto):
+        caracter = texto[posicion]
+        if caracter == ";" and texto[inicio:posicion].strip().startswith("@"):
+            # @import / @charset
+            reglas.append((texto[inicio:posicion].strip(), ""))
+            inicio = posicion + 1
+        elif caracter == "{":
+            prelude = texto[inicio:posicion].strip()
+            if prelude.startswith("@") and not prelude.startswith("@font-face"):
+                internas, posicion = _parsear_bloque(texto, posicion + 1)
+                reglas.append((prelude, internas))
+            else:
+                cierre = texto.index("}", posicion)
+                reglas.append((prelude, texto[posicion + 1:cierre].strip()))
+                posicion = cierre
+            inicio = posicion + 1
+        elif caracter == "}":
+            return reglas, posicion
+        posicion += 1
+    return reglas, posicion
+
+
+def _minificar_declaraciones(declaraciones: str) -> str:
+    partes = [parte.strip() for parte in declaraciones.split(";")]
+    return ";".join(re.sub(r"\s*:\s*", ":", parte, count=1) for parte in partes if parte)
+
+
+def serializar_css(reglas: Iterable[Regla]) -> str:
+    salida = []
+    for prelude, cuerpo in reglas:
+        prelude = re.sub(r"\s+", " ", prelude)
+        if isinstance(cuerpo, list):
+            salida.append(f"{prelude}{{{serializar_css(cuerpo)}}}")
+        elif prelude.startswith("@") and not cuerpo:
+            salida.append(f"{prelude};")
+        else:
+            salida.append(f"{prelude}{{{_minificar_declaraciones(cuerpo)}}}")
+    return "".join(salida)
+
+
+def simbolos_usados(html: str) -> Set[str]:
+    """Clases (`.x`), IDs (`#x`) y etiquetas que aparecen en un fragmento de plantilla"""
+    simbolos = {etiqueta.lower() for etiqueta in ETIQUETAS_BASE}
+    simbolos.update(etiqueta.lower() for etiqueta in _ETIQUETA.findall(html))
+    for atributo, dobles, simples in _ATRIBUTO.findall(html):
+        prefijo = "." if atributo == "class" else "#"
+        valor = dobles or simples
+        # Incluye los nombres dentro de expresiones Jinja ({{ 'active' if ... }}): sobra algo, no falta
+        simbolos.update(prefijo + nombre for nombre in _IDENTIFICADOR.findall(valor))
+    return simbolos
+
+
+def regiones_criticas(directorio: Path = DIRECTORIO_PLANTILLAS) -> str:
+    return "\n".join(
+        region
+        for plantilla in sorted(directorio.rglob("*.html"))
+        for region in _REGION.findall(plantilla.read_text(encoding="utf-8"))
+    )
+
+
+def _selector_critico(selector: str, simbolos: Set[str]) -> bool:
+    if _PSEUDO_INTERACTIVO.search(selector):
+        return False
+    base = _PSEUDO.sub("", selector)
+    if base.strip() in ("", "*", ":root"):
+        return True
+    for prefijo, nombre in _CLASE_O_ID.findall(base):
+        if prefijo + nombre not in simbolos:
+            return False
+    sin_clases = _CLASE_O_ID.sub(" ", re.sub(r"\[[^\]]*\]", " ", base))
+    return all(etiqueta.lower() in simbolos for etiqueta in _TIPO.findall(sin_clases))
+
+
+def _filtrar(reglas: List[Regla], simbolos: Set[str]) -> List[Regla]:
+    criticas: List[Regla] = []
+    for prelude, cuerpo in reglas:
+        if prelude.startswith("@import") or prelude.startswith("@charset") or prelude.startswith("@keyframes"):
+            continue
+        if isinstance(cuerpo, list):
+            internas = _filtrar(cuerpo, simbolos)
+            if internas:
+                criticas.append((prelude, internas))
+        elif prelude.startswith("@font-face") or prelude == ":root":
+            criticas.append((prelude, cuerpo))
+        else:
+            selectores = [s.strip() for s in prelude.split(",") if _selector_critico(s.strip(), simbolos)]
+            if selectores:
+                criticas.append((", ".join(selectores), cuerpo))
+    return criticas
+
+
+def _animaciones(reglas: Iterable[Regla]) -> Set[str]:
+    nombres: Set[str] = set()
+    for _, cuerpo in reglas:
+        if isinstance(cuerpo, list):
+            nombres |= _animaciones(cuerpo)
+        else:
+            for valor in _ANIMACION.findall(cuerpo):
+                nombres.update(_IDENTIFICADOR.findall(valor))
+    return nombres
+
+
+def extraer_critico(css: str, simbolos: Set[str]) -> str:
+    reglas = parsear_css(css)
+    criticas = _filtrar(reglas, simbolos)
+    usadas = _animaciones(criticas)
+    criticas += [
+        (prelude, cuerpo) for prelude, cuerpo in reglas
+        if prelude.startswith("@keyframes") and prelude.split()[-1] in usadas
+    ]
+    return serializar_css(criticas)
+
+
+def construir_css(origen: Path, plantillas: Optional[Path] = None) -> Tuple[str, str]:
+    """(bundle, css crítico) a partir de las hojas de HOJAS_BUNDLE en `origen`"""
+    partes = []
+    for hoja in HOJAS_BUNDLE:
+        texto = (origen / hoja).read_text(encoding="utf-8")
+        # Las hojas ya van todas en el bundle
+        partes.append(re.sub(r"@import\s+url\([^)]*\)\s*;|@import\s+['\"][^'\"]*['\"]\s*;", "", texto))
+    bundle = serializar_css(parsear_css("\n".join(partes)))
+    critico = extraer_critico(bundle, simbolos_usados(regiones_criticas(plantillas or DIRECTORIO_PLANTILLAS)))
+    return bundle, critico
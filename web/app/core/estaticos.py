@@ -0,0 +1,297 @@
+"""
+Archivos estáticos precomprimidos y con huella (fingerprint).
+
+El paso de build
+
+    python -m app.core.estaticos
+
+copia cada CSS/JS/SVG de app/static a app/static/dist con el hash de su contenido en
+el nombre (`css/home.css` -> `dist/css/home.3f9a1c2b.css`), escribe a su lado las
+versiones `.br` (si está instalado `brotli`) y `.gz` con el nivel máximo, y guarda
+el mapeo en `dist/manifest.json`. Las plantillas piden las URLs con `estatico(...)`:
+
+    <link rel="stylesheet" href="{{ estatico('css/home.css') }}">
+
+que devuelve la URL con huella si el archivo está en el manifiesto y la original si
+no (por ejemplo, en desarrollo sin build). Las imágenes pasan además por
+app/core/imagenes.py (variantes AVIF/WebP por ancho) y se insertan con `imagen(...)`,
+que arma un <picture> con `srcset`:
+
+    {{ imagen('img/escuela-ninos.jpg', 'Estudiantes', sizes='(min-width: 768px) 33vw, 100vw', class='grid-image') }}
+
+Con RENDER_OPTIMIZADO las páginas públicas usan además la hoja única `css/bundle.css`
+y el CSS crítico que genera app/core/css_critico.py: `render_optimizado()` indica a
+base.html si están disponibles, `css_critico()` devuelve el CSS a poner en línea y
+`precarga_imagen(...)` el <link rel="preload"> de la imagen principal (LCP).
+
+`ArchivosEstaticos` sirve el hermano `.br`/`.gz` de un archivo cuando existe y el
+cliente lo acepta, sin comprimir en cada petición. Los archivos con huella llevan
+`Cache-Control: public, max-age=31536000, immutable` (su contenido nunca cambia con
+el mismo nombre); el resto se revalida con ETag/Last-Modified.
+"""
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import stat
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from jinja2 import pass_context
+from markupsafe import Markup, escape
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from app.core.compresion import (
+    BROTLI,
+    EXTENSIONES,
+    GZIP,
+    codificaciones_disponibles,
+    comprimir,
+    elegir_codificacion,
+    es_comprimible,
+)
+from app.core.configs import settings
+from app.core.css_critico import BUNDLE, CRITICO, construir_css
+from app.core.imagenes import construir_imagenes
+
+DIRECTORIO_ESTATICOS = Path(__file__).resolve().parent.parent / "static"
+DIRECTORIO_DIST = "dist"
+MANIFIESTO = "manifest.json"
+
+# Extensiones que el build copia con huella y precomprime
+EXTENSIONES_BUILD = {".css", ".js", ".svg"}
+
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDAR = "public, no-cache"
+
+# nombre.<hash hexadecimal de 8 o más>.ext
+_HUELLA = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+
+
+def tiene_huella(ruta: str) -> bool:
+    return _HUELLA.search(os.path.basename(ruta)) is not None
+
+
+def nombre_con_huella(ruta: Path, contenido: bytes) -> str:
+    return f"{ruta.stem}.{hashlib.sha256(contenido).hexdigest()[:12]}{ruta.suffix}"
+
+
+class ArchivosEstaticos(StaticFiles):
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        ruta = str(full_path)
+        tipo = mimetypes.guess_type(ruta)[0] or "application/octet-stream"
+        cabeceras = {"cache-control": CACHE_INMUTABLE if tiene_huella(ruta) else CACHE_REVALIDAR}
+        if es_comprimible(tipo):
+            cabeceras["vary"] = "Accept-Encoding"
+
+        # Hermano precomprimido (brotli antes que gzip) que el cliente acepte; se sirve
+        # aunque el servidor no tenga el paquete brotli
+        respuesta = None
+        accept_encoding = request_headers.get("accept-encoding", "")
+        for codificacion in (BROTLI, GZIP):
+            if elegir_codificacion(accept_encoding, (codificacion,)) is None:
+                continue
+            hermano = ruta + EXTENSIONES[codificacion]
+            try:
+                stat_hermano = os.stat(hermano)
+            except OSError:
+                continue
+            if stat.S_ISREG(stat_hermano.st_mode):
+                respuesta = FileResponse(
+                    hermano,
+                    status_code=status_code,
+                    stat_result=stat_hermano,
+                    media_type=tipo,
+                    headers={**cabeceras, "content-encoding": codificacion},
+                )
+                break
+
+        if respuesta is None:
+            respuesta = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=cabeceras)
+        if self.is_not_modified(respuesta.headers, request_headers):
+            return NotModifiedResponse(respuesta.headers)
+        return respuesta
+
+
+@lru_cache(maxsize=1)
+def cargar_manifiesto() -> dict:
+    """
+    {"archivos": ruta original -> ruta con huella, "imagenes": ruta -> tamaño y
+    variantes, "css_critico": ruta del CSS crítico}, con rutas relativas a /static;
+    vacío si no se hizo el build
+    """
+    try:
+        with open(DIRECTORIO_ESTATICOS / DIRECTORIO_DIST / MANIFIESTO, encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return {}
+
+
+def ruta_estatico(ruta: str) -> str:
+    """Ruta bajo /static a usar para `ruta`: la versión con huella si existe"""
+    return cargar_manifiesto().get("archivos", {}).get(ruta, ruta)
+
+
+@pass_context
+def estatico(contexto, ruta: str) -> str:
+    """Global de Jinja: URL de un archivo estático, con huella si pasó por el build"""
+    return str(contexto["request"].url_for("static", path=ruta_estatico(ruta)))
+
+
+def render_optimizado() -> bool:
+    """Global de Jinja: si la página usa CSS crítico en línea, hoja única y carga diferida"""
+    manifiesto = cargar_manifiesto()
+    return settings.RENDER_OPTIMIZADO and BUNDLE in manifiesto.get("archivos", {}) and "css_critico" in manifiesto
+
+
+@lru_cache(maxsize=1)
+def _leer_css_critico(ruta: str) -> str:
+    return (DIRECTORIO_ESTATICOS / ruta).read_text(encoding="utf-8")
+
+
+def css_critico() -> Markup:
+    """Global de Jinja: CSS crítico del build, para un <style> en el <head>"""
+    ruta = cargar_manifiesto().get("css_critico")
+    return Markup(_leer_css_critico(ruta)) if ruta else Markup("")
+
+
+def _atributos_html(atributos: Dict[str, object]) -> str:
+    partes = []
+    for nombre, valor in atributos.items():
+        if valor is None or valor is False:
+            continue
+        nombre = nombre.rstrip("_").replace("_", "-")
+        partes.append(f" {nombre}" if valor is True else f' {nombre}="{escape(valor)}"')
+    return "".join(partes)
+
+
+@pass_context
+def imagen(contexto, ruta: str, alt: str, sizes: str = "100vw", **atributos) -> Markup:
+    """
+    Global de Jinja: <picture> con las variantes AVIF/WebP de `ruta` en `srcset` y el
+    <img> con su tamaño original; `atributos` van al <img> (`data_slide=1` ->
+    `data-slide="1"`). Sin build devuelve un <img> con la imagen original.
+    """
+    request = contexto["request"]
+
+    def url(relativa: str) -> str:
+        return str(request.url_for("static", path=relativa))
+
+    entrada = cargar_manifiesto().get("imagenes", {}).get(ruta)
+    if entrada is None:
+        return Markup(f"<img{_atributos_html({'src': url(ruta), 'alt': alt, **atributos})}>")
+
+    fuentes = []
+    for formato, variantes in entrada["variantes"].items():
+        if variantes:
+            srcset = ", ".join(f"{url(relativa)} {ancho}w" for ancho, relativa in variantes)
+            fuentes.append(f"<source{_atributos_html({'type': f'image/{formato}', 'srcset': srcset, 'sizes': sizes})}>")
+
+    # src de respaldo: la variante WebP más grande, o el original con huella
+    webp = entrada["variantes"].get("webp")
+    src = url(webp[-1][1]) if webp else url(ruta_estatico(ruta))
+    img = _atributos_html({
+        "src": src, "alt": alt, "width": entrada["ancho"], "height": entrada["alto"], **atributos
+    })
+    return Markup(f"<picture>{''.join(fuentes)}<img{img}></picture>")
+
+
+@pass_context
+def precarga_imagen(contexto, ruta: str, sizes: str = "100vw") -> Markup:
+    """
+    Global de Jinja: <link rel="preload"> con prioridad alta para la imagen principal
+    de la página, con el mismo `srcset`/`sizes` que su <picture> (el primer formato,
+    AVIF) para que el navegador descargue la misma variante que va a usar
+    """
+    request = contexto["request"]
+
+    def url(relativa: str) -> str:
+        return str(request.url_for("static", path=relativa))
+
+    atributos = {"rel": "preload", "as": "image", "fetchpriority": "high"}
+    entrada = cargar_manifiesto().get("imagenes", {}).get(ruta)
+    variantes = next(((formato, v) for formato, v in entrada["variantes"].items() if v), None) if entrada else None
+    if variantes is None:
+        atributos["href"] = url(ruta_estatico(ruta))
+    else:
+        formato, lista = variantes
+        atributos.update({
+            "type": f"image/{formato}",
+            "imagesrcset": ", ".join(f"{url(relativa)} {ancho}w" for ancho, relativa in lista),
+            "imagesizes": sizes,
+        })
+    return Markup(f"<link{_atributos_html(atributos)}>")
+
+
+def _escribir_precomprimidos(destino: Path, contenido: bytes) -> None:
+    for codificacion in codificaciones_disponibles():
+        nivel = 11 if codificacion == BROTLI else 9
+        comprimido = comprimir(contenido, codificacion, nivel)
+        # Solo vale la pena si ahorra algo
+        if len(comprimido) < len(contenido):
+            (destino.parent / (destino.name + EXTENSIONES[codificacion])).write_bytes(comprimido)
+
+
+def construir(origen: Path = DIRECTORIO_ESTATICOS, salida: Optional[Path] = None, imagenes: bool = True) -> dict:
+    """
+    Genera dist/ (copias con huella y precomprimidas, hoja única y CSS crítico, y
+    variantes de las imágenes si `imagenes`) y su manifiesto; devuelve el manifiesto
+    """
+    salida = salida or origen / DIRECTORIO_DIST
+    if salida.exists():
+        shutil.rmtree(salida)
+    salida.mkdir(parents=True)
+
+    def escribir(relativa: str, contenido: bytes, precomprimir: bool = True) -> str:
+        destino = salida / Path(relativa).parent / nombre_con_huella(Path(relativa), contenido)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_bytes(contenido)
+        if precomprimir:
+            _escribir_precomprimidos(destino, contenido)
+        return destino.relative_to(origen).as_posix()
+
+    archivos: Dict[str, str] = {}
+    for archivo in sorted(origen.rglob("*")):
+        if not archivo.is_file() or salida in archivo.parents or archivo.suffix not in EXTENSIONES_BUILD:
+            continue
+        relativa = archivo.relative_to(origen).as_posix()
+        archivos[relativa] = escribir(relativa, archivo.read_bytes())
+
+    # Hoja única y CSS crítico (este va en línea, no se sirve comprimido)
+    bundle, critico = construir_css(origen)
+    archivos[BUNDLE] = escribir(BUNDLE, bundle.encode("utf-8"))
+    manifiesto = {"archivos": archivos, "imagenes": {}, "css_critico": escribir(CRITICO, critico.encode("utf-8"), False)}
+    if imagenes:
+        archivos_imagenes, manifiesto["imagenes"] = construir_imagenes(origen, salida)
+        archivos.update(archivos_imagenes)
+
+    (salida / MANIFIESTO).write_text(json.dumps(manifiesto, indent=2, sort_keys=True), encoding="utf-8")
+    cargar_manifiesto.cache_clear()
+    _leer_css_critico.cache_clear()
+    return manifiesto
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build de archivos estáticos: huellas y precompresión")
+    parser.add_argument("--origen", type=Path, default=DIRECTORIO_ESTATICOS, help="Directorio de estáticos")
+    parser.add_argument("--sin-imagenes", action="store_true", help="No generar variantes de imágenes (no requiere Pillow)")
+    args = parser.parse_args()
+
+    manifiesto = construir(args.origen, imagenes=not args.sin_imagenes)
+    for original, con_huella in manifiesto["archivos"].items():
+        print(f"{original} -> {con_huella}")
+    for original, entrada in manifiesto["imagenes"].items():
+        anchos = sorted({ancho for variantes in entrada["variantes"].values() for ancho, _ in variantes})
+        print(f"{original}: {entrada['ancho']}x{entrada['alto']}, anchos {anchos}, formatos {list(entrada['variantes'])}")
+    print(f"CSS crítico -> {manifiesto['css_critico']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Filas livianas para listados.
+
+Las funciones de crud que devuelven listados por columnas construyen una dataclass con
+`__slots__` por fila, directamente desde la `Row` de la consulta:
+
+    filas = [NotaFila(*fila) for fila in db.execute(consulta)]
+
+y el endpoint las devuelve con `responder_filas`, que las serializa a JSON con el
+`TypeAdapter` de la lista sin pasar por el `response_model`. FastAPI no arma un
+diccionario por fila ni vuelve a validar cada una: el `response_model` del decorador
+queda solo para la documentación.
+
+El orden de las columnas del `select` es el orden de los campos de la dataclass.
+"""
+from functools import lru_cache
+from typing import Any, List, Sequence
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def adaptador_filas(tipo: type) -> TypeAdapter:
+    """TypeAdapter de `List[tipo]`, creado una vez por tipo de fila"""
+    return TypeAdapter(List[tipo])
+
+
+def responder_filas(filas: Sequence[Any], tipo: type) -> Response:
+    """Respuesta JSON de `filas` (instancias de `tipo`) sin validarlas de nuevo"""
+    return Response(content=adaptador_filas(tipo).dump_json(list(filas)), media_type="application/json")
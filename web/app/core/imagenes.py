@@ -0,0 +1,107 @@
+"""
+Variantes responsivas de las imágenes estáticas (parte del build de app/core/estaticos.py).
+
+Cada imagen de app/static/img se reescala a los anchos de ANCHOS que no superen el
+original y se guarda en AVIF y WebP en dist/img con el hash del contenido en el
+nombre (`img/escuela-ninos.jpg` -> `dist/img/escuela-ninos-480.1a2b3c4d5e6f.avif`).
+Las imágenes con el mismo contenido se procesan una sola vez y comparten variantes.
+
+El resultado va en la sección "imagenes" del manifiesto, con el tamaño original para
+los atributos width/height del <img>; la plantilla lo usa con `imagen(...)`. Requiere
+Pillow (con soporte AVIF, incluido desde Pillow 11.3); sin AVIF solo se generan WebP.
+"""
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+EXTENSIONES_IMAGEN = {".png", ".jpg", ".jpeg", ".webp"}
+# Anchos en píxeles; siempre se agrega el ancho original si es menor que el último
+ANCHOS = (160, 480, 960, 1440, 1920)
+# Formato -> calidad, en orden de preferencia para <picture>
+FORMATOS = {"avif": 55, "webp": 80}
+
+
+def _huella(contenido: bytes) -> str:
+    return hashlib.sha256(contenido).hexdigest()[:12]
+
+
+def _base(ruta: Path) -> str:
+    # Sin espacios ni caracteres raros en las URLs generadas
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", ruta.stem).strip("-")
+
+
+def _formatos_disponibles(Image) -> List[str]:
+    disponibles = set(Image.registered_extensions().values())
+    return [formato for formato in FORMATOS if formato.upper() in disponibles]
+
+
+def anchos_para(ancho_original: int) -> List[int]:
+    anchos = [ancho for ancho in ANCHOS if ancho < ancho_original]
+    if ancho_original <= ANCHOS[-1]:
+        anchos.append(ancho_original)
+    return anchos or [ANCHOS[-1]]
+
+
+def construir_imagenes(origen: Path, salida: Path) -> Tuple[Dict[str, str], Dict[str, dict]]:
+    """
+    Genera las variantes de las imágenes de `origen` en `salida`. Devuelve
+    (archivos, imagenes): la copia con huella de cada original y, por imagen, su
+    tamaño y las variantes por formato como [ancho, ruta relativa a `origen`]
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as e:
+        raise RuntimeError("Las variantes de imágenes requieren el paquete 'Pillow' (o usar --sin-imagenes)") from e
+
+    formatos = _formatos_disponibles(Image)
+    archivos: Dict[str, str] = {}
+    imagenes: Dict[str, dict] = {}
+    # hash del contenido -> (ruta con huella del original, entrada del manifiesto)
+    procesadas: Dict[str, Tuple[str, dict]] = {}
+
+    for archivo in sorted(origen.rglob("*")):
+        if not archivo.is_file() or salida in archivo.parents or archivo.suffix.lower() not in EXTENSIONES_IMAGEN:
+            continue
+        relativa = archivo.relative_to(origen).as_posix()
+        contenido = archivo.read_bytes()
+        huella = _huella(contenido)
+
+        if huella in procesadas:
+            print(f"{relativa}: mismo contenido que otra imagen, se reutilizan sus variantes")
+            archivos[relativa], imagenes[relativa] = procesadas[huella]
+            continue
+
+        directorio = salida / archivo.relative_to(origen).parent
+        directorio.mkdir(parents=True, exist_ok=True)
+        base = _base(archivo)
+        copia = directorio / f"{base}.{huella}{archivo.suffix.lower()}"
+        copia.write_bytes(contenido)
+
+        with Image.open(archivo) as abierta:
+            imagen = ImageOps.exif_transpose(abierta)
+            if imagen.mode not in ("RGB", "RGBA"):
+                imagen = imagen.convert("RGBA" if "A" in imagen.getbands() or "transparency" in imagen.info else "RGB")
+            ancho, alto = imagen.size
+
+            variantes: Dict[str, List[list]] = {formato: [] for formato in formatos}
+            for ancho_variante in anchos_para(ancho):
+                if ancho_variante == ancho:
+                    reducida = imagen
+                else:
+                    reducida = imagen.resize(
+                        (ancho_variante, max(1, round(alto * ancho_variante / ancho))), Image.Resampling.LANCZOS
+                    )
+                for formato in formatos:
+                    temporal = directorio / f"{base}-{ancho_variante}.tmp.{formato}"
+                    reducida.save(temporal, format=formato.upper(), quality=FORMATOS[formato])
+                    destino = directorio / f"{base}-{ancho_variante}.{_huella(temporal.read_bytes())}.{formato}"
+                    temporal.replace(destino)
+                    variantes[formato].append([ancho_variante, destino.relative_to(origen).as_posix()])
+
+        entrada = {"ancho": ancho, "alto": alto, "variantes": variantes}
+        archivos[relativa] = copia.relative_to(origen).as_posix()
+        imagenes[relativa] = entrada
+        procesadas[huella] = (archivos[relativa], entrada)
+
+    return archivos, imagenes
@@ -0,0 +1,183 @@
+"""
+Bus de invalidación de cachés entre workers.
+
+Cada caché en proceso se registra con un nombre y dos funciones: invalidar un
+conjunto de etiquetas y vaciarse por completo. Las invalidaciones se aplican en el
+worker que las origina y se publican por el transporte pub/sub (LISTEN/NOTIFY con
+PUBSUB_BACKEND=postgres, entrega local en pruebas) para que el resto haga lo mismo.
+
+Orden y pérdidas: cada worker numera sus mensajes y los publica en orden. Si un
+receptor detecta un salto en la secuencia de un origen, o si la conexión LISTEN se
+restablece, vacía todas las cachés registradas, porque pudo perder invalidaciones.
+
+Uso desde una caché:
+
+    bus = obtener_bus()
+    bus.registrar("materias", invalidar=cache.invalidar, limpiar=cache.limpiar)
+    bus.invalidar_al_confirmar(db, "materias", ["materia"])   # dentro de una transacción
+    bus.invalidar("materias", ["materia"])                    # fuera de una transacción
+"""
+import json
+import logging
+import threading
+import uuid
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.pubsub import TAMANO_MAXIMO_MENSAJE, obtener_transporte
+
+logger = logging.getLogger(__name__)
+
+CANAL_INVALIDACIONES = "invalidaciones"
+
+
+class CacheRegistrada:
+    __slots__ = ("invalidar", "limpiar", "remota")
+
+    def __init__(self, invalidar: Callable[[Set[str]], None], limpiar: Callable[[], None], remota: bool):
+        self.invalidar = invalidar
+        self.limpiar = limpiar
+        # False para cachés ya compartidas (Redis): no hace falta avisar a otros workers
+        self.remota = remota
+
+
+class BusInvalidacion:
+    def __init__(self, transporte):
+        self._transporte = transporte
+        self._origen = uuid.uuid4().hex
+        self._caches: Dict[str, CacheRegistrada] = {}
+        self._lock = threading.Lock()
+        # Serializa numeración y publicación para que los mensajes salgan en orden
+        self._lock_publicacion = threading.Lock()
+        self._secuencia = 0
+        self._ultimas: Dict[str, int] = {}
+        self.vaciados = 0
+        transporte.suscribir(CANAL_INVALIDACIONES, self._recibir)
+        if hasattr(transporte, "al_conectar"):
+            transporte.al_conectar(self._al_conectar)
+
+    def registrar(
+        self,
+        nombre: str,
+        invalidar: Callable[[Set[str]], None],
+        limpiar: Callable[[], None],
+        remota: bool = True
+    ) -> None:
+        with self._lock:
+            self._caches[nombre] = CacheRegistrada(invalidar, limpiar, remota)
+
+    def invalidar(self, nombre: str, etiquetas: Iterable[str]) -> None:
+        """Invalida ya en este worker y lo publica al resto"""
+        self._aplicar_y_publicar({nombre: set(etiquetas)})
+
+    def invalidar_al_confirmar(self, db: Session, nombre: str, etiquetas: Iterable[str]) -> None:
+        """Invalida cuando la transacción de `db` se confirme"""
+        pendientes = db.info.setdefault("invalidaciones_pendientes", {})
+        pendientes.setdefault(nombre, set()).update(etiquetas)
+
+    def vaciar_todo(self) -> None:
+        with self._lock:
+            caches = list(self._caches.items())
+            self.vaciados += 1
+        for nombre, cache in caches:
+            try:
+                cache.limpiar()
+            except Exception as e:
+                logger.error(f"Error vaciando la caché {nombre}: {e}")
+
+    def _aplicar(self, invalidaciones: Dict[str, Optional[Set[str]]], solo_remotas: bool = False) -> None:
+        for nombre, etiquetas in invalidaciones.items():
+            with self._lock:
+                cache = self._caches.get(nombre)
+            if cache is None or (solo_remotas and not cache.remota):
+                continue
+            try:
+                if etiquetas is None:
+                    cache.limpiar()
+                elif etiquetas:
+                    cache.invalidar(set(etiquetas))
+            except Exception as e:
+                logger.error(f"Error invalidando la caché {nombre}: {e}")
+
+    def _aplicar_y_publicar(self, invalidaciones: Dict[str, Set[str]]) -> None:
+        invalidaciones = {nombre: etiquetas for nombre, etiquetas in invalidaciones.items() if etiquetas}
+        if not invalidaciones:
+            return
+        self._aplicar(invalidaciones)
+
+        with self._lock:
+            remotas = {
+                nombre: sorted(etiquetas)
+                for nombre, etiquetas in invalidaciones.items()
+                if nombre not in self._caches or self._caches[nombre].remota
+            }
+        if not remotas:
+            return
+        with self._lock_publicacion:
+            self._secuencia += 1
+            mensaje = {"origen": self._origen, "secuencia": self._secuencia, "caches": remotas}
+            if len(json.dumps(mensaje).encode()) > TAMANO_MAXIMO_MENSAJE:
+                # Demasiadas etiquetas para un NOTIFY: los demás vacían esas cachés completas
+                mensaje["caches"] = {nombre: None for nombre in remotas}
+            try:
+                self._transporte.publicar(CANAL_INVALIDACIONES, mensaje)
+            except Exception as e:
+                # La secuencia ya avanzó: los receptores verán el salto y vaciarán sus cachés
+                logger.error(f"No se pudo publicar la invalidación: {e}")
+
+    def _recibir(self, mensaje: dict) -> None:
+        origen = mensaje.get("origen")
+        secuencia = mensaje.get("secuencia", 0)
+        if origen == self._origen:
+            return
+        with self._lock:
+            ultima = self._ultimas.get(origen)
+            if ultima is None or secuencia > ultima:
+                self._ultimas[origen] = secuencia
+        if ultima is not None and secuencia > ultima + 1:
+            logger.warning(f"Se perdieron invalidaciones del worker {origen}; se vacían las cachés")
+            self.vaciar_todo()
+            return
+        caches = mensaje.get("caches", {})
+        self._aplicar({
+            nombre: (set(etiquetas) if etiquetas is not None else None)
+            for nombre, etiquetas in caches.items()
+        }, solo_remotas=True)
+
+    def _al_conectar(self) -> None:
+        """La conexión LISTEN se (re)estableció: lo publicado mientras tanto se perdió"""
+        with self._lock:
+            self._ultimas.clear()
+        self.vaciar_todo()
+
+
+_bus: Optional[BusInvalidacion] = None
+_bus_lock = threading.Lock()
+
+
+def obtener_bus() -> BusInvalidacion:
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = BusInvalidacion(obtener_transporte())
+        return _bus
+
+
+@event.listens_for(Session, "after_commit")
+def _publicar_pendientes(session: Session) -> None:
+    # También se dispara al liberar un savepoint; se publica solo con el commit real
+    if session.in_nested_transaction():
+        return
+    pendientes = session.info.pop("invalidaciones_pendientes", None)
+    if pendientes:
+        obtener_bus()._aplicar_y_publicar(pendientes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_pendientes(session: Session) -> None:
+    # Deshacer un savepoint deja sus invalidaciones: invalidar de más no rompe nada
+    if session.in_nested_transaction():
+        return
+    session.info.pop("invalidaciones_pendientes", None)
@@ -0,0 +1,135 @@
+"""
+Paginación por cursor (keyset) para los listados.
+
+El orden de cada listado es una o varias columnas indexadas terminando en el ID
+como desempate, por ejemplo `[desc(Aviso.fecha_envio), desc(Aviso.id_aviso)]`.
+El cursor es opaco para el cliente: codifica los valores de esas columnas en la
+última fila devuelta, y la página siguiente se pide con `WHERE (fecha, id) < (...)`
+en lugar de `OFFSET`, así que el costo no crece con la profundidad de la página.
+
+`skip` se mantiene por compatibilidad: si no se envía cursor se usa OFFSET, y el
+resultado incluye igualmente el cursor de la página siguiente.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import Response
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import UnaryExpression
+from sqlalchemy.sql.operators import desc_op
+
+# Cabecera con el cursor de la página siguiente en los listados que devuelven un arreglo
+CABECERA_CURSOR = "X-Next-Cursor"
+
+
+class CursorInvalido(ValueError):
+    """Cursor mal formado o de otro listado; main.py lo traduce a 400"""
+
+
+def _columna(orden) -> Tuple[Any, bool]:
+    """Devuelve (columna, descendente) a partir de `columna`, `asc(columna)` o `desc(columna)`"""
+    if isinstance(orden, UnaryExpression):
+        return orden.element, orden.modifier is desc_op
+    return orden, False
+
+
+def columnas_orden(orden: Sequence) -> List[Any]:
+    """Columnas de un orden de paginación, sin la dirección"""
+    return [_columna(criterio)[0] for criterio in orden]
+
+
+def _valor_a_json(valor: Any) -> Any:
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, (str, int, float, bool)) or valor is None:
+        return valor
+    return str(valor)
+
+
+def _valor_desde_json(valor: Any, columna) -> Any:
+    if valor is None:
+        return None
+    tipo = columna.type.python_type
+    if tipo is datetime:
+        return datetime.fromisoformat(valor)
+    if tipo is date:
+        return date.fromisoformat(valor)
+    return tipo(valor)
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    datos = json.dumps([_valor_a_json(valor) for valor in valores], separators=(",", ":"))
+    return base64.urlsafe_b64encode(datos.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, orden: Sequence) -> List[Any]:
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        columnas = columnas_orden(orden)
+        if not isinstance(valores, list) or len(valores) != len(columnas):
+            raise CursorInvalido(cursor)
+        return [_valor_desde_json(valor, columna) for valor, columna in zip(valores, columnas)]
+    except (ValueError, TypeError) as e:
+        raise CursorInvalido(cursor) from e
+
+
+def _filtro_posterior(orden: Sequence, valores: Sequence[Any]):
+    """Condición "fila posterior al cursor" según el orden indicado"""
+    columnas = [_columna(criterio) for criterio in orden]
+    direcciones = {descendente for _, descendente in columnas}
+    if len(direcciones) == 1:
+        # Mismo sentido en todas las columnas: comparación de tuplas, que usa el índice compuesto
+        tupla = tuple_(*[columna for columna, _ in columnas])
+        return tupla < tuple_(*valores) if direcciones.pop() else tupla > tuple_(*valores)
+
+    condiciones = []
+    for indice, (columna, descendente) in enumerate(columnas):
+        iguales = [columnas[i][0] == valores[i] for i in range(indice)]
+        siguiente = columna < valores[indice] if descendente else columna > valores[indice]
+        condiciones.append(and_(*iguales, siguiente))
+    return or_(*condiciones)
+
+
+def _valores_fila(fila: Any, orden: Sequence) -> List[Any]:
+    entidad = fila[0] if isinstance(fila, Row) else fila
+    return [getattr(entidad, _columna(criterio)[0].key) for criterio in orden]
+
+
+def paginar(
+    query: Query,
+    orden: Sequence,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    skip: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Ordena la consulta por `orden` y devuelve (filas, next_cursor).
+    Con `cursor` se continúa desde esa posición; sin él se aplica `skip` como OFFSET.
+    Sin `limit` se devuelven todas las filas y next_cursor es None.
+    """
+    query = query.order_by(*orden)
+    if cursor:
+        query = query.filter(_filtro_posterior(orden, decodificar_cursor(cursor, orden)))
+    elif skip:
+        query = query.offset(skip)
+
+    if limit is None:
+        return query.all(), None
+
+    # Una fila extra indica si existe una página siguiente
+    filas = query.limit(limit + 1).all()
+    if len(filas) <= limit:
+        return filas, None
+    filas = filas[:limit]
+    return filas, codificar_cursor(_valores_fila(filas[-1], orden))
+
+
+def agregar_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Expone el cursor de la página siguiente en la cabecera de la respuesta"""
+    if next_cursor:
+        response.headers[CABECERA_CURSOR] = next_cursor
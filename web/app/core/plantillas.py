@@ -0,0 +1,68 @@
+"""
+Entorno Jinja de las páginas públicas.
+
+Las plantillas se compilan una sola vez: `precompilar_plantillas()` (al iniciar la app)
+carga todas las de app/templates en la caché del entorno, y la caché de bytecode en
+disco (PLANTILLAS_BYTECODE_DIR) evita volver a parsearlas en cada worker y en cada
+reinicio. Con PLANTILLAS_AUTO_RELOAD en False (producción) Jinja no revisa la fecha de
+los archivos en cada render; en desarrollo se activa para ver los cambios sin reiniciar.
+"""
+import logging
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+
+from app.core.configs import settings
+from app.core.estaticos import css_critico, estatico, imagen, precarga_imagen, render_optimizado
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_PLANTILLAS = Path(__file__).resolve().parent.parent / "templates"
+
+
+def _directorio_bytecode() -> Path:
+    directorio = Path(settings.PLANTILLAS_BYTECODE_DIR or Path(tempfile.gettempdir()) / "escuela-jinja")
+    directorio.mkdir(parents=True, exist_ok=True)
+    return directorio
+
+
+templates = Jinja2Templates(directory=str(DIRECTORIO_PLANTILLAS))
+templates.env.auto_reload = settings.PLANTILLAS_AUTO_RELOAD
+templates.env.bytecode_cache = FileSystemBytecodeCache(str(_directorio_bytecode()))
+templates.env.globals["now"] = datetime.utcnow
+templates.env.globals["estatico"] = estatico
+templates.env.globals["imagen"] = imagen
+templates.env.globals["precarga_imagen"] = precarga_imagen
+templates.env.globals["render_optimizado"] = render_optimizado
+templates.env.globals["css_critico"] = css_critico
+
+MESES = (
+    "enero", "febrero", "marzo", "abril", "mayo", "junio",
+    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre",
+)
+
+
+def fecha_larga(valor: Optional[datetime], hora: bool = False) -> str:
+    """Filtro de Jinja: "15 de abril de 2025" (con `hora`, "15 de abril de 2025, 14:00")"""
+    if valor is None:
+        return ""
+    texto = f"{valor.day} de {MESES[valor.month - 1]} de {valor.year}"
+    return f"{texto}, {valor:%H:%M}" if hora else texto
+
+
+templates.env.filters["fecha_larga"] = fecha_larga
+
+
+def precompilar_plantillas() -> int:
+    """Compila todas las plantillas HTML (y las deja en la caché de bytecode); devuelve cuántas"""
+    nombres = templates.env.list_templates(extensions=["html"])
+    for nombre in nombres:
+        try:
+            templates.env.get_template(nombre)
+        except Exception as e:
+            logger.error(f"Error compilando la plantilla {nombre}: {e}")
+    return len(nombres)
@@ -0,0 +1,239 @@
+"""
+Transporte de mensajes entre workers.
+
+- "local": entrega en el mismo proceso (un solo worker, desarrollo y pruebas).
+- "postgres": LISTEN/NOTIFY sobre la base de datos principal, para varios workers.
+
+Los mensajes se publican al confirmar la transacción con `publicar_al_confirmar`,
+de modo que un rollback nunca deja eventos huérfanos. Con Postgres el NOTIFY se envía
+dentro de esa misma transacción, justo antes del commit: Postgres lo entrega al
+confirmarse, en orden de commit, y la petición no paga otro commit para publicarlo.
+"""
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import Connection, event, text
+from sqlalchemy.orm import Session
+
+from app.core.configs import settings
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[dict], None]
+
+# Límite de NOTIFY en Postgres (8000 bytes) con margen
+TAMANO_MAXIMO_MENSAJE = 7500
+
+
+class TransporteLocal:
+    """Entrega los mensajes directamente a los suscriptores del mismo proceso"""
+
+    # Si `notificar` publica dentro de una transacción (los mensajes salen con su commit)
+    EN_TRANSACCION = False
+
+    def __init__(self):
+        self._callbacks: Dict[str, List[Callback]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def suscribir(self, canal: str, callback: Callback) -> None:
+        with self._lock:
+            self._callbacks[canal].append(callback)
+
+    def publicar(self, canal: str, mensaje: dict) -> None:
+        # Ida y vuelta por JSON para que los suscriptores reciban lo mismo que con Postgres
+        self._despachar(canal, json.loads(json.dumps(mensaje, default=str)))
+
+    def _despachar(self, canal: str, mensaje: dict) -> None:
+        with self._lock:
+            callbacks = list(self._callbacks.get(canal, []))
+        for callback in callbacks:
+            try:
+                callback(mensaje)
+            except Exception as e:
+                logger.error(f"Error en suscriptor del canal {canal}: {e}")
+
+
+class TransportePostgres(TransporteLocal):
+    """
+    Publica con pg_notify y escucha con LISTEN en un hilo dedicado.
+    Si la conexión de escucha se pierde, se reconecta con espera exponencial.
+    """
+
+    EN_TRANSACCION = True
+
+    def __init__(self, engine):
+        super().__init__()
+        self._engine = engine
+        self._hilo: Optional[threading.Thread] = None
+        self._canales_escuchados: set = set()
+        self._al_conectar: List[Callable[[], None]] = []
+
+    def al_conectar(self, callback: Callable[[], None]) -> None:
+        """Registra una función que se llama cada vez que la conexión LISTEN se (re)establece"""
+        with self._lock:
+            self._al_conectar.append(callback)
+
+    def suscribir(self, canal: str, callback: Callback) -> None:
+        super().suscribir(canal, callback)
+        with self._lock:
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._escuchar, name="pubsub-postgres", daemon=True)
+                self._hilo.start()
+
+    def publicar(self, canal: str, mensaje: dict) -> None:
+        with self._engine.begin() as conexion:
+            self.notificar(conexion, canal, mensaje)
+
+    @staticmethod
+    def notificar(conexion: Connection, canal: str, mensaje: dict) -> None:
+        """NOTIFY en la transacción de `conexion`: se entrega cuando esta se confirma"""
+        payload = json.dumps(mensaje, default=str)
+        if len(payload.encode()) > TAMANO_MAXIMO_MENSAJE:
+            logger.error(f"Mensaje demasiado grande para NOTIFY en el canal {canal}; se descarta")
+            return
+        conexion.execute(text("SELECT pg_notify(:canal, :payload)"), {"canal": canal, "payload": payload})
+
+    def _conectar(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        url = self._engine.url.set(drivername="postgresql")
+        conexion = psycopg2.connect(url.render_as_string(hide_password=False))
+        conexion.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        return conexion
+
+    def _escuchar(self) -> None:
+        espera = 1
+        while True:
+            conexion = None
+            try:
+                conexion = self._conectar()
+                self._canales_escuchados = set()
+                espera = 1
+                self._sincronizar_listen(conexion)
+                self._avisar_conexion()
+                while True:
+                    self._sincronizar_listen(conexion)
+                    if select.select([conexion], [], [], 5) == ([], [], []):
+                        continue
+                    conexion.poll()
+                    while conexion.notifies:
+                        notificacion = conexion.notifies.pop(0)
+                        try:
+                            mensaje = json.loads(notificacion.payload)
+                        except ValueError:
+                            logger.error(f"Payload inválido en el canal {notificacion.channel}")
+                            continue
+                        self._despachar(notificacion.channel, mensaje)
+            except Exception as e:
+                logger.error(f"Conexión LISTEN perdida, reintentando en {espera}s: {e}")
+                time.sleep(espera)
+                espera = min(espera * 2, 30)
+            finally:
+                if conexion is not None:
+                    try:
+                        conexion.close()
+                    except Exception:
+                        pass
+
+    def _avisar_conexion(self) -> None:
+        with self._lock:
+            callbacks = list(self._al_conectar)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error en callback de conexión LISTEN: {e}")
+
+    def _sincronizar_listen(self, conexion) -> None:
+        with self._lock:
+            pendientes = set(self._callbacks) - self._canales_escuchados
+        if not pendientes:
+            return
+        with conexion.cursor() as cursor:
+            for canal in pendientes:
+                cursor.execute(f'LISTEN "{canal}"')
+        self._canales_escuchados |= pendientes
+
+
+_transporte = None
+_transporte_lock = threading.Lock()
+
+
+def obtener_transporte():
+    global _transporte
+    with _transporte_lock:
+        if _transporte is None:
+            if settings.PUBSUB_BACKEND == "postgres":
+                from app.db.session import engine
+                _transporte = TransportePostgres(engine)
+            else:
+                _transporte = TransporteLocal()
+        return _transporte
+
+
+def publicar_al_confirmar(db: Session, canal: str, mensaje: dict) -> None:
+    """Encola un mensaje que se publicará solo si la transacción de `db` se confirma"""
+    db.info.setdefault("pubsub_pendientes", []).append((canal, mensaje))
+
+
+@event.listens_for(Session, "before_commit")
+def _notificar_en_transaccion(session: Session) -> None:
+    # Con Postgres los NOTIFY van en la transacción que se confirma: salen con su commit
+    # (en orden de commit) y se descartan si falla
+    if session.in_nested_transaction() or not session.info.get("pubsub_pendientes"):
+        return
+    transporte = obtener_transporte()
+    if not transporte.EN_TRANSACCION:
+        return
+    conexion = session.connection()
+    for canal, mensaje in session.info.pop("pubsub_pendientes"):
+        transporte.notificar(conexion, canal, mensaje)
+    session.info.pop("pubsub_savepoints", None)
+
+
+@event.listens_for(Session, "after_commit")
+def _publicar_pendientes(session: Session) -> None:
+    # También se dispara al liberar un savepoint; se publica solo con el commit real
+    if session.in_nested_transaction():
+        return
+    session.info.pop("pubsub_savepoints", None)
+    pendientes = session.info.pop("pubsub_pendientes", None)
+    if not pendientes:
+        return
+    transporte = obtener_transporte()
+    for canal, mensaje in pendientes:
+        try:
+            transporte.publicar(canal, mensaje)
+        except Exception as e:
+            logger.error(f"No se pudo publicar en el canal {canal}: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_pendientes(session: Session) -> None:
+    # Un savepoint deshecho solo descarta sus propios mensajes (_descartar_savepoint)
+    if session.in_nested_transaction():
+        return
+    session.info.pop("pubsub_pendientes", None)
+    session.info.pop("pubsub_savepoints", None)
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _marcar_savepoint(session: Session, transaccion) -> None:
+    # Cuántos mensajes había al abrir el savepoint, para descartar los posteriores si se deshace
+    if transaccion.nested:
+        session.info.setdefault("pubsub_savepoints", {})[id(transaccion)] = len(session.info.get("pubsub_pendientes", ()))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _descartar_savepoint(session: Session, transaccion) -> None:
+    if not transaccion.nested:
+        return
+    marca = session.info.get("pubsub_savepoints", {}).pop(id(transaccion), None)
+    if marca is not None and "pubsub_pendientes" in session.info:
+        del session.info["pubsub_pendientes"][marca:]
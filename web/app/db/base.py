@@ -3,3 +3,12 @@ from app.modules.usuarios.models import Usuario
 from app.modules.materias.models import Materia
 from app.modules.avisos.models import Aviso
 from app.modules.notificacion.models import Notificacion
+from app.modules.anio_lectivo.models import AnioLectivo
+from app.modules.secciones.models import Seccion
+from app.modules.secciones.models_profesor_seccion import ProfesorSeccion
+from app.modules.materias.models_profesor_materia import ProfesorMateria
+from app.modules.estudiantes.models import Estudiante, Matricula, Asistencia, Nota
+from app.modules.documentos.models import Documento
+from app.modules.noticias.models import Noticia
+from app.modules.eventos.models import Evento
+from app.modules.junta_patronato.models import MiembroJuntaPatronato, InformeJuntaPatronato, CuentaDonacion
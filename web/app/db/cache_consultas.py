@@ -0,0 +1,351 @@
+"""
+Caché de resultados de consultas ORM con invalidación por tabla.
+
+Una consulta entra en la caché solo si lo pide explícitamente:
+
+    db.query(Materia).filter(...).execution_options(cache_consulta="get_materia").first()
+
+El valor de `cache_consulta` da nombre a la consulta en las métricas. El resultado se
+guarda como FrozenResult con la clave (SQL, parámetros) y etiquetado con las tablas
+que lee; al devolverlo se incorpora a la sesión con `merge(load=False)`, así que los
+objetos se pueden modificar o eliminar como si vinieran de la base de datos.
+
+Cualquier flush, UPDATE/DELETE/INSERT masivo o commit que toque una tabla invalida
+las entradas con esa etiqueta. Un DELETE invalida además las tablas que dependen de
+ella por claves foráneas con ON DELETE CASCADE / SET NULL, que la base de datos
+modifica sin que el ORM se entere. Con el backend en memoria la invalidación se reparte
+al resto de workers por el bus de invalidación; con Redis la caché ya es compartida.
+
+Backends (QUERY_CACHE_BACKEND): "memoria" (LRU por worker), "redis" (cualquier
+servidor compatible con Redis en QUERY_CACHE_REDIS_URL) o "" para desactivarla.
+"""
+import hashlib
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session, loading
+from sqlalchemy.sql.util import find_tables
+
+from app.core.configs import settings
+from app.core.invalidacion import obtener_bus
+
+logger = logging.getLogger(__name__)
+
+NOMBRE_CACHE = "consultas"
+OPCION_CACHE = "cache_consulta"
+
+
+class BackendMemoria:
+    """LRU en memoria del worker"""
+
+    compartido = False
+
+    def __init__(self, ttl: int, maximo_entradas: int):
+        self._ttl = ttl
+        self._maximo = maximo_entradas
+        self._entradas: "OrderedDict[str, tuple]" = OrderedDict()
+        self._por_tabla: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: str):
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            valor, creada, _ = entrada
+            if time.monotonic() - creada > self._ttl:
+                self._quitar(clave)
+                return None
+            self._entradas.move_to_end(clave)
+            return valor
+
+    def guardar(self, clave: str, valor, tablas: Set[str]) -> None:
+        with self._lock:
+            self._quitar(clave)
+            self._entradas[clave] = (valor, time.monotonic(), tablas)
+            for tabla in tablas:
+                self._por_tabla.setdefault(tabla, set()).add(clave)
+            while len(self._entradas) > self._maximo:
+                self._quitar(next(iter(self._entradas)))
+
+    def invalidar(self, tablas: Iterable[str]) -> None:
+        with self._lock:
+            for tabla in tablas:
+                for clave in self._por_tabla.pop(tabla, set()):
+                    self._quitar(clave)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self._por_tabla.clear()
+
+    def _quitar(self, clave: str) -> None:
+        entrada = self._entradas.pop(clave, None)
+        if entrada is None:
+            return
+        for tabla in entrada[2]:
+            claves = self._por_tabla.get(tabla)
+            if claves is not None:
+                claves.discard(clave)
+
+
+class BackendRedis:
+    """
+    Caché compartida en un servidor compatible con Redis. Cada tabla tiene un SET
+    con las claves que la leen, para poder invalidarlas juntas.
+    """
+
+    compartido = True
+
+    def __init__(self, url: str, ttl: int, prefijo: str = "cache_consultas:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("QUERY_CACHE_BACKEND=redis requiere el paquete 'redis'") from e
+        self._cliente = redis.Redis.from_url(url)
+        self._ttl = ttl
+        self._prefijo = prefijo
+
+    def obtener(self, clave: str):
+        datos = self._cliente.get(self._prefijo + clave)
+        return pickle.loads(datos) if datos is not None else None
+
+    def guardar(self, clave: str, valor, tablas: Set[str]) -> None:
+        with self._cliente.pipeline() as pipe:
+            pipe.set(self._prefijo + clave, pickle.dumps(valor), ex=self._ttl)
+            for tabla in tablas:
+                pipe.sadd(self._prefijo + "tabla:" + tabla, clave)
+                pipe.expire(self._prefijo + "tabla:" + tabla, self._ttl)
+            pipe.execute()
+
+    def invalidar(self, tablas: Iterable[str]) -> None:
+        for tabla in tablas:
+            conjunto = self._prefijo + "tabla:" + tabla
+            claves = self._cliente.smembers(conjunto)
+            with self._cliente.pipeline() as pipe:
+                for clave in claves:
+                    pipe.delete(self._prefijo + clave.decode())
+                pipe.delete(conjunto)
+                pipe.execute()
+
+    def limpiar(self) -> None:
+        for clave in self._cliente.scan_iter(self._prefijo + "*"):
+            self._cliente.delete(clave)
+
+
+class MetricasCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._por_consulta: Dict[str, list] = {}
+        self.invalidaciones = 0
+
+    def registrar(self, nombre: str, acierto: bool) -> None:
+        with self._lock:
+            contadores = self._por_consulta.setdefault(nombre, [0, 0])
+            contadores[0 if acierto else 1] += 1
+
+    def registrar_invalidacion(self) -> None:
+        with self._lock:
+            self.invalidaciones += 1
+
+    def resumen(self) -> dict:
+        with self._lock:
+            por_consulta = {nombre: tuple(valores) for nombre, valores in self._por_consulta.items()}
+            invalidaciones = self.invalidaciones
+        aciertos = sum(valores[0] for valores in por_consulta.values())
+        fallos = sum(valores[1] for valores in por_consulta.values())
+        return {
+            "backend": settings.QUERY_CACHE_BACKEND or "desactivada",
+            "aciertos": aciertos,
+            "fallos": fallos,
+            "tasa_aciertos": round(aciertos / (aciertos + fallos), 4) if aciertos + fallos else 0.0,
+            "invalidaciones": invalidaciones,
+            "consultas": {
+                nombre: {
+                    "aciertos": acierto,
+                    "fallos": fallo,
+                    "tasa_aciertos": round(acierto / (acierto + fallo), 4) if acierto + fallo else 0.0,
+                }
+                for nombre, (acierto, fallo) in sorted(por_consulta.items())
+            },
+        }
+
+
+metricas = MetricasCache()
+
+_backend = None
+_backend_lock = threading.Lock()
+# Aumenta con cada invalidación; un resultado leído mientras cambió no se guarda
+_generacion = 0
+
+
+def obtener_backend():
+    """Backend configurado, o None si la caché está desactivada"""
+    global _backend
+    if not settings.QUERY_CACHE_BACKEND:
+        return None
+    with _backend_lock:
+        if _backend is None:
+            if settings.QUERY_CACHE_BACKEND == "redis":
+                _backend = BackendRedis(settings.QUERY_CACHE_REDIS_URL, settings.QUERY_CACHE_TTL)
+            else:
+                _backend = BackendMemoria(settings.QUERY_CACHE_TTL, settings.QUERY_CACHE_MAX_ENTRADAS)
+            obtener_bus().registrar(
+                NOMBRE_CACHE, invalidar=invalidar_tablas, limpiar=_limpiar, remota=not _backend.compartido
+            )
+        return _backend
+
+
+def _avanzar_generacion() -> None:
+    global _generacion
+    with _backend_lock:
+        _generacion += 1
+
+
+def invalidar_tablas(tablas: Iterable[str]) -> None:
+    """Invalida en este worker; el reparto a los demás lo hace el bus al confirmar"""
+    tablas = set(tablas)
+    backend = obtener_backend()
+    if not tablas or backend is None:
+        return
+    _avanzar_generacion()
+    backend.invalidar(tablas)
+    metricas.registrar_invalidacion()
+
+
+def _limpiar() -> None:
+    backend = obtener_backend()
+    if backend is None:
+        return
+    _avanzar_generacion()
+    backend.limpiar()
+    metricas.registrar_invalidacion()
+
+
+def tablas_sentencia(sentencia) -> Set[str]:
+    return {
+        tabla.name
+        for tabla in find_tables(sentencia, include_aliases=True, include_joins=True, include_crud=True)
+        if hasattr(tabla, "name")
+    }
+
+
+def _clave(estado: ORMExecuteState) -> str:
+    clave_sentencia = estado.statement._generate_cache_key()
+    texto = clave_sentencia.to_offline_string({}, estado.statement, estado.parameters or {})
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+
+_dependientes: Dict[str, Set[str]] = {}
+
+
+def _mapa_dependientes() -> Dict[str, Set[str]]:
+    """Tabla -> tablas que la base de datos modifica al borrar en ella (ON DELETE, en cadena)"""
+    if _dependientes:
+        return _dependientes
+    from app.db.base_class import Base
+
+    # Padre -> [(hija, se borran sus filas)]; con SET NULL la hija cambia pero no sigue la cadena
+    directas: Dict[str, Set[tuple]] = {}
+    for tabla in Base.metadata.tables.values():
+        for clave in tabla.foreign_keys:
+            if clave.ondelete:
+                borra = clave.ondelete.upper() == "CASCADE"
+                directas.setdefault(clave.column.table.name, set()).add((tabla.name, borra))
+
+    mapa: Dict[str, Set[str]] = {}
+    for origen in directas:
+        pendientes = list(directas[origen])
+        alcanzadas: Set[str] = set()
+        while pendientes:
+            tabla, borra = pendientes.pop()
+            alcanzadas.add(tabla)
+            if borra:
+                pendientes.extend(hija for hija in directas.get(tabla, ()) if hija[0] not in alcanzadas)
+        mapa[origen] = alcanzadas
+    _dependientes.update(mapa)
+    return _dependientes
+
+
+def tablas_borrado(tablas: Iterable[str]) -> Set[str]:
+    """`tablas` más las que cambian en cascada al borrar filas de ellas"""
+    mapa = _mapa_dependientes()
+    tablas = set(tablas)
+    return tablas.union(*(mapa.get(tabla, set()) for tabla in tablas))
+
+
+def _marcar_tablas(session: Session, tablas: Set[str]) -> None:
+    """Invalida ya (para las lecturas de esta misma sesión) y de nuevo al confirmar"""
+    if not tablas:
+        return
+    invalidar_tablas(tablas)
+    session.info.setdefault("cache_consultas_tablas", set()).update(tablas)
+    if obtener_backend() is not None:
+        obtener_bus().invalidar_al_confirmar(session, NOMBRE_CACHE, tablas)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _ejecutar(estado: ORMExecuteState):
+    if not estado.is_select:
+        if estado.is_delete:
+            _marcar_tablas(estado.session, tablas_borrado(tablas_sentencia(estado.statement)))
+        elif estado.is_update or estado.is_insert:
+            _marcar_tablas(estado.session, tablas_sentencia(estado.statement))
+        return None
+
+    nombre = estado.execution_options.get(OPCION_CACHE)
+    backend = obtener_backend() if nombre else None
+    sesion = estado.session
+    # Con cambios sin enviar, un merge del resultado cacheado podría pisarlos
+    if backend is None or sesion.new or sesion.dirty or sesion.deleted:
+        return None
+    tablas = tablas_sentencia(estado.statement)
+    # Esta transacción ya escribió en esas tablas: su lectura no debe compartirse
+    if tablas & sesion.info.get("cache_consultas_tablas", set()):
+        return None
+
+    clave = _clave(estado)
+    try:
+        congelado = backend.obtener(clave)
+    except Exception as e:
+        logger.error(f"Error leyendo la caché de consultas: {e}")
+        return None
+
+    if congelado is None:
+        metricas.registrar(nombre, acierto=False)
+        generacion = _generacion
+        congelado = estado.invoke_statement().freeze()
+        try:
+            if generacion == _generacion:
+                backend.guardar(clave, congelado, tablas)
+        except Exception as e:
+            logger.error(f"Error guardando en la caché de consultas: {e}")
+    else:
+        metricas.registrar(nombre, acierto=True)
+
+    return loading.merge_frozen_result(sesion, estado.statement, congelado, load=False)()
+
+
+@event.listens_for(Session, "after_flush")
+def _despues_flush(session: Session, flush_context) -> None:
+    tablas = {
+        tabla.name
+        for objeto in list(session.new) + list(session.dirty)
+        for tabla in inspect(objeto).mapper.tables
+    }
+    borradas = {tabla.name for objeto in session.deleted for tabla in inspect(objeto).mapper.tables}
+    _marcar_tablas(session, tablas | tablas_borrado(borradas))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _fin_transaccion(session: Session) -> None:
+    # Liberar o deshacer un savepoint no termina la transacción
+    if session.in_nested_transaction():
+        return
+    session.info.pop("cache_consultas_tablas", None)
@@ -0,0 +1,115 @@
+"""
+Cargadores por petición (estilo DataLoader) para buscar entidades por ID.
+
+La sesión vive lo que dura la petición (get_db), así que cada cargador se guarda en
+`db.info` y recuerda lo que ya resolvió, incluidos los IDs que no existen. Los IDs
+que se piden juntos (`cargar_muchos`) o que se encolan antes de leer (`encolar` y
+luego `cargar`) se resuelven con una sola consulta `WHERE id IN (...)`; lo que ya
+está en el identity map de la sesión no se consulta.
+
+    materias = obtener_cargador(db, Materia).cargar_muchos(ids)
+    seccion = obtener_cargador(db, Seccion).cargar(id_seccion)
+
+Los objetos creados o eliminados en la sesión actualizan los cargadores al hacer
+flush, y un rollback los vacía.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+CLAVE_INFO = "cargadores"
+
+
+class Cargador:
+    def __init__(self, db: Session, modelo, cache_consulta: Optional[str] = None):
+        self._db = db
+        self._modelo = modelo
+        self._columna = inspect(modelo).primary_key[0]
+        # Nombre para la caché de consultas (app/db/cache_consultas.py), si el modelo la usa
+        self._cache_consulta = cache_consulta
+        self._cargados: Dict[Any, Optional[Any]] = {}
+        self._pendientes: List[Any] = []
+
+    def encolar(self, ids: Iterable[Any]) -> None:
+        """Agrega IDs a la próxima consulta sin ejecutarla todavía"""
+        for id_entidad in ids:
+            if id_entidad is not None and id_entidad not in self._cargados:
+                self._pendientes.append(id_entidad)
+
+    def cargar(self, id_entidad: Any) -> Optional[Any]:
+        if id_entidad is None:
+            return None
+        if id_entidad not in self._cargados:
+            self.encolar([id_entidad])
+            self._resolver()
+        return self._cargados.get(id_entidad)
+
+    def cargar_muchos(self, ids: Iterable[Any]) -> List[Optional[Any]]:
+        """Devuelve las entidades en el mismo orden que `ids` (None si no existe)"""
+        ids = list(ids)
+        self.encolar(ids)
+        self._resolver()
+        return [self._cargados.get(id_entidad) if id_entidad is not None else None for id_entidad in ids]
+
+    def agregar(self, entidad: Any) -> None:
+        self._cargados[getattr(entidad, self._columna.key)] = entidad
+
+    def descartar(self, id_entidad: Any) -> None:
+        self._cargados.pop(id_entidad, None)
+
+    def _resolver(self) -> None:
+        pendientes = list(dict.fromkeys(self._pendientes))
+        self._pendientes.clear()
+
+        faltantes = []
+        for id_entidad in pendientes:
+            if id_entidad in self._cargados:
+                continue
+            entidad = self._db.identity_map.get(identity_key(self._modelo, id_entidad))
+            if entidad is not None:
+                self._cargados[id_entidad] = entidad
+            else:
+                faltantes.append(id_entidad)
+        if not faltantes:
+            return
+
+        consulta = select(self._modelo).where(self._columna.in_(faltantes))
+        if self._cache_consulta:
+            consulta = consulta.execution_options(cache_consulta=self._cache_consulta)
+        encontrados = {
+            getattr(entidad, self._columna.key): entidad
+            for entidad in self._db.execute(consulta).scalars()
+        }
+        for id_entidad in faltantes:
+            self._cargados[id_entidad] = encontrados.get(id_entidad)
+
+
+def obtener_cargador(db: Session, modelo, cache_consulta: Optional[str] = None) -> Cargador:
+    """Cargador de `modelo` para la petición de `db`"""
+    cargadores = db.info.setdefault(CLAVE_INFO, {})
+    cargador = cargadores.get(modelo)
+    if cargador is None:
+        cargador = cargadores[modelo] = Cargador(db, modelo, cache_consulta)
+    return cargador
+
+
+@event.listens_for(Session, "after_flush")
+def _despues_flush(session: Session, flush_context) -> None:
+    cargadores = session.info.get(CLAVE_INFO)
+    if not cargadores:
+        return
+    for entidad in session.new:
+        cargador = cargadores.get(type(entidad))
+        if cargador is not None:
+            cargador.agregar(entidad)
+    for entidad in session.deleted:
+        cargador = cargadores.get(type(entidad))
+        if cargador is not None:
+            cargador.descartar(inspect(entidad).identity[0])
+
+
+@event.listens_for(Session, "after_rollback")
+def _despues_rollback(session: Session) -> None:
+    session.info.pop(CLAVE_INFO, None)
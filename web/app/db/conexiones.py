@@ -0,0 +1,128 @@
+"""
+Conteo de conexiones tomadas del pool y de commits por petición.
+
+La sesión de `get_db` no pide conexión al pool al crearse: la toma con la primera
+sentencia que llega a la base de datos y la devuelve al cerrarse. Las respuestas que
+salen de la caché HTTP, de la caché de consultas o del snapshot de referencia, o que
+se rechazan antes de consultar, no tocan el pool.
+
+Un middleware ASGI abre un contador por petición y lo devuelve en las cabeceras
+`X-DB-Checkouts` y `X-DB-Commits`; los eventos "checkout" del pool y "commit" del
+engine lo incrementan. Con la unidad de trabajo (app/api/v1/unidad_trabajo.py) una
+petición que escribe hace un solo commit, es decir, un solo flush del WAL (la excepción,
+con PUBSUB_BACKEND=postgres, está descrita allí). Los totales
+del worker (peticiones, conexiones tomadas, peticiones sin conexión, commits) salen en
+/api/health/cache.
+"""
+import contextvars
+import threading
+from typing import Optional
+
+from sqlalchemy import event
+
+CABECERA_CHECKOUTS = "X-DB-Checkouts"
+CABECERA_COMMITS = "X-DB-Commits"
+
+
+class ContadorPeticion:
+    __slots__ = ("checkouts", "commits")
+
+    def __init__(self):
+        self.checkouts = 0
+        self.commits = 0
+
+
+# Objeto mutable: las dependencias síncronas corren en el threadpool con una copia del
+# contexto, así que incrementan el mismo contador que lee el middleware
+_contador_actual: contextvars.ContextVar[Optional[ContadorPeticion]] = contextvars.ContextVar(
+    "contador_conexiones", default=None
+)
+
+
+class MetricasConexiones:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.peticiones = 0
+        self.peticiones_sin_conexion = 0
+        self.checkouts = 0
+        self.commits = 0
+
+    def registrar_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def registrar_commit(self) -> None:
+        with self._lock:
+            self.commits += 1
+
+    def registrar_peticion(self, checkouts: int) -> None:
+        with self._lock:
+            self.peticiones += 1
+            if checkouts == 0:
+                self.peticiones_sin_conexion += 1
+
+    def resumen(self) -> dict:
+        with self._lock:
+            return {
+                "peticiones": self.peticiones,
+                "peticiones_sin_conexion": self.peticiones_sin_conexion,
+                "checkouts": self.checkouts,
+                "commits": self.commits,
+            }
+
+
+metricas = MetricasConexiones()
+
+
+def checkouts_peticion() -> int:
+    """Conexiones tomadas del pool hasta ahora en la petición actual"""
+    contador = _contador_actual.get()
+    return contador.checkouts if contador is not None else 0
+
+
+def registrar_pool(engine) -> None:
+    @event.listens_for(engine, "checkout")
+    def _al_tomar_conexion(dbapi_connection, connection_record, connection_proxy) -> None:
+        metricas.registrar_checkout()
+        contador = _contador_actual.get()
+        if contador is not None:
+            contador.checkouts += 1
+
+    @event.listens_for(engine, "commit")
+    def _al_confirmar(conexion) -> None:
+        metricas.registrar_commit()
+        contador = _contador_actual.get()
+        if contador is not None:
+            contador.commits += 1
+
+
+class MiddlewareConexiones:
+    """Middleware ASGI: agrega `X-DB-Checkouts` y `X-DB-Commits` a cada respuesta HTTP"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        contador = ContadorPeticion()
+        token = _contador_actual.set(contador)
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                mensaje = {
+                    **mensaje,
+                    "headers": list(mensaje.get("headers", [])) + [
+                        (CABECERA_CHECKOUTS.lower().encode(), str(contador.checkouts).encode()),
+                        (CABECERA_COMMITS.lower().encode(), str(contador.commits).encode()),
+                    ],
+                }
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _contador_actual.reset(token)
+            metricas.registrar_peticion(contador.checkouts)
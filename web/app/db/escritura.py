@@ -0,0 +1,52 @@
+"""
+Escrituras con INSERT/UPDATE ... RETURNING.
+
+`insertar` y `actualizar` arman el objeto ORM con la fila que devuelve la propia
+sentencia, incluidos los valores que genera el servidor (`server_default`,
+`func.now()`), así que después del commit no hace falta `db.refresh(...)`: cada
+escritura es una sola ida a la base de datos.
+
+    materia = insertar(db, Materia, nombre="Ciencias")
+    materia = actualizar(db, Materia, id_materia, {"nombre": "Ciencias Naturales"})
+
+Los objetos devueltos quedan en el identity map de la sesión (un objeto ya cargado
+se actualiza con la fila devuelta) y las sentencias pasan por los eventos
+`do_orm_execute`, por lo que la caché de consultas y el snapshot de referencia se
+invalidan igual que con un flush.
+"""
+from typing import Any, Dict, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import inspect, insert, update
+from sqlalchemy.orm import Session
+
+Modelo = TypeVar("Modelo")
+
+
+def insertar(db: Session, modelo: type[Modelo], **valores: Any) -> Modelo:
+    """INSERT ... RETURNING de una fila; los defaults de Python y del servidor vienen en la respuesta"""
+    return db.execute(insert(modelo).values(**valores).returning(modelo)).scalar_one()
+
+
+def insertar_muchos(db: Session, modelo: type[Modelo], filas: Sequence[Dict[str, Any]]) -> List[Modelo]:
+    """INSERT de varias filas con RETURNING (en lotes "insertmanyvalues"), en el orden de `filas`"""
+    if not filas:
+        return []
+    return list(db.execute(insert(modelo).returning(modelo, sort_by_parameter_order=True), list(filas)).scalars())
+
+
+def actualizar(
+    db: Session, modelo: type[Modelo], id_entidad: Any, valores: Dict[str, Any], *condiciones
+) -> Optional[Modelo]:
+    """
+    UPDATE ... RETURNING por clave primaria (y `condiciones` extra). Devuelve None si
+    ninguna fila coincide; sin `valores` solo busca la entidad.
+    """
+    columna = inspect(modelo).primary_key[0]
+    if not valores:
+        return db.query(modelo).filter(columna == id_entidad, *condiciones).first()
+    return db.execute(
+        update(modelo)
+        .where(columna == id_entidad, *condiciones)
+        .values(**valores)
+        .returning(modelo)
+    ).scalar_one_or_none()
@@ -117,8 +117,11 @@ CREATE TABLE evento (
     destinatario VARCHAR(20) CHECK (destinatario IN ('todos', 'para mi'))
 );
 
+-- Tabla: notificacion (particionada por mes; las particiones mensuales las crea
+-- `python -m app.modules.notificacion.mantenimiento particiones`, mientras tanto
+-- las filas quedan en la partición por defecto)
 CREATE TABLE notificacion (
-    id_notificacion UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id_notificacion UUID NOT NULL DEFAULT gen_random_uuid(),
     id_usuario UUID REFERENCES usuario(id_usuario) ON DELETE CASCADE,
     titulo VARCHAR(100) NOT NULL,
     mensaje TEXT NOT NULL,
@@ -130,9 +133,34 @@ CREATE TABLE notificacion (
     accion_texto VARCHAR(50),
     accion_icono VARCHAR(30),
     referencia_id UUID,
-    referencia_tipo VARCHAR(30)
+    referencia_tipo VARCHAR(30),
+    PRIMARY KEY (id_notificacion, fecha)
+) PARTITION BY RANGE (fecha);
+
+CREATE TABLE notificacion_pdefault PARTITION OF notificacion DEFAULT;
+
+CREATE INDEX ix_notificacion_usuario_fecha ON notificacion (id_usuario, fecha);
+
+-- Tabla: notificacion_archivo (notificaciones leídas fuera del período de retención)
+CREATE TABLE notificacion_archivo (
+    id_notificacion UUID PRIMARY KEY,
+    id_usuario UUID REFERENCES usuario(id_usuario) ON DELETE CASCADE,
+    titulo VARCHAR(100) NOT NULL,
+    mensaje TEXT NOT NULL,
+    fecha TIMESTAMP NOT NULL,
+    tipo VARCHAR(20) NOT NULL,
+    leida BOOLEAN NOT NULL DEFAULT TRUE,
+    accionable BOOLEAN DEFAULT FALSE,
+    accion VARCHAR(50),
+    accion_texto VARCHAR(50),
+    accion_icono VARCHAR(30),
+    referencia_id UUID,
+    referencia_tipo VARCHAR(30),
+    fecha_archivo TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE INDEX ix_notificacion_archivo_usuario_fecha ON notificacion_archivo (id_usuario, fecha);
+
 -- Tabla: asistencia
 CREATE TABLE asistencia (
     id_asistencia UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -223,3 +251,27 @@ CREATE TABLE noticia (
     fecha_publicacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     publicada_por UUID REFERENCES usuario(id_usuario) ON DELETE SET NULL
 );
+
+-- Tabla: notificacion_contador (contadores desnormalizados para el badge de notificaciones)
+CREATE TABLE notificacion_contador (
+    id_usuario UUID PRIMARY KEY REFERENCES usuario(id_usuario) ON DELETE CASCADE,
+    no_leidas INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    ultimo_evento BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO notificacion_contador (id_usuario, no_leidas, total)
+SELECT id_usuario, COUNT(*) FILTER (WHERE leida = FALSE), COUNT(*)
+FROM notificacion
+WHERE id_usuario IS NOT NULL
+GROUP BY id_usuario;
+
+-- Índices para la paginación por cursor de los listados (orden + ID de desempate)
+CREATE INDEX ix_aviso_fecha_envio_id ON aviso (fecha_envio, id_aviso);
+CREATE INDEX ix_documento_fecha_subida_id ON documento (fecha_subida, id_documento);
+CREATE INDEX ix_usuario_rol_nombre_id ON usuario (rol, nombre, id_usuario);
+CREATE INDEX ix_estudiante_apellidos_nombre_id ON estudiante (primer_apellido, segundo_apellido, nombre, id_estudiante);
+CREATE INDEX ix_seccion_grado_nombre_id ON seccion (grado, nombre, id_seccion);
+CREATE INDEX ix_noticia_fecha_publicacion_id ON noticia (fecha_publicacion, id_noticia);
+CREATE INDEX ix_evento_fecha_hora_id ON evento (fecha_hora, id_evento);
+CREATE INDEX ix_informe_junta_patronato_fecha_subida_id ON informe_junta_patronato (fecha_subida, id_informe);
@@ -1,6 +1,14 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.configs import settings
+from app.db.conexiones import registrar_pool
 
 engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Cuenta las conexiones que toma cada petición (cabecera X-DB-Checkouts)
+registrar_pool(engine)
+# expire_on_commit=False: las respuestas se construyen con los valores ya devueltos por
+# RETURNING/refresh sin volver a consultar cada objeto después del commit
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Registra los eventos de sesión de la caché de consultas
+import app.db.cache_consultas  # noqa: E402,F401
@@ -0,0 +1,432 @@
+"""
+Snapshot compartido de datos de referencia: materias, secciones, años lectivos y
+la lista de profesores.
+
+Son tablas pequeñas, muy leídas y que casi no cambian. En lugar de que cada worker
+las consulte, un worker las vuelca a un archivo binario de solo lectura y todos los
+workers de la máquina lo mapean en memoria (mmap), así que el sistema operativo
+comparte las mismas páginas entre procesos y las búsquedas no tocan la base de datos.
+
+Formato (little endian, versión FORMATO):
+
+    cabecera   MAGIA, formato, versión (ns al construir) y por cada bloque (offset, cantidad)
+    bloques    registros de tamaño fijo ordenados por ID (UUID de 16 bytes), para
+               búsqueda binaria
+    textos     UTF-8 concatenado; los registros guardan (offset, largo)
+
+Ciclo de vida: el archivo se construye bajo un bloqueo de archivo la primera vez que
+algún worker lo necesita (o cuando el que hay tiene otro formato). Cuando se confirma
+una transacción que escribió en alguna de las tablas, ese worker borra el archivo (bajo
+el mismo bloqueo) y avisa por el bus de invalidación; los demás sueltan su mapeo y el
+siguiente acceso construye uno nuevo. La tabla `usuario` no se vigila entera (cambia en
+cada alta de padre o cambio de contraseña): las altas y bajas de profesores escriben en
+`profesor`, y la edición de sus datos llama a `descartar_snapshot_al_confirmar`.
+Si el snapshot no está disponible, `obtener_snapshot()` devuelve None y el llamador
+consulta la base de datos como siempre.
+"""
+import bisect
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Set
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.configs import settings
+from app.core.invalidacion import obtener_bus
+from app.db.cache_consultas import tablas_sentencia
+
+try:
+    import fcntl
+except ImportError:  # Windows: solo se coordina entre hilos del mismo proceso
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+NOMBRE_CACHE = "referencia"
+NOMBRE_ARCHIVO = "escuela_referencia.snap"
+TABLAS_REFERENCIA = {"materia", "seccion", "anio_lectivo", "profesor"}
+
+MAGIA = b"ESRF"
+FORMATO = 2
+
+# Bloques en el orden en que aparecen en la cabecera
+BLOQUES = ("materias", "secciones", "anios", "profesores")
+CABECERA = struct.Struct("<4sHxxQ" + "II" * len(BLOQUES) + "II")
+MATERIA = struct.Struct("<16sII")
+SECCION = struct.Struct("<16sIIII16s16s")
+ANIO = struct.Struct("<16sIIii?3x")
+PROFESOR = struct.Struct("<16sIIII")
+SIN_UUID = bytes(16)
+
+
+class MateriaRef(NamedTuple):
+    id_materia: UUID
+    nombre: str
+
+
+class SeccionRef(NamedTuple):
+    id_seccion: UUID
+    nombre: str
+    grado: str
+    id_profesor_guia: Optional[UUID]
+    id_anio: UUID
+
+
+class AnioLectivoRef(NamedTuple):
+    id_anio: UUID
+    nombre: str
+    fecha_inicio: date
+    fecha_fin: date
+    activo: bool
+
+
+class ProfesorRef(NamedTuple):
+    id_profesor: UUID
+    nombre: str
+    correo: str
+
+
+class _Textos:
+    """Acumula los textos del snapshot y devuelve su (offset, largo)"""
+
+    def __init__(self):
+        self._partes: List[bytes] = []
+        self._largo = 0
+        self._vistos = {}
+
+    def agregar(self, texto: str):
+        if texto not in self._vistos:
+            datos = texto.encode("utf-8")
+            self._vistos[texto] = (self._largo, len(datos))
+            self._partes.append(datos)
+            self._largo += len(datos)
+        return self._vistos[texto]
+
+    def contenido(self) -> bytes:
+        return b"".join(self._partes)
+
+
+def _serializar(
+    materias: Sequence[tuple], secciones: Sequence[tuple], anios: Sequence[tuple], profesores: Sequence[tuple]
+) -> bytes:
+    """Arma el archivo a partir de tuplas con los mismos campos que los *Ref"""
+    textos = _Textos()
+    bloques = {}
+
+    materias = sorted(materias, key=lambda m: m[0].bytes)
+    bloques["materias"] = b"".join(MATERIA.pack(m[0].bytes, *textos.agregar(m[1])) for m in materias)
+
+    secciones = sorted(secciones, key=lambda s: s[0].bytes)
+    bloques["secciones"] = b"".join(
+        SECCION.pack(
+            s[0].bytes, *textos.agregar(s[1]), *textos.agregar(s[2]),
+            s[3].bytes if s[3] else SIN_UUID, s[4].bytes
+        )
+        for s in secciones
+    )
+
+    anios = sorted(anios, key=lambda a: a[0].bytes)
+    bloques["anios"] = b"".join(
+        ANIO.pack(a[0].bytes, *textos.agregar(a[1]), a[2].toordinal(), a[3].toordinal(), bool(a[4]))
+        for a in anios
+    )
+
+    profesores = sorted(profesores, key=lambda p: p[0].bytes)
+    bloques["profesores"] = b"".join(
+        PROFESOR.pack(p[0].bytes, *textos.agregar(p[1]), *textos.agregar(p[2])) for p in profesores
+    )
+
+    cantidades = {
+        "materias": len(materias), "secciones": len(secciones), "anios": len(anios), "profesores": len(profesores),
+    }
+    directorio = []
+    offset = CABECERA.size
+    for nombre in BLOQUES:
+        directorio += [offset, cantidades[nombre]]
+        offset += len(bloques[nombre])
+    contenido_textos = textos.contenido()
+    directorio += [offset, len(contenido_textos)]
+
+    cabecera = CABECERA.pack(MAGIA, FORMATO, time.time_ns(), *directorio)
+    return cabecera + b"".join(bloques[nombre] for nombre in BLOQUES) + contenido_textos
+
+
+class _Bloque:
+    """Arreglo de registros de tamaño fijo dentro del mapeo, indexable y con len()"""
+
+    def __init__(self, datos, formato: struct.Struct, offset: int, cantidad: int):
+        self._datos = datos
+        self._formato = formato
+        self._offset = offset
+        self._cantidad = cantidad
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    def __getitem__(self, indice: int) -> tuple:
+        return self._formato.unpack_from(self._datos, self._offset + indice * self._formato.size)
+
+
+class _ClavesPorId:
+    """Vista de solo los IDs de un bloque, para bisect"""
+
+    def __init__(self, bloque: _Bloque):
+        self._bloque = bloque
+
+    def __len__(self) -> int:
+        return len(self._bloque)
+
+    def __getitem__(self, indice: int) -> bytes:
+        return self._bloque[indice][0]
+
+
+class SnapshotReferencia:
+    """Snapshot mapeado en memoria; solo lectura y seguro entre hilos"""
+
+    def __init__(self, ruta: str):
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        valores = CABECERA.unpack_from(self._mapa, 0)
+        magia, formato, self.version = valores[:3]
+        if magia != MAGIA or formato != FORMATO:
+            raise ValueError(f"{ruta} no es un snapshot de referencia con formato {FORMATO}")
+        directorio = dict(zip(BLOQUES, zip(valores[3::2], valores[4::2])))
+        self._textos = valores[-2]
+
+        self._materias = _Bloque(self._mapa, MATERIA, *directorio["materias"])
+        self._secciones = _Bloque(self._mapa, SECCION, *directorio["secciones"])
+        self._anios = _Bloque(self._mapa, ANIO, *directorio["anios"])
+        self._profesores = _Bloque(self._mapa, PROFESOR, *directorio["profesores"])
+
+    def _texto(self, offset: int, largo: int) -> str:
+        inicio = self._textos + offset
+        return self._mapa[inicio:inicio + largo].decode("utf-8")
+
+    @staticmethod
+    def _por_id(bloque: _Bloque, id_registro: UUID) -> Optional[tuple]:
+        claves = _ClavesPorId(bloque)
+        posicion = bisect.bisect_left(claves, id_registro.bytes)
+        if posicion < len(claves) and claves[posicion] == id_registro.bytes:
+            return bloque[posicion]
+        return None
+
+    def _materia(self, registro: tuple) -> MateriaRef:
+        return MateriaRef(UUID(bytes=registro[0]), self._texto(registro[1], registro[2]))
+
+    def _seccion(self, registro: tuple) -> SeccionRef:
+        return SeccionRef(
+            UUID(bytes=registro[0]),
+            self._texto(registro[1], registro[2]),
+            self._texto(registro[3], registro[4]),
+            UUID(bytes=registro[5]) if registro[5] != SIN_UUID else None,
+            UUID(bytes=registro[6]),
+        )
+
+    def materia(self, id_materia: UUID) -> Optional[MateriaRef]:
+        registro = self._por_id(self._materias, id_materia)
+        return self._materia(registro) if registro else None
+
+    def seccion(self, id_seccion: UUID) -> Optional[SeccionRef]:
+        registro = self._por_id(self._secciones, id_seccion)
+        return self._seccion(registro) if registro else None
+
+    def anio_lectivo(self, id_anio: UUID) -> Optional[AnioLectivoRef]:
+        registro = self._por_id(self._anios, id_anio)
+        if registro is None:
+            return None
+        return AnioLectivoRef(
+            UUID(bytes=registro[0]),
+            self._texto(registro[1], registro[2]),
+            date.fromordinal(registro[3]),
+            date.fromordinal(registro[4]),
+            registro[5],
+        )
+
+    def profesor(self, id_profesor: UUID) -> Optional[ProfesorRef]:
+        registro = self._por_id(self._profesores, id_profesor)
+        if registro is None:
+            return None
+        return ProfesorRef(
+            UUID(bytes=registro[0]), self._texto(registro[1], registro[2]), self._texto(registro[3], registro[4])
+        )
+
+    def resumen(self) -> dict:
+        return {
+            "version": self.version,
+            "bytes": len(self._mapa),
+            "materias": len(self._materias),
+            "secciones": len(self._secciones),
+            "anios_lectivos": len(self._anios),
+            "profesores": len(self._profesores),
+        }
+
+
+def ruta_snapshot() -> str:
+    directorio = settings.REFERENCIA_SNAPSHOT_DIR or tempfile.gettempdir()
+    return os.path.join(directorio, NOMBRE_ARCHIVO)
+
+
+@contextmanager
+def _bloqueo_archivo():
+    """Excluye a los demás workers (y a los demás hilos) mientras se construye o se borra"""
+    with _construccion_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(ruta_snapshot() + ".lock", "a") as archivo:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+
+
+def construir_snapshot(db: Session, ruta: str) -> None:
+    """Lee las tablas y reemplaza el archivo de forma atómica"""
+    from app.modules.anio_lectivo.models import AnioLectivo
+    from app.modules.materias.models import Materia
+    from app.modules.secciones.models import Seccion
+    from app.modules.usuarios.models import Usuario
+
+    materias = db.query(Materia.id_materia, Materia.nombre).all()
+    secciones = db.query(
+        Seccion.id_seccion, Seccion.nombre, Seccion.grado, Seccion.id_profesor_guia, Seccion.id_anio
+    ).all()
+    anios = db.query(
+        AnioLectivo.id_anio, AnioLectivo.nombre, AnioLectivo.fecha_inicio, AnioLectivo.fecha_fin, AnioLectivo.activo
+    ).all()
+    profesores = db.query(Usuario.id_usuario, Usuario.nombre, Usuario.correo).filter(Usuario.rol == "profesor").all()
+
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(_serializar(materias, secciones, anios, profesores))
+    os.replace(temporal, ruta)
+
+
+_snapshot: Optional[SnapshotReferencia] = None
+_snapshot_lock = threading.Lock()
+_construccion_lock = threading.Lock()
+_registrado = False
+
+
+def _archivo_vigente(ruta: str) -> bool:
+    """Existe y tiene el formato de este código; el de un despliegue anterior se reconstruye"""
+    try:
+        with open(ruta, "rb") as archivo:
+            return archivo.read(6) == struct.pack("<4sH", MAGIA, FORMATO)
+    except FileNotFoundError:
+        return False
+
+
+def _mapear_o_construir() -> SnapshotReferencia:
+    ruta = ruta_snapshot()
+    if not _archivo_vigente(ruta):
+        with _bloqueo_archivo():
+            # Otro worker pudo construirlo mientras se esperaba el bloqueo
+            if not _archivo_vigente(ruta):
+                from app.db.session import SessionLocal
+
+                db = SessionLocal()
+                try:
+                    construir_snapshot(db, ruta)
+                finally:
+                    db.close()
+    return SnapshotReferencia(ruta)
+
+
+def obtener_snapshot() -> Optional[SnapshotReferencia]:
+    """Snapshot vigente de este worker, o None si está desactivado o no se pudo construir"""
+    global _snapshot, _registrado
+    if not settings.REFERENCIA_SNAPSHOT_ACTIVO:
+        return None
+    snapshot = _snapshot
+    if snapshot is not None:
+        return snapshot
+    with _snapshot_lock:
+        if not _registrado:
+            obtener_bus().registrar(NOMBRE_CACHE, invalidar=lambda tablas: soltar_snapshot(), limpiar=soltar_snapshot)
+            _registrado = True
+        if _snapshot is None:
+            try:
+                _snapshot = _mapear_o_construir()
+            except Exception as e:
+                logger.error(f"No se pudo preparar el snapshot de referencia: {e}")
+                return None
+        return _snapshot
+
+
+def resumen_snapshot() -> Optional[dict]:
+    """Estado del mapeo actual sin construirlo"""
+    snapshot = _snapshot
+    return snapshot.resumen() if snapshot is not None else None
+
+
+def soltar_snapshot() -> None:
+    """Deja de usar el mapeo actual; se cierra solo cuando ya nadie lo está leyendo"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+
+def descartar_snapshot(tablas: Iterable[str]) -> None:
+    """Borra el archivo (para que se reconstruya) y avisa a todos los workers"""
+    try:
+        with _bloqueo_archivo():
+            try:
+                os.unlink(ruta_snapshot())
+            except FileNotFoundError:
+                pass
+    except Exception as e:
+        logger.error(f"No se pudo descartar el snapshot de referencia: {e}")
+    obtener_bus().invalidar(NOMBRE_CACHE, tablas)
+
+
+def descartar_snapshot_al_confirmar(db: Session, *tablas: str) -> None:
+    """Descarta el snapshot cuando `db` confirme, para escrituras fuera de TABLAS_REFERENCIA que lo cambian"""
+    db.info.setdefault("referencia_tablas", set()).update(tablas)
+
+
+def _marcar(session: Session, tablas: Set[str]) -> None:
+    tablas = tablas & TABLAS_REFERENCIA
+    if tablas:
+        session.info.setdefault("referencia_tablas", set()).update(tablas)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _escritura_masiva(estado: ORMExecuteState) -> None:
+    if estado.is_update or estado.is_delete or estado.is_insert:
+        _marcar(estado.session, tablas_sentencia(estado.statement))
+
+
+@event.listens_for(Session, "after_flush")
+def _despues_flush(session: Session, flush_context) -> None:
+    _marcar(session, {
+        tabla.name
+        for objeto in list(session.new) + list(session.dirty) + list(session.deleted)
+        for tabla in inspect(objeto).mapper.tables
+    })
+
+
+@event.listens_for(Session, "after_commit")
+def _despues_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    tablas = session.info.pop("referencia_tablas", None)
+    if tablas and settings.REFERENCIA_SNAPSHOT_ACTIVO:
+        descartar_snapshot(tablas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _despues_rollback(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    session.info.pop("referencia_tablas", None)
@@ -1,8 +1,18 @@
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from typing import List, Optional, Dict, Any, Tuple, Union
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from sqlalchemy import desc
 
+from app.core.configs import settings
+from app.core.paginacion import paginar
+from app.core.cache_http import invalidar_al_confirmar
+from app.core.invalidacion import obtener_bus
+from app.db.cargadores import obtener_cargador
+from app.db.escritura import actualizar, insertar
+from app.db.snapshot_referencia import AnioLectivoRef, obtener_snapshot
+
 from app.modules.anio_lectivo.models import AnioLectivo
 from app.modules.anio_lectivo.schemas import AnioLectivoCreate, AnioLectivoUpdate
 
@@ -11,7 +21,18 @@ def get_anio_lectivo(db: Session, id_anio: UUID) -> Optional[AnioLectivo]:
     """
     Obtiene un año lectivo por su ID
     """
-    return db.query(AnioLectivo).filter(AnioLectivo.id_anio == id_anio).first()
+    return obtener_cargador(db, AnioLectivo, cache_consulta="get_anio_lectivo").cargar(id_anio)
+
+
+def get_anio_lectivo_ref(db: Session, id_anio: UUID) -> Optional[Union[AnioLectivoRef, AnioLectivo]]:
+    """
+    Obtiene un año lectivo de solo lectura desde el snapshot compartido
+    (o desde la base de datos si el snapshot no está disponible)
+    """
+    snapshot = obtener_snapshot()
+    if snapshot is None:
+        return get_anio_lectivo(db, id_anio)
+    return snapshot.anio_lectivo(id_anio)
 
 
 def get_anio_lectivo_by_nombre(db: Session, nombre: str) -> Optional[AnioLectivo]:
@@ -21,38 +42,114 @@ def get_anio_lectivo_by_nombre(db: Session, nombre: str) -> Optional[AnioLectivo
     return db.query(AnioLectivo).filter(AnioLectivo.nombre == nombre).first()
 
 
+NOMBRE_CACHE_ANIO_ACTIVO = "anio_activo"
+
+# Copia por worker del año activo, desligada de toda sesión: (copia o None, instante de carga).
+# Cambia una vez al año, así que se consulta una vez y se invalida al crear, editar o eliminar años.
+_anio_activo_cache: Optional[Tuple[Optional[AnioLectivo], float]] = None
+_anio_activo_lock = threading.Lock()
+_anio_activo_suscrito = False
+# Aumenta con cada invalidación; un valor leído mientras cambió no se guarda
+_anio_activo_generacion = 0
+
+
+def _copia_desligada(anio: AnioLectivo) -> AnioLectivo:
+    copia = AnioLectivo(**{
+        columna.key: getattr(anio, columna.key)
+        for columna in AnioLectivo.__mapper__.column_attrs
+    })
+    make_transient_to_detached(copia)
+    return copia
+
+
+def invalidar_anio_activo() -> None:
+    global _anio_activo_cache, _anio_activo_generacion
+    with _anio_activo_lock:
+        _anio_activo_cache = None
+        _anio_activo_generacion += 1
+
+
+def _suscribir_invalidaciones() -> None:
+    global _anio_activo_suscrito
+    with _anio_activo_lock:
+        if _anio_activo_suscrito:
+            return
+        _anio_activo_suscrito = True
+    obtener_bus().registrar(
+        NOMBRE_CACHE_ANIO_ACTIVO,
+        invalidar=lambda etiquetas: invalidar_anio_activo(),
+        limpiar=invalidar_anio_activo
+    )
+
+
+def _invalidar_anio_activo_al_confirmar(db: Session) -> None:
+    """Descarta el año activo de la petición ya, y el de todos los workers al confirmar"""
+    db.info.pop("anio_activo", None)
+    _suscribir_invalidaciones()
+    obtener_bus().invalidar_al_confirmar(db, NOMBRE_CACHE_ANIO_ACTIVO, ["activo"])
+
+
 def get_anio_lectivo_activo(db: Session) -> Optional[AnioLectivo]:
     """
-    Obtiene el año lectivo activo
+    Obtiene el año lectivo activo.
+    Se guarda por petición (en la sesión) y por worker; las funciones que
+    modifican años lectivos lo invalidan en todos los workers.
     """
-    return db.query(AnioLectivo).filter(AnioLectivo.activo == True).first()
+    if "anio_activo" in db.info:
+        return db.info["anio_activo"]
+
+    _suscribir_invalidaciones()
+    with _anio_activo_lock:
+        entrada, generacion = _anio_activo_cache, _anio_activo_generacion
+    if entrada is None or time.monotonic() - entrada[1] > settings.ANIO_ACTIVO_CACHE_TTL:
+        anio = db.query(AnioLectivo).filter(AnioLectivo.activo == True).first()
+        copia = _copia_desligada(anio) if anio is not None else None
+        _guardar_anio_activo(copia, generacion)
+        db.info["anio_activo"] = anio
+        return anio
 
+    anio = db.merge(entrada[0], load=False) if entrada[0] is not None else None
+    db.info["anio_activo"] = anio
+    return anio
 
-def get_anios_lectivos(db: Session, skip: int = 0, limit: int = 100) -> List[AnioLectivo]:
+
+def _guardar_anio_activo(copia: Optional[AnioLectivo], generacion: int) -> None:
+    global _anio_activo_cache
+    with _anio_activo_lock:
+        if generacion == _anio_activo_generacion:
+            _anio_activo_cache = (copia, time.monotonic())
+
+
+def get_anios_lectivos(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[AnioLectivo], Optional[str]]:
     """
-    Obtiene todos los años lectivos ordenados por fecha de inicio descendente
+    Obtiene los años lectivos ordenados por fecha de inicio descendente
+    y el cursor de la página siguiente
     """
-    return db.query(AnioLectivo).order_by(desc(AnioLectivo.fecha_inicio)).offset(skip).limit(limit).all()
+    orden = [desc(AnioLectivo.fecha_inicio), desc(AnioLectivo.id_anio)]
+    return paginar(db.query(AnioLectivo), orden, limit, cursor=cursor, skip=skip)
 
 
 def create_anio_lectivo(db: Session, anio_lectivo: AnioLectivoCreate) -> AnioLectivo:
     """
     Crea un nuevo año lectivo
     """
-    db_anio_lectivo = AnioLectivo(
+    # Si este año lectivo se marca como activo, desactivar cualquier otro año activo
+    if anio_lectivo.activo:
+        db.query(AnioLectivo).filter(AnioLectivo.activo == True).update({"activo": False})
+    
+    db_anio_lectivo = insertar(
+        db,
+        AnioLectivo,
         nombre=anio_lectivo.nombre,
         fecha_inicio=anio_lectivo.fecha_inicio,
         fecha_fin=anio_lectivo.fecha_fin,
         activo=anio_lectivo.activo
     )
-    
-    # Si este año lectivo se marca como activo, desactivar cualquier otro año activo
-    if anio_lectivo.activo:
-        db.query(AnioLectivo).filter(AnioLectivo.activo == True).update({"activo": False})
-    
-    db.add(db_anio_lectivo)
-    db.commit()
-    db.refresh(db_anio_lectivo)
+    invalidar_al_confirmar(db, "anios_lectivos")
+    _invalidar_anio_activo_al_confirmar(db)
+    db.flush()
     return db_anio_lectivo
 
 
@@ -60,22 +157,20 @@ def update_anio_lectivo(db: Session, id_anio: UUID, anio_lectivo: AnioLectivoUpd
     """
     Actualiza un año lectivo existente
     """
-    db_anio_lectivo = get_anio_lectivo(db, id_anio)
-    if not db_anio_lectivo:
-        return None
-    
     update_data = anio_lectivo.dict(exclude_unset=True)
     
     # Si se está activando este año, desactivar cualquier otro
     if update_data.get("activo") == True:
         db.query(AnioLectivo).filter(AnioLectivo.id_anio != id_anio).filter(AnioLectivo.activo == True).update({"activo": False})
     
-    for key, value in update_data.items():
-        setattr(db_anio_lectivo, key, value)
+    db_anio_lectivo = actualizar(db, AnioLectivo, id_anio, update_data)
+    if not db_anio_lectivo:
+        db.rollback()
+        return None
     
-    db.add(db_anio_lectivo)
-    db.commit()
-    db.refresh(db_anio_lectivo)
+    invalidar_al_confirmar(db, "anios_lectivos")
+    _invalidar_anio_activo_al_confirmar(db)
+    db.flush()
     return db_anio_lectivo
 
 
@@ -88,5 +183,9 @@ def delete_anio_lectivo(db: Session, id_anio: UUID) -> bool:
         return False
     
     db.delete(db_anio_lectivo)
-    db.commit()
+    # Las secciones del año se eliminan en cascada
+    invalidar_al_confirmar(db, "anios_lectivos", "secciones")
+    # Si era el año activo, ningún worker debe seguir sirviéndolo desde su copia
+    _invalidar_anio_activo_al_confirmar(db)
+    db.flush()
     return True
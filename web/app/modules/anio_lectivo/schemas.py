@@ -1,7 +1,7 @@
 from typing import Optional
 from datetime import date
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AnioLectivoBase(BaseModel):
@@ -25,5 +25,4 @@ class AnioLectivoUpdate(BaseModel):
 class AnioLectivo(AnioLectivoBase):
     id_anio: UUID = Field(..., description="ID único del año lectivo")
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
+from app.core.paginacion import paginar
+from app.db.escritura import actualizar, insertar
 from app.modules.avisos import schemas
 from app.modules.avisos.models import Aviso
 
@@ -10,30 +13,33 @@ def get_aviso(db: Session, id_aviso: UUID) -> Optional[Aviso]:
     return db.query(Aviso).filter(Aviso.id_aviso == id_aviso).first()
 
 
-def get_avisos(db: Session, skip: int = 0, limit: int = 100) -> List[Aviso]:
-    return db.query(Aviso).offset(skip).limit(limit).all()
+# Más recientes primero; el ID desempata avisos con la misma fecha
+ORDEN_AVISOS = [desc(Aviso.fecha_envio), desc(Aviso.id_aviso)]
 
 
-def get_avisos_por_destinatario(db: Session, destinatario: str, skip: int = 0, limit: int = 100) -> List[Aviso]:
-    return db.query(Aviso).filter(Aviso.destinatario == destinatario).offset(skip).limit(limit).all()
+def get_avisos(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[Aviso], Optional[str]]:
+    return paginar(db.query(Aviso), ORDEN_AVISOS, limit, cursor=cursor, skip=skip)
+
+
+def get_avisos_por_destinatario(
+    db: Session, destinatario: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[Aviso], Optional[str]]:
+    query = db.query(Aviso).filter(Aviso.destinatario == destinatario)
+    return paginar(query, ORDEN_AVISOS, limit, cursor=cursor, skip=skip)
 
 
 def create_aviso(db: Session, aviso: schemas.AvisoCreate) -> Aviso:
-    db_aviso = Aviso(**aviso.dict())
-    db.add(db_aviso)
-    db.commit()
-    db.refresh(db_aviso)
+    db_aviso = insertar(db, Aviso, **aviso.dict())
+    db.flush()
     return db_aviso
 
 
 def update_aviso(db: Session, id_aviso: UUID, aviso: schemas.AvisoUpdate) -> Optional[Aviso]:
-    db_aviso = get_aviso(db, id_aviso)
+    db_aviso = actualizar(db, Aviso, id_aviso, aviso.dict(exclude_unset=True))
     if db_aviso:
-        update_data = aviso.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_aviso, key, value)
-        db.commit()
-        db.refresh(db_aviso)
+        db.flush()
     return db_aviso
 
 
@@ -41,6 +47,6 @@ def delete_aviso(db: Session, id_aviso: UUID) -> bool:
     db_aviso = get_aviso(db, id_aviso)
     if db_aviso:
         db.delete(db_aviso)
-        db.commit()
+        db.flush()
         return True
     return False
@@ -1,6 +1,6 @@
 from datetime import datetime
 from uuid import UUID, uuid4
-from sqlalchemy import Column, String, Text, DateTime, Enum
+from sqlalchemy import Column, String, Text, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 
 from app.db.base_class import Base
@@ -8,6 +8,9 @@ from app.db.base_class import Base
 
 class Aviso(Base):
     __tablename__ = "aviso"
+    __table_args__ = (
+        Index("ix_aviso_fecha_envio_id", "fecha_envio", "id_aviso"),
+    )
 
     id_aviso = Column(PostgresUUID, primary_key=True, index=True, default=uuid4)
     titulo = Column(String(100), nullable=False)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AvisoBase(BaseModel):
@@ -25,9 +25,9 @@ class AvisoUpdate(BaseModel):
 class Aviso(AvisoBase):
     id_aviso: UUID
 
-    class Config:
-        orm_mode = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id_aviso": "550e8400-e29b-41d4-a716-446655440000",
                 "titulo": "Reunión de padres",
@@ -35,4 +35,5 @@ class Aviso(AvisoBase):
                 "fecha_envio": "2025-06-01T14:00:00",
                 "destinatario": "todos"
             }
-        }
+        },
+    )
@@ -1,8 +1,12 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
+from app.core.campos import Campos, proyectar
+from app.core.paginacion import paginar
+from app.db.escritura import actualizar, insertar
+
 from app.modules.documentos.models import Documento
 from app.modules.documentos.schemas import DocumentoCreate, DocumentoUpdate
 
@@ -14,14 +18,21 @@ def get_documento(db: Session, id_documento: UUID) -> Optional[Documento]:
     return db.query(Documento).filter(Documento.id_documento == id_documento).first()
 
 
+# Más recientes primero; el ID desempata documentos subidos en el mismo instante
+ORDEN_DOCUMENTOS = [Documento.fecha_subida.desc(), Documento.id_documento.desc()]
+
+
 def get_documentos(
     db: Session, 
     skip: int = 0, 
     limit: int = 100, 
-    destinatario: Optional[str] = None
-) -> List[Documento]:
+    destinatario: Optional[str] = None,
+    cursor: Optional[str] = None,
+    campos: Optional[Campos] = None
+) -> Tuple[List[Documento], Optional[str]]:
     """
-    Obtener lista de documentos con filtro opcional por destinatario
+    Obtener lista de documentos con filtro opcional por destinatario,
+    junto con el cursor de la página siguiente. Con `campos` solo se cargan esas columnas
     """
     query = db.query(Documento)
     
@@ -32,7 +43,8 @@ def get_documentos(
             (Documento.destinatario == 'todos')
         )
     
-    return query.order_by(Documento.fecha_subida.desc()).offset(skip).limit(limit).all()
+    query = proyectar(query, Documento, campos, ORDEN_DOCUMENTOS)
+    return paginar(query, ORDEN_DOCUMENTOS, limit, cursor=cursor, skip=skip)
 
 
 def create_documento(
@@ -43,7 +55,10 @@ def create_documento(
     """
     Crear un nuevo documento con enlace
     """
-    db_documento = Documento(
+    # fecha_subida la pone el servidor y vuelve en el RETURNING
+    db_documento = insertar(
+        db,
+        Documento,
         titulo=documento.titulo,
         descripcion=documento.descripcion,
         tipo=documento.tipo,
@@ -51,9 +66,7 @@ def create_documento(
         subido_por=id_usuario,
         destinatario=documento.destinatario
     )
-    db.add(db_documento)
-    db.commit()
-    db.refresh(db_documento)
+    db.flush()
     return db_documento
 
 
@@ -66,15 +79,12 @@ def update_documento(
     Actualizar un documento existente
     """
     obj_data = jsonable_encoder(db_documento)
-    update_data = documento.dict(exclude_unset=True)
-    
-    for field in obj_data:
-        if field in update_data:
-            setattr(db_documento, field, update_data[field])
+    update_data = {
+        field: value for field, value in documento.dict(exclude_unset=True).items() if field in obj_data
+    }
     
-    db.add(db_documento)
-    db.commit()
-    db.refresh(db_documento)
+    db_documento = actualizar(db, Documento, db_documento.id_documento, update_data)
+    db.flush()
     return db_documento
 
 
@@ -83,5 +93,5 @@ def delete_documento(db: Session, db_documento: Documento) -> Documento:
     Eliminar un documento
     """
     db.delete(db_documento)
-    db.commit()
+    db.flush()
     return db_documento
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, String, Text, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -8,6 +8,9 @@ import uuid
 
 class Documento(Base):
     __tablename__ = "documento"
+    __table_args__ = (
+        Index("ix_documento_fecha_subida_id", "fecha_subida", "id_documento"),
+    )
 
     id_documento = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     titulo = Column(String(100), nullable=False)
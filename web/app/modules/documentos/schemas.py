@@ -1,5 +1,5 @@
 from typing import Optional, List
-from pydantic import BaseModel, UUID4, HttpUrl
+from pydantic import BaseModel, ConfigDict, UUID4, HttpUrl
 from datetime import datetime
 from enum import Enum
 
@@ -44,12 +44,10 @@ class DocumentoOut(DocumentoBase):
     fecha_subida: datetime
     subido_por: Optional[UUID4] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DocumentoList(BaseModel):
     documentos: List[DocumentoOut]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
@@ -2,9 +2,13 @@ from typing import List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
 
+from app.core.paginacion import paginar
+from app.db.cargadores import obtener_cargador
+from app.db.escritura import actualizar, insertar
 from app.modules.estudiantes.models import Estudiante, Matricula
 from app.modules.estudiantes.schemas import EstudianteCreate, EstudianteUpdate
 from app.modules.usuarios.models import Usuario
+from app.modules.usuarios.autorizacion import invalidar_relaciones_al_confirmar
 from app.modules.usuarios.schemas import UsuarioCreate
 from app.core.security import hashear_password
 from app.modules.anio_lectivo.crud import get_anio_lectivo_activo
@@ -12,37 +16,49 @@ from app.core.utils import generar_correo_padre, generar_contrasena_segura
 
 
 def get_estudiante(db: Session, id_estudiante: UUID) -> Optional[Estudiante]:
-    return db.query(Estudiante).filter(Estudiante.id_estudiante == id_estudiante).first()
+    return obtener_cargador(db, Estudiante).cargar(id_estudiante)
 
 
-def get_estudiantes(db: Session, skip: int = 0, limit: int = 100) -> List[Estudiante]:
-    # Obtener todos los estudiantes
-    estudiantes = db.query(Estudiante).offset(skip).limit(limit).all()
+# Orden alfabético por apellidos y nombre; el ID desempata
+ORDEN_ESTUDIANTES = [
+    Estudiante.primer_apellido,
+    Estudiante.segundo_apellido,
+    Estudiante.nombre,
+    Estudiante.id_estudiante
+]
+
+
+def get_estudiantes(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[Estudiante], Optional[str]]:
+    # Obtener la página de estudiantes
+    estudiantes, next_cursor = paginar(db.query(Estudiante), ORDEN_ESTUDIANTES, limit, cursor=cursor, skip=skip)
     
     # Para cada estudiante, buscar su matrícula actual y la sección correspondiente
     from app.modules.estudiantes.models import Matricula
-    from app.modules.secciones.models import Seccion
     from app.modules.anio_lectivo.crud import get_anio_lectivo_activo
     
     # Obtener el año lectivo activo
     anio_activo = get_anio_lectivo_activo(db)
     
-    if anio_activo:
-        for estudiante in estudiantes:
-            # Buscar la matrícula del estudiante en el año activo
-            matricula = db.query(Matricula).filter(
-                Matricula.id_estudiante == estudiante.id_estudiante,
+    if anio_activo and estudiantes:
+        # Matrículas de la página en el año activo, con su sección, en una sola consulta
+        matriculas = {
+            matricula.id_estudiante: matricula
+            for matricula in db.query(Matricula).filter(
+                Matricula.id_estudiante.in_([estudiante.id_estudiante for estudiante in estudiantes]),
                 Matricula.id_anio == anio_activo.id_anio
-            ).first()
-            
+            )
+        }
+        
+        # Matricula.seccion viene en la misma consulta (lazy="joined")
+        for estudiante in estudiantes:
+            matricula = matriculas.get(estudiante.id_estudiante)
             if matricula:
-                # Si tiene matrícula, buscar la información de la sección
-                seccion = db.query(Seccion).filter(Seccion.id_seccion == matricula.id_seccion).first()
-                if seccion:
-                    # Añadir la información de la sección al objeto estudiante
-                    setattr(estudiante, "seccion", seccion)
+                # Añadir la información de la sección al objeto estudiante
+                setattr(estudiante, "seccion", matricula.seccion)
     
-    return estudiantes
+    return estudiantes, next_cursor
 
 
 def get_estudiante_by_cedula(db: Session, cedula: str) -> Optional[Estudiante]:
@@ -63,16 +79,18 @@ def create_estudiante_with_padre(db: Session, estudiante: EstudianteCreate) -> t
     
     hashed_password = hashear_password(usuario_padre.contrasena)
     
-    db_usuario = Usuario(
+    db_usuario = insertar(
+        db,
+        Usuario,
         nombre=usuario_padre.nombre,
         correo=usuario_padre.correo,
         contrasena_hash=hashed_password,
         rol=usuario_padre.rol
     )
-    db.add(db_usuario)
-    db.flush()
     
-    db_estudiante = Estudiante(
+    db_estudiante = insertar(
+        db,
+        Estudiante,
         cedula=estudiante.cedula,
         nombre=estudiante.nombre,
         primer_apellido=estudiante.primer_apellido,
@@ -80,8 +98,7 @@ def create_estudiante_with_padre(db: Session, estudiante: EstudianteCreate) -> t
         id_padre=db_usuario.id_usuario,
         id_seccion=estudiante.id_seccion
     )
-    db.add(db_estudiante)
-    db.flush()
+    invalidar_relaciones_al_confirmar(db, db_usuario.id_usuario)
     
     # Crear matrícula si hay sección asignada y hay un año lectivo activo
     if estudiante.id_seccion:
@@ -94,8 +111,7 @@ def create_estudiante_with_padre(db: Session, estudiante: EstudianteCreate) -> t
             )
             db.add(db_matricula)
     
-    db.commit()
-    db.refresh(db_estudiante)
+    db.flush()
     
     return db_estudiante, correo_padre, contrasena_padre
 
@@ -109,16 +125,13 @@ def update_estudiante(db: Session, id_estudiante: UUID, estudiante: EstudianteUp
     if not db_estudiante:
         return None
     
-    # Actualizar los campos del estudiante
-    estudiante_data = estudiante.dict(exclude_unset=True)
-    for key, value in estudiante_data.items():
-        setattr(db_estudiante, key, value)
+    # Actualizar los campos del estudiante (la sección incluida, si se envió)
+    id_padre_anterior = db_estudiante.id_padre
+    db_estudiante = actualizar(db, Estudiante, id_estudiante, estudiante.dict(exclude_unset=True))
+    invalidar_relaciones_al_confirmar(db, id_padre_anterior, db_estudiante.id_padre)
     
     # Si se proporciona una sección, actualizar o crear la matrícula
     if estudiante.id_seccion is not None:
-        # Actualizar la sección en el estudiante
-        db_estudiante.id_seccion = estudiante.id_seccion
-        
         # Obtener el año lectivo activo
         anio_activo = get_anio_lectivo_activo(db)
         if anio_activo:
@@ -140,8 +153,7 @@ def update_estudiante(db: Session, id_estudiante: UUID, estudiante: EstudianteUp
                 )
                 db.add(nueva_matricula)
     
-    db.commit()
-    db.refresh(db_estudiante)
+    db.flush()
     return db_estudiante
 
 
@@ -151,6 +163,7 @@ def delete_estudiante(db: Session, id_estudiante: UUID) -> Optional[Estudiante]:
     if not db_estudiante:
         return None
     
+    invalidar_relaciones_al_confirmar(db, db_estudiante.id_padre)
     db.delete(db_estudiante)
-    db.commit()
+    db.flush()
     return db_estudiante
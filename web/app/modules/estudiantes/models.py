@@ -1,12 +1,16 @@
 import uuid
 from datetime import date
-from sqlalchemy import Column, String, ForeignKey, Date, UniqueConstraint, Text
+from sqlalchemy import Column, String, ForeignKey, Date, UniqueConstraint, Text, Index
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
 
 class Estudiante(Base):
     __tablename__ = "estudiante"
+    __table_args__ = (
+        Index("ix_estudiante_apellidos_nombre_id", "primer_apellido", "segundo_apellido", "nombre", "id_estudiante"),
+    )
     id_estudiante = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     cedula = Column(String(20), nullable=False, unique=True)
     nombre = Column(String(50), nullable=False)
@@ -15,6 +19,12 @@ class Estudiante(Base):
     id_padre = Column(PostgresUUID(as_uuid=True), ForeignKey("usuario.id_usuario", ondelete="SET NULL"), nullable=True)
     id_seccion = Column(PostgresUUID(as_uuid=True), ForeignKey("seccion.id_seccion", ondelete="SET NULL"), nullable=True)
 
+    # Carga explícita (joinedload/selectinload) en cada consulta que los use; un acceso
+    # sin cargar lanza error en lugar de hacer una consulta por estudiante.
+    # La sección del año activo se asigna aparte como atributo `seccion` en get_estudiantes.
+    padre = relationship("Usuario", back_populates="hijos", lazy="raise")
+    matriculas = relationship("Matricula", back_populates="estudiante", lazy="raise", passive_deletes=True)
+
 
 class Matricula(Base):
     __tablename__ = "matricula"
@@ -23,6 +33,10 @@ class Matricula(Base):
     id_seccion = Column(PostgresUUID(as_uuid=True), ForeignKey("seccion.id_seccion", ondelete="CASCADE"), nullable=False)
     id_anio = Column(PostgresUUID(as_uuid=True), ForeignKey("anio_lectivo.id_anio"), nullable=False)
     fecha_matricula = Column(Date, default=date.today)
+
+    estudiante = relationship("Estudiante", back_populates="matriculas", lazy="raise")
+    # Siempre se usa junto con la matrícula: en la misma consulta
+    seccion = relationship("Seccion", lazy="joined", innerjoin=True)
     
     __table_args__ = (UniqueConstraint('id_estudiante', 'id_anio', name='uq_estudiante_anio'),)
 
@@ -37,6 +51,8 @@ class Asistencia(Base):
     estado = Column(String(20), nullable=False)  # Presente, Ausente, Justificado, etc.
     comentario = Column(Text, nullable=True)
 
+    materia = relationship("Materia", lazy="joined", innerjoin=True)
+
 
 class Nota(Base):
     __tablename__ = "nota"
@@ -47,3 +63,5 @@ class Nota(Base):
     trimestre = Column(String(20), nullable=False)  # Primer trimestre, Segundo trimestre, etc.
     valor = Column(String(10), nullable=False)  # Calificación (puede ser numérica o alfabética)
     descripcion = Column(Text, nullable=True)  # Descripción o comentario sobre la nota
+
+    materia = relationship("Materia", lazy="joined", innerjoin=True)
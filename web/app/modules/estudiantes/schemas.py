@@ -1,7 +1,7 @@
 from typing import Optional
 from uuid import UUID
 from datetime import date
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class EstudianteBase(BaseModel):
@@ -31,8 +31,7 @@ class SeccionInfo(BaseModel):
     nombre: str
     grado: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Estudiante(EstudianteBase):
     id_estudiante: UUID
@@ -40,9 +39,9 @@ class Estudiante(EstudianteBase):
     id_seccion: Optional[UUID] = None
     seccion: Optional[SeccionInfo] = None
 
-    class Config:
-        orm_mode = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id_estudiante": "550e8400-e29b-41d4-a716-446655440000",
                 "cedula": "1-1234-5678",
@@ -56,7 +55,8 @@ class Estudiante(EstudianteBase):
                     "grado": "Primero"
                 }
             }
-        }
+        },
+    )
 
 
 class EstudianteWithCredentials(Estudiante):
@@ -66,9 +66,9 @@ class EstudianteWithCredentials(Estudiante):
     id_seccion: Optional[UUID] = None
     id_anio: Optional[UUID] = None
 
-    class Config:
-        orm_mode = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id_estudiante": "550e8400-e29b-41d4-a716-446655440000",
                 "cedula": "1-1234-5678",
@@ -79,7 +79,8 @@ class EstudianteWithCredentials(Estudiante):
                 "correo_padre": "jperez1234@escmanuela.ed.cr",
                 "contrasena_padre": "Abc123!xy"
             }
-        }
+        },
+    )
 
 
 class Matricula(BaseModel):
@@ -89,5 +90,4 @@ class Matricula(BaseModel):
     id_anio: UUID
     fecha_matricula: date
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,77 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.cache_paginas import purgar_paginas_al_confirmar
+from app.core.paginacion import paginar
+from app.db.escritura import actualizar, insertar
+
+from app.modules.eventos.models import Evento
+from app.modules.eventos.schemas import EventoCreate, EventoUpdate
+
+# Clave sustituta de las páginas públicas que muestran eventos (portada)
+CLAVE_PAGINAS = "eventos"
+
+# Los más próximos primero; el ID desempata eventos a la misma hora
+ORDEN_EVENTOS = [Evento.fecha_hora.asc(), Evento.id_evento.asc()]
+
+
+def get_evento(db: Session, id_evento: UUID) -> Optional[Evento]:
+    """
+    Obtener un evento por su ID
+    """
+    return db.query(Evento).filter(Evento.id_evento == id_evento).first()
+
+
+def get_eventos(
+    db: Session,
+    skip: int = 0,
+    limit: Optional[int] = 100,
+    cursor: Optional[str] = None,
+    solo_publicos: bool = False,
+    solo_proximos: bool = False
+) -> Tuple[List[Evento], Optional[str]]:
+    """
+    Eventos en orden cronológico, con el cursor de la página siguiente. `solo_publicos`
+    deja los dirigidos a todos y `solo_proximos` los que no han pasado
+    """
+    query = db.query(Evento)
+    if solo_publicos:
+        query = query.filter(Evento.destinatario == "todos")
+    if solo_proximos:
+        # Sin caché de consultas: el resultado cambia con el paso del tiempo sin que ninguna
+        # escritura lo invalide (en la portada lo cubre la caché de páginas)
+        query = query.filter(Evento.fecha_hora >= func.now())
+    else:
+        query = query.execution_options(cache_consulta="feed_eventos")
+    return paginar(query, ORDEN_EVENTOS, limit, cursor=cursor, skip=skip)
+
+
+def create_evento(db: Session, evento: EventoCreate) -> Evento:
+    """
+    Crear un evento; las páginas públicas que lo muestran se purgan al confirmar
+    """
+    db_evento = insertar(db, Evento, **evento.dict())
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_evento
+
+
+def update_evento(db: Session, id_evento: UUID, evento: EventoUpdate) -> Optional[Evento]:
+    """
+    Actualizar un evento existente; None si no existe
+    """
+    db_evento = actualizar(db, Evento, id_evento, evento.dict(exclude_unset=True))
+    if db_evento is not None:
+        purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_evento
+
+
+def delete_evento(db: Session, db_evento: Evento) -> Evento:
+    """
+    Eliminar un evento
+    """
+    db.delete(db_evento)
+    db.flush()
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_evento
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Text, TIMESTAMP, Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base_class import Base
+import uuid
+
+
+class Evento(Base):
+    __tablename__ = "evento"
+    __table_args__ = (
+        Index("ix_evento_fecha_hora_id", "fecha_hora", "id_evento"),
+    )
+
+    id_evento = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    titulo = Column(String(100), nullable=False)
+    descripcion = Column(Text, nullable=False)
+    fecha_hora = Column(TIMESTAMP, nullable=False)
+    destinatario = Column(String(20), default="todos")  # todos o para mi
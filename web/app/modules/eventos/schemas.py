@@ -0,0 +1,36 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class DestinatarioEventoEnum(str, Enum):
+    TODOS = "todos"
+    PARA_MI = "para mi"
+
+
+class EventoBase(BaseModel):
+    titulo: str = Field(..., min_length=1, max_length=100, description="Título del evento")
+    descripcion: str = Field(..., min_length=1, description="Descripción del evento")
+    fecha_hora: datetime = Field(..., description="Fecha y hora del evento")
+    destinatario: DestinatarioEventoEnum = Field(
+        DestinatarioEventoEnum.TODOS, description="Solo los eventos para todos se muestran en el sitio público"
+    )
+
+
+class EventoCreate(EventoBase):
+    pass
+
+
+class EventoUpdate(BaseModel):
+    titulo: Optional[str] = Field(None, min_length=1, max_length=100, description="Título del evento")
+    descripcion: Optional[str] = Field(None, min_length=1, description="Descripción del evento")
+    fecha_hora: Optional[datetime] = Field(None, description="Fecha y hora del evento")
+    destinatario: Optional[DestinatarioEventoEnum] = None
+
+
+class EventoOut(EventoBase):
+    id_evento: UUID
+
+    model_config = ConfigDict(from_attributes=True)
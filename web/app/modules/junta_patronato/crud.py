@@ -0,0 +1,125 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+
+from app.core.cache_paginas import purgar_paginas_al_confirmar
+from app.core.paginacion import paginar
+from app.db.escritura import actualizar, insertar
+
+from app.modules.junta_patronato.models import CuentaDonacion, InformeJuntaPatronato, MiembroJuntaPatronato
+from app.modules.junta_patronato.schemas import (
+    CuentaDonacionCreate,
+    CuentaDonacionUpdate,
+    InformeCreate,
+    MiembroCreate,
+    MiembroUpdate,
+)
+
+# Clave sustituta de la página pública /junta-patronato
+CLAVE_PAGINAS = "junta_patronato"
+
+ORDEN_MIEMBROS = [MiembroJuntaPatronato.tipo, MiembroJuntaPatronato.nombre, MiembroJuntaPatronato.id_miembro]
+# Más recientes primero; el ID desempata informes subidos en el mismo instante
+ORDEN_INFORMES = [InformeJuntaPatronato.fecha_subida.desc(), InformeJuntaPatronato.id_informe.desc()]
+
+
+# Miembros
+
+def get_miembro(db: Session, id_miembro: UUID) -> Optional[MiembroJuntaPatronato]:
+    return db.query(MiembroJuntaPatronato).filter(MiembroJuntaPatronato.id_miembro == id_miembro).first()
+
+
+def get_miembros(db: Session, tipo: Optional[str] = None) -> List[MiembroJuntaPatronato]:
+    """
+    Miembros de la junta y del patronato (o solo de `tipo`), por tipo y nombre
+    """
+    query = db.query(MiembroJuntaPatronato)
+    if tipo:
+        query = query.filter(MiembroJuntaPatronato.tipo == tipo)
+    return query.order_by(*ORDEN_MIEMBROS).execution_options(cache_consulta="miembros_junta_patronato").all()
+
+
+def create_miembro(db: Session, miembro: MiembroCreate) -> MiembroJuntaPatronato:
+    db_miembro = insertar(db, MiembroJuntaPatronato, **miembro.dict())
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_miembro
+
+
+def update_miembro(db: Session, id_miembro: UUID, miembro: MiembroUpdate) -> Optional[MiembroJuntaPatronato]:
+    db_miembro = actualizar(db, MiembroJuntaPatronato, id_miembro, miembro.dict(exclude_unset=True))
+    if db_miembro is not None:
+        purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_miembro
+
+
+def delete_miembro(db: Session, db_miembro: MiembroJuntaPatronato) -> MiembroJuntaPatronato:
+    db.delete(db_miembro)
+    db.flush()
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_miembro
+
+
+# Informes
+
+def get_informe(db: Session, id_informe: UUID) -> Optional[InformeJuntaPatronato]:
+    return db.query(InformeJuntaPatronato).filter(InformeJuntaPatronato.id_informe == id_informe).first()
+
+
+def get_informes(
+    db: Session,
+    skip: int = 0,
+    limit: Optional[int] = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[InformeJuntaPatronato], Optional[str]]:
+    """
+    Informes publicados, más recientes primero, con el cursor de la página siguiente
+    """
+    query = db.query(InformeJuntaPatronato).execution_options(cache_consulta="feed_informes_junta_patronato")
+    return paginar(query, ORDEN_INFORMES, limit, cursor=cursor, skip=skip)
+
+
+def create_informe(db: Session, informe: InformeCreate) -> InformeJuntaPatronato:
+    # fecha_subida la pone el servidor y vuelve en el RETURNING
+    db_informe = insertar(db, InformeJuntaPatronato, **informe.dict())
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_informe
+
+
+def delete_informe(db: Session, db_informe: InformeJuntaPatronato) -> InformeJuntaPatronato:
+    db.delete(db_informe)
+    db.flush()
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_informe
+
+
+# Cuentas de donación
+
+def get_cuenta_donacion(db: Session, id_cuenta: UUID) -> Optional[CuentaDonacion]:
+    return db.query(CuentaDonacion).filter(CuentaDonacion.id_cuenta == id_cuenta).first()
+
+
+def get_cuentas_donacion(db: Session, solo_activas: bool = False) -> List[CuentaDonacion]:
+    query = db.query(CuentaDonacion)
+    if solo_activas:
+        query = query.filter(CuentaDonacion.activa.is_(True))
+    return query.order_by(CuentaDonacion.id_cuenta).execution_options(cache_consulta="cuentas_donacion").all()
+
+
+def create_cuenta_donacion(db: Session, cuenta: CuentaDonacionCreate) -> CuentaDonacion:
+    db_cuenta = insertar(db, CuentaDonacion, **cuenta.dict())
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_cuenta
+
+
+def update_cuenta_donacion(db: Session, id_cuenta: UUID, cuenta: CuentaDonacionUpdate) -> Optional[CuentaDonacion]:
+    db_cuenta = actualizar(db, CuentaDonacion, id_cuenta, cuenta.dict(exclude_unset=True))
+    if db_cuenta is not None:
+        purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_cuenta
+
+
+def delete_cuenta_donacion(db: Session, db_cuenta: CuentaDonacion) -> CuentaDonacion:
+    db.delete(db_cuenta)
+    db.flush()
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_cuenta
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, String, Text, TIMESTAMP, Boolean, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+import uuid
+
+
+class MiembroJuntaPatronato(Base):
+    __tablename__ = "junta_patronato"
+
+    id_miembro = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    nombre = Column(String(100), nullable=False)
+    puesto = Column(String(100), nullable=False)
+    foto = Column(Text, nullable=True)  # Enlace a la foto
+    tipo = Column(String(20), nullable=False)  # junta o patronato
+
+
+class InformeJuntaPatronato(Base):
+    __tablename__ = "informe_junta_patronato"
+    __table_args__ = (
+        Index("ix_informe_junta_patronato_fecha_subida_id", "fecha_subida", "id_informe"),
+    )
+
+    id_informe = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id_miembro = Column(UUID(as_uuid=True), ForeignKey("junta_patronato.id_miembro", ondelete="CASCADE"), nullable=True)
+    titulo = Column(String(100), nullable=False)
+    archivo = Column(Text, nullable=False)  # Enlace al informe (Google Drive, OneDrive, etc.)
+    fecha_subida = Column(TIMESTAMP, server_default=func.now())
+
+
+class CuentaDonacion(Base):
+    __tablename__ = "cuenta_donacion"
+
+    id_cuenta = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    descripcion = Column(Text, nullable=True)
+    numero_cuenta = Column(String(30), nullable=True)
+    sinpe = Column(String(30), nullable=True)
+    activa = Column(Boolean, default=True)
@@ -0,0 +1,71 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class TipoMiembroEnum(str, Enum):
+    JUNTA = "junta"
+    PATRONATO = "patronato"
+
+
+class MiembroBase(BaseModel):
+    nombre: str = Field(..., min_length=1, max_length=100, description="Nombre completo")
+    puesto: str = Field(..., min_length=1, max_length=100, description="Puesto (presidente, tesorero, ...)")
+    foto: Optional[str] = Field(None, description="Enlace a la foto")
+    tipo: TipoMiembroEnum
+
+
+class MiembroCreate(MiembroBase):
+    pass
+
+
+class MiembroUpdate(BaseModel):
+    nombre: Optional[str] = Field(None, min_length=1, max_length=100)
+    puesto: Optional[str] = Field(None, min_length=1, max_length=100)
+    foto: Optional[str] = None
+    tipo: Optional[TipoMiembroEnum] = None
+
+
+class MiembroOut(MiembroBase):
+    id_miembro: UUID
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class InformeCreate(BaseModel):
+    titulo: str = Field(..., min_length=1, max_length=100, description="Título del informe")
+    archivo: str = Field(..., description="Enlace al informe (Google Drive, OneDrive, etc.)")
+    id_miembro: Optional[UUID] = Field(None, description="Miembro que presenta el informe")
+
+
+class InformeOut(InformeCreate):
+    id_informe: UUID
+    fecha_subida: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CuentaDonacionBase(BaseModel):
+    descripcion: Optional[str] = None
+    numero_cuenta: Optional[str] = Field(None, max_length=30)
+    sinpe: Optional[str] = Field(None, max_length=30)
+    activa: bool = True
+
+
+class CuentaDonacionCreate(CuentaDonacionBase):
+    pass
+
+
+class CuentaDonacionUpdate(BaseModel):
+    descripcion: Optional[str] = None
+    numero_cuenta: Optional[str] = Field(None, max_length=30)
+    sinpe: Optional[str] = Field(None, max_length=30)
+    activa: Optional[bool] = None
+
+
+class CuentaDonacionOut(CuentaDonacionBase):
+    id_cuenta: UUID
+
+    model_config = ConfigDict(from_attributes=True)
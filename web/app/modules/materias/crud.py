@@ -1,50 +1,63 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Tuple, Union
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import select, join
 from fastapi.encoders import jsonable_encoder
 
+from app.core.paginacion import paginar
+from app.core.cache_http import invalidar_al_confirmar
+from app.db.cargadores import obtener_cargador
+from app.db.escritura import actualizar, insertar
+from app.db.snapshot_referencia import MateriaRef, obtener_snapshot
+
 from app.modules.materias.models import Materia
 from app.modules.materias.models_profesor_materia import ProfesorMateria
 from app.modules.materias.schemas import MateriaCreate, MateriaUpdate
 from app.modules.usuarios.models import Usuario, Profesor
+from app.modules.profesores.schemas import ProfesorFila
 
 
 def get_materia(db: Session, id_materia: UUID) -> Optional[Materia]:
-    return db.query(Materia).filter(Materia.id_materia == id_materia).first()
+    return obtener_cargador(db, Materia, cache_consulta="get_materia").cargar(id_materia)
 
 
 def get_materia_by_nombre(db: Session, nombre: str) -> Optional[Materia]:
+    # Sin caché: valida nombres únicos dentro de la transacción de escritura
     return db.query(Materia).filter(Materia.nombre == nombre).first()
 
 
-def get_materias(db: Session, skip: int = 0, limit: int = 100) -> List[Materia]:
-    return db.query(Materia).offset(skip).limit(limit).all()
+def get_materia_ref(db: Session, id_materia: UUID) -> Optional[Union[MateriaRef, Materia]]:
+    """Materia de solo lectura desde el snapshot compartido; sin snapshot, desde la base de datos"""
+    snapshot = obtener_snapshot()
+    if snapshot is None:
+        return get_materia(db, id_materia)
+    return snapshot.materia(id_materia)
+
+
+# Orden alfabético; el ID desempata
+ORDEN_MATERIAS = [Materia.nombre, Materia.id_materia]
+
+
+def get_materias(
+    db: Session, skip: int = 0, limit: Optional[int] = 100, cursor: Optional[str] = None
+) -> Tuple[List[Materia], Optional[str]]:
+    return paginar(db.query(Materia), ORDEN_MATERIAS, limit, cursor=cursor, skip=skip)
 
 
 def create_materia(db: Session, materia: MateriaCreate) -> Materia:
-    db_materia = Materia(
-        nombre=materia.nombre
-    )
-    db.add(db_materia)
-    db.commit()
-    db.refresh(db_materia)
+    db_materia = insertar(db, Materia, nombre=materia.nombre)
+    invalidar_al_confirmar(db, "materias")
+    db.flush()
     return db_materia
 
 
 def update_materia(db: Session, id_materia: UUID, materia_in: MateriaUpdate) -> Optional[Materia]:
-    db_materia = get_materia(db, id_materia)
+    db_materia = actualizar(db, Materia, id_materia, materia_in.dict(exclude_unset=True))
     if not db_materia:
         return None
     
-    update_data = materia_in.dict(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        setattr(db_materia, field, value)
-    
-    db.add(db_materia)
-    db.commit()
-    db.refresh(db_materia)
+    invalidar_al_confirmar(db, "materias")
+    db.flush()
     return db_materia
 
 
@@ -54,34 +67,22 @@ def delete_materia(db: Session, id_materia: UUID) -> Optional[Materia]:
         return None
         
     db.delete(db_materia)
-    db.commit()
+    invalidar_al_confirmar(db, "materias")
+    db.flush()
     
     return db_materia
 
 
-def get_profesores_by_materia(db: Session, id_materia: UUID) -> List[Dict[str, Any]]:
+def get_profesores_by_materia(db: Session, id_materia: UUID) -> List[ProfesorFila]:
     db_materia = get_materia(db, id_materia=id_materia)
     if db_materia is None:
         return []
     
-    query = (
-        db.query(
-            Usuario.id_usuario.label('id_profesor'),
-            Usuario.nombre,
-            Usuario.correo
-        )
-        .join(Profesor, Profesor.id_profesor == Usuario.id_usuario)
-        .join(ProfesorMateria, ProfesorMateria.id_profesor == Profesor.id_profesor)
-        .filter(ProfesorMateria.id_materia == id_materia)
+    consulta = (
+        select(Usuario.id_usuario, Usuario.nombre, Usuario.correo)
+        .join(Usuario.profesor)
+        .join(Profesor.materias)
+        .where(ProfesorMateria.id_materia == id_materia)
     )
     
-    profesores = []
-    for row in query.all():
-        profesor = {
-            "id_profesor": row.id_profesor,
-            "nombre": row.nombre,
-            "correo": row.correo
-        }
-        profesores.append(profesor)
-    
-    return profesores
+    return [ProfesorFila(*fila) for fila in db.execute(consulta)]
@@ -10,3 +10,7 @@ class ProfesorMateria(Base):
     id_profesor = Column(PostgresUUID(as_uuid=True), ForeignKey("profesor.id_profesor", ondelete="CASCADE"), primary_key=True)
     id_materia = Column(PostgresUUID(as_uuid=True), ForeignKey("materia.id_materia", ondelete="CASCADE"), primary_key=True)
     id_anio = Column(PostgresUUID(as_uuid=True), ForeignKey("anio_lectivo.id_anio"), primary_key=True)
+
+    profesor = relationship("Profesor", back_populates="materias", lazy="raise")
+    materia = relationship("Materia", lazy="joined", innerjoin=True)
+    anio_lectivo = relationship("AnioLectivo", lazy="joined", innerjoin=True)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 
 class MateriaBase(BaseModel):
     nombre: str = Field(..., min_length=1, max_length=100, description="Nombre de la materia")
@@ -19,29 +19,29 @@ class ProfesorBase(BaseModel):
     nombre: str
     correo: EmailStr
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Materia(MateriaBase):
     id_materia: UUID
 
-    class Config:
-        orm_mode = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id_materia": "550e8400-e29b-41d4-a716-446655440000",
                 "nombre": "Matemáticas"
             }
-        }
+        },
+    )
 
 
 class MateriaConProfesores(Materia):
     profesores: List[ProfesorBase] = []
 
-    class Config:
-        orm_mode = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id_materia": "550e8400-e29b-41d4-a716-446655440000",
                 "nombre": "Matemáticas",
@@ -53,4 +53,5 @@ class MateriaConProfesores(Materia):
                     }
                 ]
             }
-        }
+        },
+    )
@@ -0,0 +1,72 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+
+from app.core.cache_paginas import purgar_paginas_al_confirmar
+from app.core.paginacion import paginar
+from app.db.escritura import actualizar, insertar
+
+from app.modules.noticias.models import Noticia
+from app.modules.noticias.schemas import NoticiaCreate, NoticiaUpdate
+
+# Clave sustituta de las páginas públicas que muestran noticias (portada y /noticias)
+CLAVE_PAGINAS = "noticias"
+
+# Más recientes primero; el ID desempata noticias publicadas en el mismo instante
+ORDEN_NOTICIAS = [Noticia.fecha_publicacion.desc(), Noticia.id_noticia.desc()]
+
+
+def get_noticia(db: Session, id_noticia: UUID) -> Optional[Noticia]:
+    """
+    Obtener una noticia por su ID
+    """
+    return db.query(Noticia).filter(Noticia.id_noticia == id_noticia).first()
+
+
+def get_noticias(
+    db: Session,
+    skip: int = 0,
+    limit: Optional[int] = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[Noticia], Optional[str]]:
+    """
+    Feed de noticias, más recientes primero, con el cursor de la página siguiente.
+    Cada página pasa por la caché de consultas: se invalida sola al escribir en la tabla
+    """
+    query = db.query(Noticia).execution_options(cache_consulta="feed_noticias")
+    return paginar(query, ORDEN_NOTICIAS, limit, cursor=cursor, skip=skip)
+
+
+def create_noticia(db: Session, noticia: NoticiaCreate, id_usuario: UUID) -> Noticia:
+    """
+    Publicar una noticia; las páginas públicas que la muestran se purgan al confirmar
+    """
+    # fecha_publicacion la pone el servidor y vuelve en el RETURNING
+    db_noticia = insertar(
+        db,
+        Noticia,
+        titulo=noticia.titulo,
+        contenido=noticia.contenido,
+        publicada_por=id_usuario
+    )
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_noticia
+
+
+def update_noticia(db: Session, db_noticia: Noticia, noticia: NoticiaUpdate) -> Noticia:
+    """
+    Actualizar una noticia existente
+    """
+    db_noticia = actualizar(db, Noticia, db_noticia.id_noticia, noticia.dict(exclude_unset=True))
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_noticia
+
+
+def delete_noticia(db: Session, db_noticia: Noticia) -> Noticia:
+    """
+    Eliminar una noticia
+    """
+    db.delete(db_noticia)
+    db.flush()
+    purgar_paginas_al_confirmar(db, CLAVE_PAGINAS)
+    return db_noticia
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Text, TIMESTAMP, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+import uuid
+
+
+class Noticia(Base):
+    __tablename__ = "noticia"
+    __table_args__ = (
+        Index("ix_noticia_fecha_publicacion_id", "fecha_publicacion", "id_noticia"),
+    )
+
+    id_noticia = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    titulo = Column(String(100), nullable=False)
+    contenido = Column(Text, nullable=False)
+    fecha_publicacion = Column(TIMESTAMP, server_default=func.now())
+    publicada_por = Column(UUID(as_uuid=True), ForeignKey("usuario.id_usuario", ondelete="SET NULL"), nullable=True)
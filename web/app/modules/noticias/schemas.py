@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class NoticiaBase(BaseModel):
+    titulo: str = Field(..., min_length=1, max_length=100, description="Título de la noticia")
+    contenido: str = Field(..., min_length=1, description="Contenido de la noticia")
+
+
+class NoticiaCreate(NoticiaBase):
+    pass
+
+
+class NoticiaUpdate(BaseModel):
+    titulo: Optional[str] = Field(None, min_length=1, max_length=100, description="Título de la noticia")
+    contenido: Optional[str] = Field(None, min_length=1, description="Contenido de la noticia")
+
+
+class NoticiaOut(NoticiaBase):
+    id_noticia: UUID
+    fecha_publicacion: datetime
+    publicada_por: Optional[UUID] = None
+
+    model_config = ConfigDict(from_attributes=True)
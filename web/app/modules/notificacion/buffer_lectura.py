@@ -0,0 +1,123 @@
+"""
+Buffer write-behind de marcas de lectura.
+
+Al abrir el panel de notificaciones el frontend envía una ráfaga de
+`marcar-como-leida`. Cada worker junta esas marcas durante una ventana corta
+y las escribe con un UPDATE por usuario y un solo commit; cada petición espera
+al commit de su lote, así que ninguna marca confirmada al cliente se pierde.
+Mientras tanto las lecturas del mismo usuario ven las marcas pendientes, también
+las del lote que se está escribiendo hasta que su commit termina.
+"""
+import asyncio
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.configs import settings
+from app.db.session import SessionLocal
+from app.modules.notificacion import crud
+from app.modules.notificacion.models import Notificacion
+
+Lote = Dict[UUID, Dict[UUID, List[asyncio.Future]]]
+
+
+class BufferLecturas:
+    def __init__(self, ventana: float):
+        self._ventana = ventana
+        self._lote: Lote = {}
+        # Lotes que se están escribiendo: siguen siendo pendientes hasta su commit
+        self._en_vuelo: List[Lote] = []
+        self._tarea: Optional[asyncio.Task] = None
+        # Protege el lote para consultas de lectura desde hilos del threadpool
+        self._lock = threading.Lock()
+
+    def pendientes(self, id_usuario: UUID) -> Set[UUID]:
+        """IDs marcados como leídos por el usuario que aún no se han escrito"""
+        with self._lock:
+            ids = set(self._lote.get(id_usuario, ()))
+            for lote in self._en_vuelo:
+                ids.update(lote.get(id_usuario, ()))
+            return ids
+
+    async def marcar(self, id_usuario: UUID, id_notificacion: UUID) -> Optional[Notificacion]:
+        """Encola la marca y espera al commit del lote; None si no existe o no es del usuario"""
+        futuro = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._lote.setdefault(id_usuario, {}).setdefault(id_notificacion, []).append(futuro)
+        if self._tarea is None or self._tarea.done():
+            self._tarea = asyncio.create_task(self._vaciar_tras_ventana())
+        return await futuro
+
+    async def _vaciar_tras_ventana(self) -> None:
+        await asyncio.sleep(self._ventana)
+        await self.vaciar()
+
+    async def vaciar(self) -> None:
+        with self._lock:
+            lote, self._lote = self._lote, {}
+            if lote:
+                self._en_vuelo.append(lote)
+        if not lote:
+            return
+        try:
+            resultado = await run_in_threadpool(self._escribir, lote)
+        except Exception as e:
+            self._terminar(lote)
+            for ids in lote.values():
+                for futuros in ids.values():
+                    for futuro in futuros:
+                        if not futuro.done():
+                            futuro.set_exception(e)
+            return
+        self._terminar(lote)
+        for id_usuario, ids in lote.items():
+            for id_notificacion, futuros in ids.items():
+                for futuro in futuros:
+                    if not futuro.done():
+                        futuro.set_result(resultado.get((id_usuario, id_notificacion)))
+
+    def _terminar(self, lote: Lote) -> None:
+        with self._lock:
+            self._en_vuelo = [en_vuelo for en_vuelo in self._en_vuelo if en_vuelo is not lote]
+
+    @staticmethod
+    def _escribir(lote: Lote) -> Dict[Tuple[UUID, UUID], Notificacion]:
+        db = SessionLocal()
+        try:
+            resultado: Dict[Tuple[UUID, UUID], Notificacion] = {}
+            sin_cambio: Dict[UUID, List[UUID]] = {}
+            for id_usuario, ids in lote.items():
+                cambiadas = crud.cambiar_estado_lectura(db, id_usuario, list(ids), True)
+                for notificacion in cambiadas:
+                    resultado[(id_usuario, notificacion.id_notificacion)] = notificacion
+                restantes = [id_notificacion for id_notificacion in ids if (id_usuario, id_notificacion) not in resultado]
+                if restantes:
+                    sin_cambio[id_usuario] = restantes
+            db.commit()
+            crud.invalidar_contadores(lote.keys())
+
+            # Las que ya estaban leídas se devuelven tal como están
+            for id_usuario, ids in sin_cambio.items():
+                for notificacion in db.query(Notificacion).filter(crud.filtro_propias(ids, id_usuario)):
+                    resultado[(id_usuario, notificacion.id_notificacion)] = notificacion
+            return resultado
+        finally:
+            db.close()
+
+
+_buffer: Optional[BufferLecturas] = None
+
+
+def obtener_buffer_lecturas() -> BufferLecturas:
+    global _buffer
+    if _buffer is None:
+        _buffer = BufferLecturas(ventana=settings.NOTIFICACION_LECTURA_VENTANA_MS / 1000)
+    return _buffer
+
+
+async def vaciar_buffer_lecturas() -> None:
+    """Escribe las marcas pendientes; se llama al apagar el worker"""
+    if _buffer is not None:
+        await _buffer.vaciar()
@@ -1,15 +1,215 @@
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from collections import Counter
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func, and_
+from sqlalchemy import desc, func, and_, case, select, insert, update, delete
+from sqlalchemy.exc import IntegrityError
 
-from app.modules.notificacion.models import Notificacion
+from app.core.configs import settings
+from app.core.campos import Campos, proyectar
+from app.core.invalidacion import obtener_bus
+from app.core.paginacion import CursorInvalido, paginar
+from app.db.escritura import insertar, insertar_muchos
+from app.modules.notificacion.eventos import publicar_notificaciones
+from app.modules.notificacion.models import Notificacion, NotificacionContador
 from app.modules.notificacion.schemas import NotificacionCreate, NotificacionUpdate
 
 
+# Copia por worker de los contadores (no_leidas, total, instante de carga) para responder
+# el polling del badge sin abrir una sesión de base de datos.
+_contadores_cache: Dict[UUID, Tuple[int, int, float]] = {}
+_contadores_lock = threading.Lock()
+_contadores_registrados = False
+
+NOMBRE_CACHE_CONTADORES = "contadores_notificacion"
+
+
+def _registrar_contadores() -> None:
+    """Registra la copia de contadores en el bus de invalidación (una vez por worker)"""
+    global _contadores_registrados
+    with _contadores_lock:
+        if _contadores_registrados:
+            return
+        _contadores_registrados = True
+    obtener_bus().registrar(
+        NOMBRE_CACHE_CONTADORES, invalidar=_descartar_contadores, limpiar=_limpiar_contadores
+    )
+
+
+def _descartar_contadores(ids_usuarios: Iterable[str]) -> None:
+    with _contadores_lock:
+        for id_usuario in ids_usuarios:
+            _contadores_cache.pop(UUID(id_usuario), None)
+
+
+def _limpiar_contadores() -> None:
+    with _contadores_lock:
+        _contadores_cache.clear()
+
+
+def obtener_contador_cacheado(id_usuario: UUID) -> Optional[Tuple[int, int]]:
+    with _contadores_lock:
+        entrada = _contadores_cache.get(id_usuario)
+    if entrada is None or time.monotonic() - entrada[2] > settings.NOTIFICACION_CONTADOR_TTL:
+        return None
+    return entrada[0], entrada[1]
+
+
+def invalidar_contadores(ids_usuarios: Iterable[UUID]) -> None:
+    """Descarta los contadores en este worker y en el resto; llamar después del commit"""
+    _registrar_contadores()
+    obtener_bus().invalidar(NOMBRE_CACHE_CONTADORES, [str(id_usuario) for id_usuario in ids_usuarios])
+
+
+def invalidar_contadores_al_confirmar(db: Session, ids_usuarios: Iterable[UUID]) -> None:
+    """Descarta los contadores en todos los workers cuando la transacción de `db` se confirme"""
+    _registrar_contadores()
+    obtener_bus().invalidar_al_confirmar(db, NOMBRE_CACHE_CONTADORES, [str(id_usuario) for id_usuario in ids_usuarios])
+
+
+def _sumar_a_contadores(db: Session, ids_usuarios: List[UUID], no_leidas: int, total: int, eventos: int) -> Dict[UUID, int]:
+    """
+    Suma los deltas al contador de cada usuario y reserva `eventos` IDs de evento SSE.
+    Devuelve el último ID de evento de cada fila actualizada; la fila queda bloqueada
+    hasta el commit.
+    """
+    return {
+        fila.id_usuario: fila.ultimo_evento
+        for fila in db.execute(
+            update(NotificacionContador)
+            .where(NotificacionContador.id_usuario.in_(ids_usuarios))
+            .values(
+                no_leidas=NotificacionContador.no_leidas + no_leidas,
+                total=NotificacionContador.total + total,
+                ultimo_evento=NotificacionContador.ultimo_evento + eventos
+            )
+            .returning(NotificacionContador.id_usuario, NotificacionContador.ultimo_evento)
+            .execution_options(synchronize_session=False)
+        )
+    }
+
+
+def _recalcular_contadores(
+    db: Session, ids_usuarios: Iterable[UUID], deltas: Optional[Dict[UUID, Tuple[int, int, int]]] = None
+) -> Dict[UUID, int]:
+    """
+    Crea las filas de contador faltantes a partir de la tabla notificacion y devuelve el
+    último ID de evento de cada una. `deltas` (no_leidas, total, eventos) son los cambios
+    de esta transacción: los dos primeros ya están incluidos en el conteo, los eventos se
+    reservan en la fila nueva. Si otra transacción crea el contador antes, se le suman a
+    su fila.
+    """
+    ids_usuarios = list(ids_usuarios)
+    if not ids_usuarios:
+        return {}
+    deltas = deltas or {}
+    conteos = {
+        fila.id_usuario: (fila.no_leidas, fila.total)
+        for fila in db.execute(
+            select(
+                Notificacion.id_usuario,
+                func.count(case((Notificacion.leida == False, 1))).label("no_leidas"),
+                func.count(Notificacion.id_notificacion).label("total")
+            ).filter(Notificacion.id_usuario.in_(ids_usuarios)).group_by(Notificacion.id_usuario)
+        )
+    }
+    filas = [
+        {
+            "id_usuario": id_usuario,
+            "no_leidas": conteos.get(id_usuario, (0, 0))[0],
+            "total": conteos.get(id_usuario, (0, 0))[1],
+            "ultimo_evento": deltas.get(id_usuario, (0, 0, 0))[2]
+        }
+        for id_usuario in ids_usuarios
+    ]
+    try:
+        with db.begin_nested():
+            db.execute(insert(NotificacionContador), filas)
+        return {fila["id_usuario"]: fila["ultimo_evento"] for fila in filas}
+    except IntegrityError:
+        pass
+
+    # Otra transacción creó alguno de los contadores al mismo tiempo. Contó desde su propia
+    # instantánea, que no ve nuestras notificaciones sin confirmar: a esas filas se les
+    # suma nuestro delta en lugar de darlas por buenas.
+    ultimos: Dict[UUID, int] = {}
+    for fila in filas:
+        try:
+            with db.begin_nested():
+                db.execute(insert(NotificacionContador), [fila])
+            ultimos[fila["id_usuario"]] = fila["ultimo_evento"]
+        except IntegrityError:
+            no_leidas, total, eventos = deltas.get(fila["id_usuario"], (0, 0, 0))
+            ultimos.update(_sumar_a_contadores(db, [fila["id_usuario"]], no_leidas, total, eventos))
+    return ultimos
+
+
+def ajustar_contadores(
+    db: Session, ids_usuarios: Iterable[UUID], no_leidas: int = 0, total: int = 0, eventos: bool = False
+) -> Dict[UUID, int]:
+    """
+    Suma los deltas indicados al contador de cada usuario (una vez por aparición en la lista).
+    Debe llamarse después de hacer flush de los cambios en notificacion.
+
+    Con `eventos`, en el mismo UPDATE reserva además un ID de evento SSE por aparición y
+    devuelve el último de cada usuario. La fila del contador queda bloqueada hasta el
+    commit, así que otra transacción que notifique al mismo usuario numera después.
+    """
+    apariciones = Counter(id_usuario for id_usuario in ids_usuarios if id_usuario)
+    if not apariciones:
+        return {}
+
+    # Agrupar por número de apariciones para emitir una sola sentencia por grupo
+    grupos: Dict[int, List[UUID]] = {}
+    for id_usuario, veces in apariciones.items():
+        grupos.setdefault(veces, []).append(id_usuario)
+
+    ultimos: Dict[UUID, int] = {}
+    for veces, ids in grupos.items():
+        ultimos.update(_sumar_a_contadores(db, ids, no_leidas * veces, total * veces, veces if eventos else 0))
+
+    sin_contador = [id_usuario for id_usuario in apariciones if id_usuario not in ultimos]
+    ultimos.update(_recalcular_contadores(db, sin_contador, {
+        id_usuario: (
+            no_leidas * apariciones[id_usuario],
+            total * apariciones[id_usuario],
+            apariciones[id_usuario] if eventos else 0
+        )
+        for id_usuario in sin_contador
+    }))
+    return ultimos
+
+
+async def obtener_contador(db: Session, id_usuario: UUID) -> Tuple[int, int]:
+    """Obtiene (no_leidas, total) del usuario y lo guarda en la copia del worker"""
+    contador = db.query(NotificacionContador).filter(NotificacionContador.id_usuario == id_usuario).first()
+    if contador is None:
+        _recalcular_contadores(db, [id_usuario])
+        contador = db.query(NotificacionContador).filter(NotificacionContador.id_usuario == id_usuario).first()
+
+    valores = (contador.no_leidas, contador.total) if contador else (0, 0)
+    _registrar_contadores()
+    with _contadores_lock:
+        _contadores_cache[id_usuario] = (valores[0], valores[1], time.monotonic())
+    return valores
+
+
+def obtener_ultimo_evento(db: Session, id_usuario: UUID) -> int:
+    """Último ID de evento SSE asignado al usuario (0 si aún no tiene)"""
+    ultimo = db.execute(
+        select(NotificacionContador.ultimo_evento).filter(NotificacionContador.id_usuario == id_usuario)
+    ).scalar_one_or_none()
+    return ultimo or 0
+
+
 async def crear_notificacion(db: Session, notificacion: NotificacionCreate) -> Notificacion:
 
-    db_notificacion = Notificacion(
+    # La fecha (func.now()) vuelve en el RETURNING junto con el resto de la fila
+    db_notificacion = insertar(
+        db,
+        Notificacion,
         id_usuario=notificacion.id_usuario,
         titulo=notificacion.titulo,
         mensaje=notificacion.mensaje,
@@ -21,18 +221,24 @@ async def crear_notificacion(db: Session, notificacion: NotificacionCreate) -> N
         referencia_id=notificacion.referencia_id,
         referencia_tipo=notificacion.referencia_tipo
     )
-    db.add(db_notificacion)
-    db.commit()
-    db.refresh(db_notificacion)
+    ultimos_eventos = ajustar_contadores(db, [db_notificacion.id_usuario], no_leidas=1, total=1, eventos=True)
+    publicar_notificaciones(db, [db_notificacion], ultimos_eventos)
+    invalidar_contadores_al_confirmar(db, [db_notificacion.id_usuario])
     return db_notificacion
 
 
+# Más recientes primero; el ID desempata notificaciones creadas en el mismo instante
+ORDEN_NOTIFICACIONES = [desc(Notificacion.fecha), desc(Notificacion.id_notificacion)]
+
+
 async def obtener_notificaciones_usuario(
     db: Session, 
     id_usuario: UUID, 
     skip: int = 0, 
     limit: int = 100,
-    solo_no_leidas: bool = False
+    solo_no_leidas: bool = False,
+    cursor: Optional[str] = None,
+    campos: Optional[Campos] = None
 ) -> Dict[str, Any]:
     try:
         # Verificar que el ID de usuario sea válido
@@ -40,54 +246,55 @@ async def obtener_notificaciones_usuario(
             return {
                 "notificaciones": [],
                 "total": 0,
-                "no_leidas": 0
+                "no_leidas": 0,
+                "next_cursor": None
             }
             
         # Construir la consulta base
         query = db.query(Notificacion).filter(Notificacion.id_usuario == id_usuario)
         
-        # Contar notificaciones no leídas
+        # Los conteos salen del contador desnormalizado en lugar de dos COUNT(*)
         try:
-            no_leidas = db.query(func.count(Notificacion.id_notificacion)).filter(
-                and_(
-                    Notificacion.id_usuario == id_usuario,
-                    Notificacion.leida == False
-                )
-            ).scalar() or 0
+            no_leidas, total = await obtener_contador(db, id_usuario)
         except Exception as e:
-            print(f"Error al contar notificaciones no leídas: {str(e)}")
-            no_leidas = 0
+            print(f"Error al obtener el contador de notificaciones: {str(e)}")
+            no_leidas, total = 0, 0
         
         # Aplicar filtro de solo no leídas si es necesario
         if solo_no_leidas:
             query = query.filter(Notificacion.leida == False)
+            total = no_leidas
         
-        # Contar total de notificaciones con filtros aplicados
-        try:
-            total = query.count()
-        except Exception as e:
-            print(f"Error al contar total de notificaciones: {str(e)}")
-            total = 0
+        # Con `campos` solo se cargan esas columnas; `leida` siempre, para reflejar
+        # las marcas de lectura del buffer
+        if campos is not None:
+            query = proyectar(query, Notificacion, campos + ("leida",), ORDEN_NOTIFICACIONES)
         
         # Obtener las notificaciones con paginación y ordenamiento
         try:
-            notificaciones = query.order_by(desc(Notificacion.fecha)).offset(skip).limit(limit).all()
+            notificaciones, next_cursor = paginar(query, ORDEN_NOTIFICACIONES, limit, cursor=cursor, skip=skip)
+        except CursorInvalido:
+            raise
         except Exception as e:
             print(f"Error al obtener notificaciones: {str(e)}")
-            notificaciones = []
+            notificaciones, next_cursor = [], None
         
         return {
             "notificaciones": notificaciones,
             "total": total,
-            "no_leidas": no_leidas
+            "no_leidas": no_leidas,
+            "next_cursor": next_cursor
         }
+    except CursorInvalido:
+        raise
     except Exception as e:
         print(f"Error general en obtener_notificaciones_usuario: {str(e)}")
         # Devolver un resultado vacío en caso de error
         return {
             "notificaciones": [],
             "total": 0,
-            "no_leidas": 0
+            "no_leidas": 0,
+            "next_cursor": None
         }
 
 
@@ -95,34 +302,88 @@ async def obtener_notificacion(db: Session, id_notificacion: UUID) -> Optional[N
     return db.query(Notificacion).filter(Notificacion.id_notificacion == id_notificacion).first()
 
 
+def filtro_propias(ids: Iterable[UUID], id_usuario: UUID):
+    """Condición de propiedad evaluada en SQL: solo filas del usuario indicado"""
+    return and_(
+        Notificacion.id_notificacion.in_(list(ids)),
+        Notificacion.id_usuario == id_usuario
+    )
+
+
+def contar_no_leidas(db: Session, id_usuario: UUID, ids: Iterable[UUID]) -> int:
+    """Cuántas de `ids` son del usuario y siguen sin leer en la base de datos"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    return db.execute(
+        select(func.count()).select_from(Notificacion).filter(
+            filtro_propias(ids, id_usuario), Notificacion.leida == False
+        )
+    ).scalar_one()
+
+
+def cambiar_estado_lectura(db: Session, id_usuario: UUID, ids: Iterable[UUID], leida: bool) -> List[Notificacion]:
+    """
+    Marca como leídas/no leídas en una sola sentencia las notificaciones del usuario
+    cuyo estado cambia, y ajusta su contador. Devuelve las filas modificadas.
+    """
+    cambiadas = db.execute(
+        update(Notificacion)
+        .where(filtro_propias(ids, id_usuario), Notificacion.leida == (not leida))
+        .values(leida=leida)
+        .returning(Notificacion)
+    ).scalars().all()
+    if cambiadas:
+        ajustar_contadores(db, [id_usuario], no_leidas=-len(cambiadas) if leida else len(cambiadas))
+    return cambiadas
+
+
 async def actualizar_notificacion(
     db: Session, 
     id_notificacion: UUID, 
-    datos_actualizacion: NotificacionUpdate
+    datos_actualizacion: NotificacionUpdate,
+    id_usuario: UUID
 ) -> Optional[Notificacion]:
 
-    notificacion = await obtener_notificacion(db, id_notificacion)
-    if not notificacion:
-        return None
-    
     datos_dict = datos_actualizacion.dict(exclude_unset=True)
-    for key, value in datos_dict.items():
-        setattr(notificacion, key, value)
     
-    db.commit()
-    db.refresh(notificacion)
+    # El cambio de estado de lectura va aparte para saber si hay que ajustar el contador
+    leida = datos_dict.pop("leida", None)
+    if leida is not None:
+        cambiar_estado_lectura(db, id_usuario, [id_notificacion], leida)
+    
+    if datos_dict:
+        notificacion = db.execute(
+            update(Notificacion)
+            .where(filtro_propias([id_notificacion], id_usuario))
+            .values(**datos_dict)
+            .returning(Notificacion)
+        ).scalars().first()
+    else:
+        notificacion = await obtener_notificacion_usuario(db, id_notificacion, id_usuario)
+    
+    invalidar_contadores_al_confirmar(db, [id_usuario])
     return notificacion
 
 
-async def marcar_como_leida(db: Session, id_notificacion: UUID) -> Optional[Notificacion]:
-    notificacion = await obtener_notificacion(db, id_notificacion)
-    if not notificacion:
-        return None
-    
-    notificacion.leida = True
-    db.commit()
-    db.refresh(notificacion)
-    return notificacion
+async def obtener_notificacion_usuario(db: Session, id_notificacion: UUID, id_usuario: UUID) -> Optional[Notificacion]:
+    return db.query(Notificacion).filter(filtro_propias([id_notificacion], id_usuario)).first()
+
+
+async def marcar_como_leida(db: Session, id_notificacion: UUID, id_usuario: UUID) -> Optional[Notificacion]:
+    cambiadas = cambiar_estado_lectura(db, id_usuario, [id_notificacion], True)
+    if cambiadas:
+        invalidar_contadores_al_confirmar(db, [id_usuario])
+        return cambiadas[0]
+    # Ya estaba leída, no existe o no pertenece al usuario
+    return await obtener_notificacion_usuario(db, id_notificacion, id_usuario)
+
+
+async def marcar_lote(db: Session, id_usuario: UUID, ids: List[UUID], leida: bool = True) -> List[UUID]:
+    """Marca varias notificaciones del usuario; devuelve los IDs que cambiaron de estado"""
+    cambiadas = cambiar_estado_lectura(db, id_usuario, ids, leida)
+    invalidar_contadores_al_confirmar(db, [id_usuario])
+    return [notificacion.id_notificacion for notificacion in cambiadas]
 
 
 async def marcar_todas_como_leidas(db: Session, id_usuario: UUID) -> int:
@@ -133,18 +394,28 @@ async def marcar_todas_como_leidas(db: Session, id_usuario: UUID) -> int:
         )
     ).update({"leida": True})
     
-    db.commit()
+    if resultado:
+        ajustar_contadores(db, [id_usuario], no_leidas=-resultado)
+    invalidar_contadores_al_confirmar(db, [id_usuario])
     return resultado
 
 
-async def eliminar_notificacion(db: Session, id_notificacion: UUID) -> bool:
-    notificacion = await obtener_notificacion(db, id_notificacion)
-    if not notificacion:
-        return False
-    
-    db.delete(notificacion)
-    db.commit()
-    return True
+async def eliminar_lote(db: Session, id_usuario: UUID, ids: List[UUID]) -> List[UUID]:
+    """Elimina en una sola sentencia las notificaciones indicadas que pertenezcan al usuario"""
+    eliminadas = db.execute(
+        delete(Notificacion)
+        .where(filtro_propias(ids, id_usuario))
+        .returning(Notificacion.id_notificacion, Notificacion.leida)
+    ).all()
+    if eliminadas:
+        no_leidas = sum(1 for fila in eliminadas if not fila.leida)
+        ajustar_contadores(db, [id_usuario], no_leidas=-no_leidas, total=-len(eliminadas))
+    invalidar_contadores_al_confirmar(db, [id_usuario])
+    return [fila.id_notificacion for fila in eliminadas]
+
+
+async def eliminar_notificacion(db: Session, id_notificacion: UUID, id_usuario: UUID) -> bool:
+    return bool(await eliminar_lote(db, id_usuario, [id_notificacion]))
 
 
 async def crear_notificacion_sistema(
@@ -190,23 +461,23 @@ async def crear_notificacion_masiva(
     referencia_tipo: Optional[str] = None
 ) -> int:
 
-    notificaciones = [
-        Notificacion(
-            id_usuario=id_usuario,
-            titulo=titulo,
-            mensaje=mensaje,
-            tipo=tipo,
-            accionable=accionable,
-            accion=accion,
-            accion_texto=accion_texto,
-            accion_icono=accion_icono,
-            referencia_id=referencia_id,
-            referencia_tipo=referencia_tipo
-        )
+    notificaciones = insertar_muchos(db, Notificacion, [
+        {
+            "id_usuario": id_usuario,
+            "titulo": titulo,
+            "mensaje": mensaje,
+            "tipo": tipo,
+            "accionable": accionable,
+            "accion": accion,
+            "accion_texto": accion_texto,
+            "accion_icono": accion_icono,
+            "referencia_id": referencia_id,
+            "referencia_tipo": referencia_tipo
+        }
         for id_usuario in ids_usuarios
-    ]
-    
-    db.add_all(notificaciones)
-    db.commit()
+    ])
+    ultimos_eventos = ajustar_contadores(db, ids_usuarios, no_leidas=1, total=1, eventos=True)
+    publicar_notificaciones(db, notificaciones, ultimos_eventos)
+    invalidar_contadores_al_confirmar(db, ids_usuarios)
     
     return len(notificaciones)
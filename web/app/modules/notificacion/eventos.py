@@ -0,0 +1,171 @@
+"""
+Broker en proceso para el stream SSE de notificaciones.
+
+Cada worker se suscribe al canal "notificaciones" del transporte (local o
+LISTEN/NOTIFY) y reparte los eventos a las conexiones abiertas de cada usuario.
+Guarda un historial corto por usuario para reanudar desde `Last-Event-ID`.
+
+Los IDs de evento son una secuencia por usuario (notificacion_contador.ultimo_evento)
+que se reserva en el mismo UPDATE que ajusta los contadores al crear las
+notificaciones. La fila queda bloqueada hasta el commit y los mensajes se entregan en
+orden de commit, así que los IDs de cada usuario llegan consecutivos y crecientes a
+todos los workers.
+"""
+import asyncio
+import threading
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.configs import settings
+from app.core.pubsub import obtener_transporte, publicar_al_confirmar
+
+CANAL_NOTIFICACIONES = "notificaciones"
+
+# Destinos por mensaje NOTIFY y longitud máxima del mensaje incluido en el evento,
+# para no superar el límite de payload de Postgres
+DESTINOS_POR_MENSAJE = 60
+LARGO_MAXIMO_MENSAJE = 1000
+
+# Usuarios con historial en memoria por worker
+MAXIMO_USUARIOS_HISTORIAL = 10000
+
+Evento = Tuple[int, dict]
+
+
+class Suscripcion:
+    def __init__(self, id_usuario, loop: asyncio.AbstractEventLoop, tamano_cola: int):
+        self.id_usuario = id_usuario
+        self.loop = loop
+        self.cola: asyncio.Queue = asyncio.Queue(maxsize=tamano_cola)
+        # Se activa cuando el cliente no consume a tiempo y la cola se llena
+        self.desbordada = False
+
+    def _encolar(self, evento: Evento) -> None:
+        if self.desbordada:
+            return
+        try:
+            self.cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.desbordada = True
+
+
+class BrokerNotificaciones:
+    def __init__(self, tamano_cola: int, tamano_historial: int):
+        self._tamano_cola = tamano_cola
+        self._tamano_historial = tamano_historial
+        self._suscripciones: Dict[str, Set[Suscripcion]] = {}
+        self._historial: "OrderedDict[str, Deque[Evento]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def suscribir(self, id_usuario) -> Suscripcion:
+        suscripcion = Suscripcion(str(id_usuario), asyncio.get_running_loop(), self._tamano_cola)
+        with self._lock:
+            self._suscripciones.setdefault(suscripcion.id_usuario, set()).add(suscripcion)
+        return suscripcion
+
+    def desuscribir(self, suscripcion: Suscripcion) -> None:
+        with self._lock:
+            suscripciones = self._suscripciones.get(suscripcion.id_usuario)
+            if suscripciones is not None:
+                suscripciones.discard(suscripcion)
+                if not suscripciones:
+                    del self._suscripciones[suscripcion.id_usuario]
+
+    def eventos_desde(self, id_usuario, ultimo_id: int) -> Tuple[List[Evento], bool]:
+        """
+        Devuelve los eventos posteriores a `ultimo_id` y si el historial los cubre
+        completos (False indica que pudieron perderse eventos y el cliente debe recargar).
+        """
+        with self._lock:
+            historial = list(self._historial.get(str(id_usuario), ()))
+        eventos = [evento for evento in historial if evento[0] > ultimo_id]
+        # El historial es consecutivo: cubre todo si empieza como mucho en el siguiente
+        # al del cliente y el cliente no va por delante (IDs de otro worker o esquema)
+        completo = bool(historial) and historial[0][0] <= ultimo_id + 1 and ultimo_id <= historial[-1][0]
+        return eventos, completo
+
+    def limpiar_historial(self) -> None:
+        """Se perdieron mensajes (conexión LISTEN restablecida): el historial ya no es fiable"""
+        with self._lock:
+            self._historial.clear()
+
+    def entregar(self, id_usuario: str, evento: Evento) -> None:
+        """Registra el evento y lo reparte; puede llamarse desde cualquier hilo"""
+        with self._lock:
+            historial = self._historial.get(id_usuario)
+            if historial is None:
+                historial = self._historial[id_usuario] = deque(maxlen=self._tamano_historial)
+                if len(self._historial) > MAXIMO_USUARIOS_HISTORIAL:
+                    self._historial.popitem(last=False)
+            else:
+                self._historial.move_to_end(id_usuario)
+                # Un salto en la secuencia del usuario: se perdieron eventos intermedios
+                if historial and evento[0] != historial[-1][0] + 1:
+                    historial.clear()
+            historial.append(evento)
+            suscripciones = list(self._suscripciones.get(id_usuario, ()))
+        for suscripcion in suscripciones:
+            suscripcion.loop.call_soon_threadsafe(suscripcion._encolar, evento)
+
+    def recibir(self, mensaje: dict) -> None:
+        """Callback del transporte: un mensaje lleva los datos comunes y la lista de destinos"""
+        comun = mensaje.get("comun", {})
+        for id_usuario, id_notificacion, id_evento in mensaje.get("destinos", []):
+            self.entregar(id_usuario, (id_evento, {**comun, "id_usuario": id_usuario, "id_notificacion": id_notificacion}))
+
+
+_broker: Optional[BrokerNotificaciones] = None
+_broker_lock = threading.Lock()
+
+
+def obtener_broker() -> BrokerNotificaciones:
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = BrokerNotificaciones(
+                tamano_cola=settings.NOTIFICACION_STREAM_COLA,
+                tamano_historial=settings.NOTIFICACION_STREAM_HISTORIAL
+            )
+            transporte = obtener_transporte()
+            transporte.suscribir(CANAL_NOTIFICACIONES, _broker.recibir)
+            if hasattr(transporte, "al_conectar"):
+                transporte.al_conectar(_broker.limpiar_historial)
+        return _broker
+
+
+def publicar_notificaciones(db, notificaciones, ultimos_eventos: Dict[UUID, int]) -> None:
+    """
+    Publica al confirmar la transacción un evento por cada notificación creada.
+    `ultimos_eventos` es lo que devolvió `ajustar_contadores(..., eventos=True)`: el último
+    ID reservado para cada usuario; sus notificaciones toman los anteriores, en orden.
+    """
+    if not notificaciones:
+        return
+    primera = notificaciones[0]
+    mensaje = primera.mensaje or ""
+    comun = {
+        "titulo": primera.titulo,
+        "mensaje": mensaje[:LARGO_MAXIMO_MENSAJE],
+        "mensaje_truncado": len(mensaje) > LARGO_MAXIMO_MENSAJE,
+        "tipo": primera.tipo,
+        "fecha": primera.fecha,
+        "leida": False,
+        "accionable": primera.accionable,
+        "accion": primera.accion,
+        "accion_texto": primera.accion_texto,
+        "accion_icono": primera.accion_icono,
+        "referencia_id": primera.referencia_id,
+        "referencia_tipo": primera.referencia_tipo,
+    }
+    restantes = Counter(notificacion.id_usuario for notificacion in notificaciones)
+    destinos = []
+    for notificacion in notificaciones:
+        id_evento = ultimos_eventos[notificacion.id_usuario] - restantes[notificacion.id_usuario] + 1
+        restantes[notificacion.id_usuario] -= 1
+        destinos.append([str(notificacion.id_usuario), str(notificacion.id_notificacion), id_evento])
+    for inicio in range(0, len(destinos), DESTINOS_POR_MENSAJE):
+        publicar_al_confirmar(db, CANAL_NOTIFICACIONES, {
+            "comun": comun,
+            "destinos": destinos[inicio:inicio + DESTINOS_POR_MENSAJE]
+        })
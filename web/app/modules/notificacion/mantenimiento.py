@@ -0,0 +1,173 @@
+"""
+Mantenimiento de la tabla notificacion.
+
+- Crea por adelantado las particiones mensuales (solo Postgres con la tabla particionada).
+- Aplica la retención: las notificaciones leídas más antiguas que el límite se
+  mueven a notificacion_archivo (o se eliminan) por lotes, y las particiones que
+  quedan vacías fuera del período se desprenden y eliminan.
+
+Uso (desde la carpeta web, por ejemplo en un cron diario):
+    python -m app.modules.notificacion.mantenimiento particiones [--meses N]
+    python -m app.modules.notificacion.mantenimiento retencion [--meses N] [--sin-archivo]
+"""
+import argparse
+import re
+from datetime import date, datetime, time
+from typing import List, Optional
+
+from sqlalchemy import delete, insert, text
+from sqlalchemy.orm import Session
+
+from app.core.configs import settings
+from app.db.session import SessionLocal
+import app.db.base  # noqa: F401  registra todos los modelos antes de configurar las relaciones
+from app.modules.notificacion import crud
+from app.modules.notificacion.models import Notificacion, NotificacionArchivada
+
+PATRON_PARTICION = re.compile(r"^notificacion_p(\d{4})_(\d{2})$")
+
+
+def sumar_meses(mes: date, meses: int) -> date:
+    """Primer día del mes que está `meses` meses después (o antes) de `mes`"""
+    indice = mes.year * 12 + mes.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def nombre_particion(mes: date) -> str:
+    return f"notificacion_p{mes:%Y_%m}"
+
+
+def es_particionada(conexion) -> bool:
+    if conexion.dialect.name != "postgresql":
+        return False
+    relkind = conexion.execute(text("SELECT relkind FROM pg_class WHERE oid = to_regclass('notificacion')")).scalar()
+    return relkind == "p"
+
+
+def crear_particion(conexion, mes: date) -> bool:
+    """
+    Crea la partición del mes si no existe. Se crea aparte, se le mueven las filas
+    que hubieran caído en la partición por defecto y luego se adjunta.
+    """
+    nombre = nombre_particion(mes)
+    if conexion.execute(text("SELECT to_regclass(:nombre)"), {"nombre": nombre}).scalar() is not None:
+        return False
+    desde, hasta = mes.isoformat(), sumar_meses(mes, 1).isoformat()
+    conexion.execute(text(f'CREATE TABLE "{nombre}" (LIKE notificacion INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    conexion.execute(text(
+        f'WITH movidas AS (DELETE FROM notificacion_pdefault WHERE fecha >= :desde AND fecha < :hasta RETURNING *) '
+        f'INSERT INTO "{nombre}" SELECT * FROM movidas'
+    ), {"desde": desde, "hasta": hasta})
+    conexion.execute(text(
+        f"ALTER TABLE notificacion ATTACH PARTITION \"{nombre}\" FOR VALUES FROM ('{desde}') TO ('{hasta}')"
+    ))
+    return True
+
+
+def crear_particiones(db: Session, meses_adelante: int, desde: Optional[date] = None) -> List[str]:
+    """Crea las particiones desde el mes de `desde` (hoy por defecto) hasta `meses_adelante` meses después"""
+    conexion = db.connection()
+    if not es_particionada(conexion):
+        return []
+    mes = (desde or date.today()).replace(day=1)
+    creadas = []
+    for _ in range(meses_adelante + 1):
+        if crear_particion(conexion, mes):
+            creadas.append(nombre_particion(mes))
+        mes = sumar_meses(mes, 1)
+    db.commit()
+    return creadas
+
+
+def aplicar_retencion(db: Session, meses: int, archivar: bool = True, tamano_lote: int = 5000) -> int:
+    """
+    Archiva (o elimina) por lotes las notificaciones leídas anteriores al límite de
+    retención y ajusta los contadores. Las no leídas se conservan siempre.
+    Devuelve la cantidad de notificaciones retiradas.
+    """
+    if meses <= 0:
+        return 0
+    limite = datetime.combine(sumar_meses(date.today().replace(day=1), -meses), time.min)
+    columnas = Notificacion.__table__.c
+    retiradas = 0
+    while True:
+        lote = (
+            db.query(Notificacion.id_notificacion)
+            .filter(Notificacion.leida == True, Notificacion.fecha < limite)
+            .limit(tamano_lote)
+            .subquery()
+        )
+        # La condición se repite en el DELETE por si alguna se marcó como no leída entretanto
+        filas = db.execute(
+            delete(Notificacion)
+            .where(
+                Notificacion.id_notificacion.in_(lote.select()),
+                Notificacion.leida == True,
+                Notificacion.fecha < limite
+            )
+            .returning(*columnas)
+        ).mappings().all()
+        if not filas:
+            break
+        if archivar:
+            db.execute(insert(NotificacionArchivada), [dict(fila) for fila in filas])
+        crud.ajustar_contadores(db, [fila["id_usuario"] for fila in filas], total=-1)
+        db.commit()
+        retiradas += len(filas)
+
+    if es_particionada(db.connection()):
+        eliminar_particiones_vacias(db, limite.date())
+    return retiradas
+
+
+def eliminar_particiones_vacias(db: Session, limite: date) -> List[str]:
+    """Desprende y elimina las particiones que terminan antes del límite y ya no tienen filas"""
+    conexion = db.connection()
+    nombres = conexion.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('notificacion')"
+    )).scalars().all()
+    eliminadas = []
+    for nombre in sorted(nombres):
+        coincidencia = PATRON_PARTICION.match(nombre)
+        if not coincidencia:
+            continue
+        mes = date(int(coincidencia.group(1)), int(coincidencia.group(2)), 1)
+        if sumar_meses(mes, 1) > limite:
+            continue
+        if conexion.execute(text(f'SELECT EXISTS (SELECT 1 FROM "{nombre}")')).scalar():
+            continue
+        conexion.execute(text(f'ALTER TABLE notificacion DETACH PARTITION "{nombre}"'))
+        conexion.execute(text(f'DROP TABLE "{nombre}"'))
+        eliminadas.append(nombre)
+    db.commit()
+    return eliminadas
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Mantenimiento de la tabla notificacion")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    particiones = comandos.add_parser("particiones", help="Crea las particiones mensuales por adelantado")
+    particiones.add_argument("--meses", type=int, default=settings.NOTIFICACION_PARTICIONES_ADELANTE)
+
+    retencion = comandos.add_parser("retencion", help="Archiva o elimina las notificaciones leídas antiguas")
+    retencion.add_argument("--meses", type=int, default=settings.NOTIFICACION_RETENCION_MESES)
+    retencion.add_argument("--sin-archivo", action="store_true", help="Eliminar en lugar de archivar")
+
+    args = parser.parse_args(argumentos)
+    db = SessionLocal()
+    try:
+        if args.comando == "particiones":
+            creadas = crear_particiones(db, args.meses)
+            print(f"Particiones creadas: {', '.join(creadas) if creadas else 'ninguna'}")
+        else:
+            archivar = settings.NOTIFICACION_ARCHIVAR and not args.sin_archivo
+            retiradas = aplicar_retencion(db, args.meses, archivar=archivar)
+            print(f"Notificaciones {'archivadas' if archivar else 'eliminadas'}: {retiradas}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
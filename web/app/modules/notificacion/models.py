@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, Text, Boolean, ForeignKey, DateTime, Integer, BigInteger, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -7,7 +7,14 @@ import uuid
 
 
 class Notificacion(Base):
+    """
+    En Postgres la tabla está particionada por rango mensual de `fecha`
+    (ver la migración de Alembic); la clave primaria real es (id_notificacion, fecha).
+    """
     __tablename__ = "notificacion"
+    __table_args__ = (
+        Index("ix_notificacion_usuario_fecha", "id_usuario", "fecha"),
+    )
 
     id_notificacion = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     id_usuario = Column(UUID(as_uuid=True), ForeignKey("usuario.id_usuario", ondelete="CASCADE"))
@@ -25,3 +32,37 @@ class Notificacion(Base):
 
     # Relación con el usuario
     usuario = relationship("Usuario", back_populates="notificaciones")
+
+
+class NotificacionArchivada(Base):
+    """Notificaciones leídas que superaron el período de retención"""
+    __tablename__ = "notificacion_archivo"
+    __table_args__ = (
+        Index("ix_notificacion_archivo_usuario_fecha", "id_usuario", "fecha"),
+    )
+
+    id_notificacion = Column(UUID(as_uuid=True), primary_key=True)
+    id_usuario = Column(UUID(as_uuid=True), ForeignKey("usuario.id_usuario", ondelete="CASCADE"))
+    titulo = Column(String(100), nullable=False)
+    mensaje = Column(Text, nullable=False)
+    fecha = Column(DateTime, nullable=False)
+    tipo = Column(String(20), nullable=False)
+    leida = Column(Boolean, nullable=False, default=True)
+    accionable = Column(Boolean, default=False)
+    accion = Column(String(50), nullable=True)
+    accion_texto = Column(String(50), nullable=True)
+    accion_icono = Column(String(30), nullable=True)
+    referencia_id = Column(UUID(as_uuid=True), nullable=True)
+    referencia_tipo = Column(String(30), nullable=True)
+    fecha_archivo = Column(DateTime, nullable=False, default=func.now())
+
+
+class NotificacionContador(Base):
+    """Contadores desnormalizados de notificaciones por usuario (badge de la campana)"""
+    __tablename__ = "notificacion_contador"
+
+    id_usuario = Column(UUID(as_uuid=True), ForeignKey("usuario.id_usuario", ondelete="CASCADE"), primary_key=True)
+    no_leidas = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    # Último ID de evento SSE asignado al usuario (app/modules/notificacion/eventos.py)
+    ultimo_evento = Column(BigInteger, nullable=False, default=0, server_default="0")
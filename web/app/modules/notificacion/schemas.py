@@ -1,5 +1,5 @@
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 from datetime import datetime
 from enum import Enum
@@ -45,11 +45,26 @@ class NotificacionOut(NotificacionBase):
     fecha: datetime
     leida: bool
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class NotificacionesResponse(BaseModel):
     notificaciones: List[NotificacionOut]
     total: int
     no_leidas: int
+    # Cursor para pedir la página siguiente; None si no hay más
+    next_cursor: Optional[str] = None
+
+
+class ContadorNotificaciones(BaseModel):
+    no_leidas: int
+    total: int
+
+
+class NotificacionesLote(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=500, description="IDs de las notificaciones")
+
+
+class ResultadoLote(BaseModel):
+    cantidad: int
+    ids: List[UUID]
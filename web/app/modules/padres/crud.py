@@ -1,14 +1,19 @@
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, select
 from app.modules.estudiantes.models import Asistencia
 from app.modules.materias.models import Materia
 from app.modules.estudiantes.models import Nota
 from app.modules.estudiantes.models import Estudiante, Matricula
 from app.modules.usuarios.models import Usuario
+from app.modules.padres.schemas import AsistenciaFila, NotaFila
+from app.modules.usuarios.autorizacion import invalidar_relaciones_al_confirmar
 from app.modules.anio_lectivo.crud import get_anio_lectivo_activo
 from app.core.security import hashear_password, verificar_password
+from app.core.paginacion import paginar
+from app.db.cargadores import obtener_cargador
+from app.db.escritura import actualizar
 
 
 def get_hijos_por_padre(db: Session, id_padre: UUID) -> List[Estudiante]:
@@ -22,84 +27,84 @@ def get_hijo_por_id(db: Session, id_estudiante: UUID, id_padre: UUID) -> Optiona
     ).first()
 
 
-def get_notas_estudiante(db: Session, id_estudiante: UUID, id_anio: Optional[UUID] = None) -> List[Dict[str, Any]]:
+def get_notas_estudiante(db: Session, id_estudiante: UUID, id_anio: Optional[UUID] = None) -> List[NotaFila]:
     if not id_anio:
         anio_activo = get_anio_lectivo_activo(db)
         if anio_activo:
             id_anio = anio_activo.id_anio
     
-    query = db.query(Nota, Materia.nombre.label("nombre_materia")).join(
-        Materia, Nota.id_materia == Materia.id_materia
-    ).filter(Nota.id_estudiante == id_estudiante)
+    # Solo las columnas de la respuesta, con el nombre de la materia en el mismo JOIN
+    consulta = (
+        select(
+            Nota.id_nota,
+            Nota.id_estudiante,
+            Nota.id_materia,
+            Materia.nombre,
+            Nota.trimestre,
+            Nota.valor,
+            Nota.descripcion
+        )
+        .join(Nota.materia)
+        .where(Nota.id_estudiante == id_estudiante)
+    )
     
     if id_anio:
-        query = query.filter(Nota.id_anio == id_anio)
+        consulta = consulta.where(Nota.id_anio == id_anio)
     
-    results = query.all()
-    
-    notas_con_materia = []
-    for nota, nombre_materia in results:
-        nota_dict = {
-            "id_nota": nota.id_nota,
-            "id_estudiante": nota.id_estudiante,
-            "id_materia": nota.id_materia,
-            "nombre_materia": nombre_materia,
-            "tipo": nota.tipo,
-            "descripcion": nota.descripcion,
-            "calificacion": nota.calificacion,
-            "fecha": nota.fecha
-        }
-        notas_con_materia.append(nota_dict)
-    
-    return notas_con_materia
+    return [NotaFila(*fila) for fila in db.execute(consulta)]
 
 
-def get_asistencias_estudiante(db: Session, id_estudiante: UUID, id_anio: Optional[UUID] = None) -> List[Dict[str, Any]]:
+def get_asistencias_estudiante(db: Session, id_estudiante: UUID, id_anio: Optional[UUID] = None) -> List[AsistenciaFila]:
     if not id_anio:
         anio_activo = get_anio_lectivo_activo(db)
         if anio_activo:
             id_anio = anio_activo.id_anio
     
-    query = db.query(Asistencia, Materia.nombre.label("nombre_materia")).join(
-        Materia, Asistencia.id_materia == Materia.id_materia
-    ).filter(Asistencia.id_estudiante == id_estudiante)
+    consulta = (
+        select(
+            Asistencia.id_asistencia,
+            Asistencia.id_estudiante,
+            Asistencia.id_materia,
+            Materia.nombre,
+            Asistencia.fecha,
+            Asistencia.estado,
+            Asistencia.comentario
+        )
+        .join(Asistencia.materia)
+        .where(Asistencia.id_estudiante == id_estudiante)
+    )
     
     if id_anio:
-        query = query.filter(Asistencia.id_anio == id_anio)
-    
-    results = query.all()
+        consulta = consulta.where(Asistencia.id_anio == id_anio)
     
-    asistencias_con_materia = []
-    for asistencia, nombre_materia in results:
-        asistencia_dict = {
-            "id_asistencia": asistencia.id_asistencia,
-            "id_estudiante": asistencia.id_estudiante,
-            "id_materia": asistencia.id_materia,
-            "nombre_materia": nombre_materia,
-            "fecha": asistencia.fecha,
-            "estado": asistencia.estado,
-            "comentario": asistencia.comentario
-        }
-        asistencias_con_materia.append(asistencia_dict)
-    
-    return asistencias_con_materia
+    return [AsistenciaFila(*fila) for fila in db.execute(consulta)]
+
+
 
+# Orden alfabético; el ID desempata
+ORDEN_PADRES = [Usuario.nombre, Usuario.id_usuario]
 
 
-def get_padres(db: Session, skip: int = 0, limit: int = 100) -> List[Usuario]:
-    return db.query(Usuario).filter(Usuario.rol == "padre").offset(skip).limit(limit).all()
+def get_padres(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[Usuario], Optional[str]]:
+    query = db.query(Usuario).filter(Usuario.rol == "padre")
+    return paginar(query, ORDEN_PADRES, limit, cursor=cursor, skip=skip)
 
 
-def get_padres_with_hijos(db: Session, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+def get_padres_with_hijos(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
     """
-    Obtener lista de padres con sus hijos asociados.
+    Obtener lista de padres con sus hijos asociados y el cursor de la página siguiente.
     """
-    padres = get_padres(db, skip, limit)
+    # Los hijos de todos los padres de la página llegan en una sola consulta extra (selectin)
+    query = db.query(Usuario).filter(Usuario.rol == "padre").options(selectinload(Usuario.hijos))
+    padres, next_cursor = paginar(query, ORDEN_PADRES, limit, cursor=cursor, skip=skip)
     resultado = []
     
     for padre in padres:
-        # Obtener los hijos asociados a este padre
-        hijos = get_hijos_por_padre(db, padre.id_usuario)
+        hijos = padre.hijos
         
         # Crear un diccionario con la información del padre y sus hijos
         padre_dict = {
@@ -117,14 +122,12 @@ def get_padres_with_hijos(db: Session, skip: int = 0, limit: int = 100) -> List[
         
         resultado.append(padre_dict)
     
-    return resultado
+    return resultado, next_cursor
 
 
 def get_padre_por_id(db: Session, id_padre: UUID) -> Optional[Usuario]:
-    return db.query(Usuario).filter(
-        Usuario.id_usuario == id_padre,
-        Usuario.rol == "padre"
-    ).first()
+    usuario = obtener_cargador(db, Usuario).cargar(id_padre)
+    return usuario if usuario is not None and usuario.rol == "padre" else None
 
 
 def get_padre_por_correo(db: Session, correo: str) -> Optional[Usuario]:
@@ -147,20 +150,13 @@ def actualizar_padre(db: Session, id_padre: UUID, nombre: Optional[str] = None,
             if usuario_existente and usuario_existente.id_usuario != id_padre:
                 return padre, False, "El correo electrónico ya está en uso por otro usuario"
         
-        if nombre is not None:
-            padre.nombre = nombre
-        
-        if correo is not None:
-            padre.correo = correo
-        
-        if activo is not None:
-            padre.activo = activo
-        
-        if foto is not None:
-            padre.foto = foto
-        
-        db.commit()
-        db.refresh(padre)
+        cambios = {
+            campo: valor
+            for campo, valor in {"nombre": nombre, "correo": correo, "activo": activo, "foto": foto}.items()
+            if valor is not None
+        }
+        padre = actualizar(db, Usuario, id_padre, cambios)
+        db.flush()
         
         return padre, True, "Datos actualizados correctamente"
     except Exception as e:
@@ -179,8 +175,9 @@ def eliminar_padre(db: Session, id_padre: UUID) -> Tuple[bool, str]:
         for estudiante in estudiantes:
             estudiante.id_padre = None
         
+        invalidar_relaciones_al_confirmar(db, id_padre)
         db.delete(padre)
-        db.commit()
+        db.flush()
         
         return True, "Padre eliminado correctamente"
     except Exception as e:
@@ -200,7 +197,7 @@ def cambiar_contrasena_padre(db: Session, id_padre: UUID, contrasena_actual: str
         
         padre.contrasena_hash = hashear_password(nueva_contrasena)
         
-        db.commit()
+        db.flush()
         
         return True, "Contraseña actualizada correctamente"
     except Exception as e:
@@ -1,13 +1,15 @@
-from pydantic import BaseModel, UUID4, EmailStr, Field, validator
+from dataclasses import dataclass
+from datetime import date
+from pydantic import BaseModel, ConfigDict, UUID4, EmailStr, Field, validator
 from typing import List, Optional, Dict
+from uuid import UUID
 
 # Esquemas para información de estudiantes (hijos)
 class EstudianteHijo(BaseModel):
     id_estudiante: UUID4
     nombre: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Esquema para información de calificaciones
 class NotaEstudiante(BaseModel):
@@ -15,13 +17,11 @@ class NotaEstudiante(BaseModel):
     id_estudiante: UUID4
     id_materia: UUID4
     nombre_materia: str
-    tipo: str
+    trimestre: str
+    valor: str
     descripcion: Optional[str] = None
-    calificacion: float
-    fecha: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Esquema para información de asistencia
 class AsistenciaEstudiante(BaseModel):
@@ -29,12 +29,33 @@ class AsistenciaEstudiante(BaseModel):
     id_estudiante: UUID4
     id_materia: UUID4
     nombre_materia: str
-    fecha: str
+    fecha: date
     estado: str
     comentario: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Filas de los listados de notas y asistencias (app/core/filas.py): se construyen
+# desde la consulta por columnas, en el mismo orden que los campos
+@dataclass(slots=True, frozen=True)
+class NotaFila:
+    id_nota: UUID
+    id_estudiante: UUID
+    id_materia: UUID
+    nombre_materia: str
+    trimestre: str
+    valor: str
+    descripcion: Optional[str]
+
+@dataclass(slots=True, frozen=True)
+class AsistenciaFila:
+    id_asistencia: UUID
+    id_estudiante: UUID
+    id_materia: UUID
+    nombre_materia: str
+    fecha: date
+    estado: str
+    comentario: Optional[str]
 
 # Esquemas para administración de padres
 class PadreBase(BaseModel):
@@ -56,8 +77,7 @@ class PadreOut(PadreBase):
     id_usuario: UUID4
     rol: str = "padre"
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class PadreOutWithHijos(PadreOut):
     hijos: List[EstudianteHijo] = []
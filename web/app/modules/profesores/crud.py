@@ -10,7 +10,13 @@ from app.modules.secciones.models_profesor_seccion import ProfesorSeccion
 from app.modules.materias.models import Materia
 from app.modules.secciones.models import Seccion
 from app.modules.anio_lectivo.models import AnioLectivo
-from sqlalchemy import and_
+from app.modules.profesores.schemas import MateriaProfesorFila, SeccionProfesorFila
+from sqlalchemy import and_, select
+from app.core.cache_http import invalidar_al_confirmar
+from app.db.cargadores import obtener_cargador
+from app.db.escritura import actualizar, insertar
+from app.db.snapshot_referencia import descartar_snapshot_al_confirmar, obtener_snapshot
+from app.modules.usuarios.autorizacion import invalidar_relaciones_al_confirmar
 
 # Para encriptar contraseñas
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -21,17 +27,11 @@ def obtener_profesores(db: Session):
         # Obtener todos los usuarios con rol profesor
         usuarios = db.query(Usuario).filter(Usuario.rol == "profesor").all()
         
-        # Convertir los usuarios a un formato que FastAPI pueda serializar
-        profesores = []
-        for usuario in usuarios:
-            profesor = {
-                "id_profesor": str(usuario.id_usuario),  # Convertir UUID a string
-                "nombre": usuario.nombre,
-                "correo": usuario.correo
-            }
-            profesores.append(profesor)
-        
-        return profesores
+        # El response_model (ProfesorBase) valida y serializa estos diccionarios
+        return [
+            {"id_profesor": usuario.id_usuario, "nombre": usuario.nombre, "correo": usuario.correo}
+            for usuario in usuarios
+        ]
     except Exception as e:
         print(f"Error en obtener_profesores: {e}")
         # En caso de error, devolver una lista vacía en lugar de propagar el error
@@ -40,6 +40,17 @@ def obtener_profesores(db: Session):
 
 def obtener_profesor_por_id(db: Session, id_profesor: uuid.UUID):
     """Obtiene un profesor por su ID"""
+    snapshot = obtener_snapshot()
+    if snapshot is not None:
+        profesor = snapshot.profesor(id_profesor)
+        if profesor is None:
+            return None
+        return {
+            "id_profesor": str(profesor.id_profesor),
+            "nombre": profesor.nombre,
+            "correo": profesor.correo
+        }
+
     try:
         usuario = db.query(Usuario).filter(and_(Usuario.id_usuario == id_profesor, Usuario.rol == "profesor")).first()
         
@@ -57,66 +68,34 @@ def obtener_profesor_por_id(db: Session, id_profesor: uuid.UUID):
         return None
 
 
-def obtener_materias_profesor(db: Session, id_profesor: uuid.UUID, id_anio: Optional[uuid.UUID] = None):
+def obtener_materias_profesor(db: Session, id_profesor: uuid.UUID, id_anio: Optional[uuid.UUID] = None) -> List[MateriaProfesorFila]:
     """Obtiene todas las materias asignadas a un profesor"""
-    query = db.query(
-        Materia.id_materia,
-        Materia.nombre,
-        AnioLectivo.id_anio,
-        AnioLectivo.nombre.label("anio_nombre")
-    ).join(
-        ProfesorMateria, Materia.id_materia == ProfesorMateria.id_materia
-    ).join(
-        AnioLectivo, ProfesorMateria.id_anio == AnioLectivo.id_anio
-    ).filter(
-        ProfesorMateria.id_profesor == id_profesor
+    # Solo las columnas de la respuesta; materia y año en el mismo JOIN
+    consulta = (
+        select(Materia.id_materia, Materia.nombre, AnioLectivo.id_anio, AnioLectivo.nombre)
+        .select_from(ProfesorMateria)
+        .join(ProfesorMateria.materia)
+        .join(ProfesorMateria.anio_lectivo)
+        .where(ProfesorMateria.id_profesor == id_profesor)
     )
     
     if id_anio:
-        query = query.filter(ProfesorMateria.id_anio == id_anio)
-    
-    # Convertir las tuplas en diccionarios
-    results = query.all()
-    materias = [
-        {
-            "id_materia": materia[0],
-            "nombre": materia[1],
-            "id_anio": materia[2],
-            "anio_nombre": materia[3]
-        }
-        for materia in results
-    ]
+        consulta = consulta.where(ProfesorMateria.id_anio == id_anio)
     
-    return materias
+    return [MateriaProfesorFila(*fila) for fila in db.execute(consulta)]
 
 
-def obtener_secciones_profesor(db: Session, id_profesor: uuid.UUID):
+def obtener_secciones_profesor(db: Session, id_profesor: uuid.UUID) -> List[SeccionProfesorFila]:
     """Obtiene todas las secciones asignadas a un profesor"""
-    results = db.query(
-        Seccion.id_seccion,
-        Seccion.nombre,
-        Seccion.grado,
-        AnioLectivo.nombre.label("anio_nombre")
-    ).join(
-        ProfesorSeccion, Seccion.id_seccion == ProfesorSeccion.id_seccion
-    ).join(
-        AnioLectivo, Seccion.id_anio == AnioLectivo.id_anio
-    ).filter(
-        ProfesorSeccion.id_profesor == id_profesor
-    ).all()
-    
-    # Convertir las tuplas en diccionarios
-    secciones = [
-        {
-            "id_seccion": seccion[0],
-            "nombre": seccion[1],
-            "grado": seccion[2],
-            "anio_nombre": seccion[3]
-        }
-        for seccion in results
-    ]
+    consulta = (
+        select(Seccion.id_seccion, Seccion.nombre, Seccion.grado, AnioLectivo.nombre)
+        .select_from(ProfesorSeccion)
+        .join(ProfesorSeccion.seccion)
+        .join(Seccion.anio_lectivo)
+        .where(ProfesorSeccion.id_profesor == id_profesor)
+    )
     
-    return secciones
+    return [SeccionProfesorFila(*fila) for fila in db.execute(consulta)]
 
 
 def asignar_materias_profesor(db: Session, id_profesor: uuid.UUID, id_materias: List[uuid.UUID], id_anio: uuid.UUID):
@@ -140,9 +119,11 @@ def asignar_materias_profesor(db: Session, id_profesor: uuid.UUID, id_materias:
         ).delete(synchronize_session=False)
         
         # Luego creamos las nuevas asignaciones
+        cargador_materias = obtener_cargador(db, Materia, cache_consulta="get_materia")
+        cargador_materias.encolar(id_materias)
         for id_materia in id_materias:
-            # Verificar que la materia exista
-            materia = db.query(Materia).filter(Materia.id_materia == id_materia).first()
+            # Verificar que la materia exista (todas se consultan juntas en la primera vuelta)
+            materia = cargador_materias.cargar(id_materia)
             if not materia:
                 print(f"Error: Materia con ID {id_materia} no encontrada")
                 continue
@@ -154,7 +135,8 @@ def asignar_materias_profesor(db: Session, id_profesor: uuid.UUID, id_materias:
             )
             db.add(asignacion)
         
-        db.commit()
+        invalidar_relaciones_al_confirmar(db, id_profesor)
+        db.flush()
         return True
     except Exception as e:
         db.rollback()
@@ -178,9 +160,11 @@ def asignar_secciones_profesor(db: Session, id_profesor: uuid.UUID, id_secciones
         db.query(ProfesorSeccion).filter(ProfesorSeccion.id_profesor == id_profesor).delete(synchronize_session=False)
         
         # Luego creamos las nuevas asignaciones
+        cargador_secciones = obtener_cargador(db, Seccion, cache_consulta="get_seccion")
+        cargador_secciones.encolar(id_secciones)
         for id_seccion in id_secciones:
-            # Verificar que la sección exista
-            seccion = db.query(Seccion).filter(Seccion.id_seccion == id_seccion).first()
+            # Verificar que la sección exista (todas se consultan juntas en la primera vuelta)
+            seccion = cargador_secciones.cargar(id_seccion)
             if not seccion:
                 print(f"Error: Sección con ID {id_seccion} no encontrada")
                 continue
@@ -191,7 +175,8 @@ def asignar_secciones_profesor(db: Session, id_profesor: uuid.UUID, id_secciones
             )
             db.add(asignacion)
         
-        db.commit()
+        invalidar_relaciones_al_confirmar(db, id_profesor)
+        db.flush()
         return True
     except Exception as e:
         db.rollback()
@@ -206,22 +191,19 @@ def crear_profesor(db: Session, nombre: str, correo: str):
         password = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
         
         # Crear usuario con rol profesor
-        nuevo_usuario = Usuario(
+        nuevo_usuario = insertar(
+            db,
+            Usuario,
             nombre=nombre,
             correo=correo,
             rol="profesor",
             contrasena_hash=pwd_context.hash(password)
         )
-        db.add(nuevo_usuario)
-        db.flush()  # Para obtener el id_usuario generado
         
         # Crear registro en la tabla profesor
-        from app.modules.usuarios.models import Profesor
-        nuevo_profesor = Profesor(id_profesor=nuevo_usuario.id_usuario)
-        db.add(nuevo_profesor)
+        db.add(Profesor(id_profesor=nuevo_usuario.id_usuario))
         
-        db.commit()
-        db.refresh(nuevo_usuario)
+        db.flush()
         
         return {
             "id_profesor": nuevo_usuario.id_usuario,
@@ -249,8 +231,11 @@ def eliminar_profesor(db: Session, id_profesor: uuid.UUID):
         
         # Gracias a la configuración de cascade="all, delete-orphan" en el modelo,
         # al eliminar el usuario también se eliminará automáticamente el registro en la tabla profesor
+        invalidar_relaciones_al_confirmar(db, id_profesor)
+        # El listado de secciones cacheado muestra el nombre del profesor guía
+        invalidar_al_confirmar(db, "secciones")
         db.delete(usuario)
-        db.commit()
+        db.flush()
         return True
     except Exception as e:
         db.rollback()
@@ -286,11 +271,11 @@ def actualizar_profesor(db: Session, id_profesor: uuid.UUID, nombre: str, correo
                 return None
         
         # Actualizamos los datos
-        usuario.nombre = nombre
-        usuario.correo = correo
-        
-        db.commit()
-        db.refresh(usuario)
+        usuario = actualizar(db, Usuario, id_profesor, {"nombre": nombre, "correo": correo})
+        invalidar_al_confirmar(db, "secciones")
+        # La lista de profesores del snapshot copia nombre y correo
+        descartar_snapshot_al_confirmar(db, "usuario")
+        db.flush()
         
         return {
             "id_profesor": str(usuario.id_usuario),  # Convertir UUID a string
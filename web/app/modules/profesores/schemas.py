@@ -1,14 +1,14 @@
-from pydantic import BaseModel, UUID4, EmailStr
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, UUID4, EmailStr
 from typing import List, Optional
+from uuid import UUID
 
 class ProfesorBase(BaseModel):
     id_profesor: UUID4
     nombre: str
     correo: str
     
-    class Config:
-        orm_mode = True
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ProfesorCreate(BaseModel):
     nombre: str
@@ -23,9 +23,7 @@ class ProfesorCreated(BaseModel):
     nombre: str
     correo: str
     
-    class Config:
-        orm_mode = True
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ProfesorMateriasAsignacion(BaseModel):
     id_profesor: UUID4
@@ -36,12 +34,34 @@ class ProfesorSeccionesAsignacion(BaseModel):
     id_profesor: UUID4
     id_secciones: List[UUID4]
 
+# Filas de listados (app/core/filas.py): se construyen desde la consulta por
+# columnas, en el mismo orden que los campos
+@dataclass(slots=True, frozen=True)
+class ProfesorFila:
+    id_profesor: UUID
+    nombre: str
+    correo: str
+
+@dataclass(slots=True, frozen=True)
+class MateriaProfesorFila:
+    id_materia: UUID
+    nombre: str
+    id_anio: UUID
+    anio_nombre: str
+
+@dataclass(slots=True, frozen=True)
+class SeccionProfesorFila:
+    id_seccion: UUID
+    nombre: str
+    grado: str
+    anio_nombre: str
+
 class ProfesorConMaterias(ProfesorBase):
-    materias: List[dict]
+    materias: List[MateriaProfesorFila]
 
 class ProfesorConSecciones(ProfesorBase):
-    secciones: List[dict]
+    secciones: List[SeccionProfesorFila]
 
 class ProfesorCompleto(ProfesorBase):
-    materias: List[dict]
-    secciones: List[dict]
+    materias: List[MateriaProfesorFila]
+    secciones: List[SeccionProfesorFila]
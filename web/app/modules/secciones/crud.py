@@ -1,20 +1,28 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Tuple, Union
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import select, join
 from fastapi.encoders import jsonable_encoder
 
+from app.core.paginacion import paginar
+from app.core.cache_http import invalidar_al_confirmar
+from app.db.cargadores import obtener_cargador
+from app.db.escritura import actualizar, insertar
+from app.db.snapshot_referencia import SeccionRef, obtener_snapshot
+
 from app.modules.secciones.models import Seccion
 from app.modules.secciones.models_profesor_seccion import ProfesorSeccion
 from app.modules.secciones.schemas import SeccionCreate, SeccionUpdate
 from app.modules.usuarios.models import Usuario, Profesor
+from app.modules.profesores.schemas import ProfesorFila
 
 
 def get_seccion(db: Session, id_seccion: UUID) -> Optional[Seccion]:
-    return db.query(Seccion).filter(Seccion.id_seccion == id_seccion).first()
+    return obtener_cargador(db, Seccion, cache_consulta="get_seccion").cargar(id_seccion)
 
 
 def get_seccion_by_nombre_grado_anio(db: Session, nombre: str, grado: str, id_anio: UUID) -> Optional[Seccion]:
+    # Sin caché: valida la unicidad dentro de la transacción de escritura
     return db.query(Seccion).filter(
         Seccion.nombre == nombre,
         Seccion.grado == grado,
@@ -22,42 +30,65 @@ def get_seccion_by_nombre_grado_anio(db: Session, nombre: str, grado: str, id_an
     ).first()
 
 
-def get_secciones(db: Session, skip: int = 0, limit: int = 100) -> List[Seccion]:
-    return db.query(Seccion).offset(skip).limit(limit).all()
+def get_seccion_ref(db: Session, id_seccion: UUID) -> Optional[Union[SeccionRef, Seccion]]:
+    """Sección de solo lectura desde el snapshot compartido; sin snapshot, desde la base de datos"""
+    snapshot = obtener_snapshot()
+    if snapshot is None:
+        return get_seccion(db, id_seccion)
+    return snapshot.seccion(id_seccion)
+
+
+def get_nombre_profesor_guia(db: Session, id_profesor_guia: Optional[UUID]) -> Optional[str]:
+    if not id_profesor_guia:
+        return None
+    snapshot = obtener_snapshot()
+    profesor = snapshot.profesor(id_profesor_guia) if snapshot is not None else None
+    if profesor is not None:
+        return profesor.nombre
+    usuario = obtener_cargador(db, Usuario).cargar(id_profesor_guia)
+    return usuario.nombre if usuario else None
+
+
+# Orden estable por grado y nombre; el ID desempata
+ORDEN_SECCIONES = [Seccion.grado, Seccion.nombre, Seccion.id_seccion]
 
 
-def get_secciones_by_anio(db: Session, id_anio: UUID, skip: int = 0, limit: int = 100) -> List[Seccion]:
-    return db.query(Seccion).filter(Seccion.id_anio == id_anio).offset(skip).limit(limit).all()
+def get_secciones(
+    db: Session, skip: int = 0, limit: Optional[int] = 100, cursor: Optional[str] = None
+) -> Tuple[List[Seccion], Optional[str]]:
+    return paginar(db.query(Seccion), ORDEN_SECCIONES, limit, cursor=cursor, skip=skip)
+
+
+def get_secciones_by_anio(
+    db: Session, id_anio: UUID, skip: int = 0, limit: Optional[int] = 100, cursor: Optional[str] = None
+) -> Tuple[List[Seccion], Optional[str]]:
+    query = db.query(Seccion).filter(Seccion.id_anio == id_anio)
+    return paginar(query, ORDEN_SECCIONES, limit, cursor=cursor, skip=skip)
 
 
 def create_seccion(db: Session, seccion: SeccionCreate) -> Seccion:
-    db_seccion = Seccion(
+    db_seccion = insertar(
+        db,
+        Seccion,
         nombre=seccion.nombre,
         grado=seccion.grado,
         id_profesor_guia=seccion.id_profesor_guia,
         id_anio=seccion.id_anio
     )
     
-    db.add(db_seccion)
-    db.commit()
-    db.refresh(db_seccion)
+    invalidar_al_confirmar(db, "secciones")
+    db.flush()
     
     return db_seccion
 
 
 def update_seccion(db: Session, id_seccion: UUID, seccion_in: SeccionUpdate) -> Optional[Seccion]:
-    db_seccion = get_seccion(db, id_seccion)
+    db_seccion = actualizar(db, Seccion, id_seccion, seccion_in.dict(exclude_unset=True))
     if not db_seccion:
         return None
     
-    update_data = seccion_in.dict(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        setattr(db_seccion, field, value)
-    
-    db.add(db_seccion)
-    db.commit()
-    db.refresh(db_seccion)
+    invalidar_al_confirmar(db, "secciones")
+    db.flush()
     
     return db_seccion
 
@@ -68,34 +99,22 @@ def delete_seccion(db: Session, id_seccion: UUID) -> Optional[Seccion]:
         return None
         
     db.delete(db_seccion)
-    db.commit()
+    invalidar_al_confirmar(db, "secciones")
+    db.flush()
     
     return db_seccion
 
 
-def get_profesores_by_seccion(db: Session, id_seccion: UUID) -> List[Dict[str, Any]]:
+def get_profesores_by_seccion(db: Session, id_seccion: UUID) -> List[ProfesorFila]:
     db_seccion = get_seccion(db, id_seccion=id_seccion)
     if db_seccion is None:
         return []
     
-    query = (
-        db.query(
-            Usuario.id_usuario.label('id_profesor'),
-            Usuario.nombre,
-            Usuario.correo
-        )
-        .join(Profesor, Profesor.id_profesor == Usuario.id_usuario)
-        .join(ProfesorSeccion, ProfesorSeccion.id_profesor == Profesor.id_profesor)
-        .filter(ProfesorSeccion.id_seccion == id_seccion)
+    consulta = (
+        select(Usuario.id_usuario, Usuario.nombre, Usuario.correo)
+        .join(Usuario.profesor)
+        .join(Profesor.secciones)
+        .where(ProfesorSeccion.id_seccion == id_seccion)
     )
     
-    profesores = []
-    for row in query.all():
-        profesor = {
-            "id_profesor": row.id_profesor,
-            "nombre": row.nombre,
-            "correo": row.correo
-        }
-        profesores.append(profesor)
-    
-    return profesores
+    return [ProfesorFila(*fila) for fila in db.execute(consulta)]
@@ -1,5 +1,5 @@
 from uuid import UUID
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -8,9 +8,18 @@ import uuid
 
 class Seccion(Base):
     __tablename__ = "seccion"
+    __table_args__ = (
+        Index("ix_seccion_grado_nombre_id", "grado", "nombre", "id_seccion"),
+    )
 
     id_seccion = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nombre = Column(String(20), nullable=False)
     grado = Column(String(20), nullable=False)
     id_profesor_guia = Column(PostgresUUID(as_uuid=True), ForeignKey("usuario.id_usuario"), nullable=True)
     id_anio = Column(PostgresUUID(as_uuid=True), ForeignKey("anio_lectivo.id_anio", ondelete="CASCADE"), nullable=False)
+
+    # Sin carga implícita: los listados piden joinedload(Seccion.profesor_guia) cuando lo necesitan
+    profesor_guia = relationship("Usuario", lazy="raise")
+    anio_lectivo = relationship("AnioLectivo", lazy="raise")
+    estudiantes = relationship("Estudiante", lazy="raise", passive_deletes=True)
+    profesores = relationship("ProfesorSeccion", back_populates="seccion", lazy="raise", passive_deletes=True)
@@ -9,3 +9,6 @@ class ProfesorSeccion(Base):
 
     id_profesor = Column(PostgresUUID(as_uuid=True), ForeignKey("profesor.id_profesor", ondelete="CASCADE"), primary_key=True)
     id_seccion = Column(PostgresUUID(as_uuid=True), ForeignKey("seccion.id_seccion", ondelete="CASCADE"), primary_key=True)
+
+    profesor = relationship("Profesor", back_populates="secciones", lazy="raise")
+    seccion = relationship("Seccion", back_populates="profesores", lazy="joined", innerjoin=True)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 
 class SeccionBase(BaseModel):
     nombre: str = Field(..., min_length=1, max_length=20, description="Nombre de la sección")
@@ -25,17 +25,16 @@ class ProfesorBase(BaseModel):
     nombre: str
     correo: EmailStr
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Seccion(SeccionBase):
     id_seccion: UUID
     profesor_guia_nombre: Optional[str] = None
 
-    class Config:
-        orm_mode = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id_seccion": "550e8400-e29b-41d4-a716-446655440000",
                 "nombre": "A",
@@ -44,15 +43,16 @@ class Seccion(SeccionBase):
                 "id_anio": "550e8400-e29b-41d4-a716-446655440002",
                 "profesor_guia_nombre": "Juan Pérez"
             }
-        }
+        },
+    )
 
 
 class SeccionConProfesores(Seccion):
     profesores: List[ProfesorBase] = []
 
-    class Config:
-        orm_mode = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id_seccion": "550e8400-e29b-41d4-a716-446655440000",
                 "nombre": "A",
@@ -67,4 +67,5 @@ class SeccionConProfesores(Seccion):
                     }
                 ]
             }
-        }
+        },
+    )
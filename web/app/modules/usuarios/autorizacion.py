@@ -0,0 +1,172 @@
+"""
+Autorización por relaciones: qué estudiantes son hijos de un padre y qué secciones
+y materias tiene asignadas un profesor.
+
+Cada worker guarda por usuario sus relaciones (cargadas con una sola consulta) y los
+routers preguntan con `autorizar(db, usuario, Recurso(...))` en lugar de consultar
+la propiedad en cada petición. Las funciones de crud que cambian estas relaciones
+llaman a `invalidar_relaciones_al_confirmar`, que las descarta en todos los workers
+por el bus de invalidación.
+
+También guarda el rol vigente de cada usuario, que la caché HTTP consulta antes de
+servir una respuesta guardada: la misma comprobación que hace `get_current_user`
+(el usuario sigue existiendo), sin abrir sesión mientras esté en la copia. Las
+eliminaciones de usuarios ya invalidan sus relaciones y con ellas su rol.
+"""
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.configs import settings
+from app.core.invalidacion import obtener_bus
+from app.db.session import SessionLocal
+from app.modules.estudiantes.models import Estudiante
+from app.modules.materias.models_profesor_materia import ProfesorMateria
+from app.modules.secciones.models_profesor_seccion import ProfesorSeccion
+from app.modules.usuarios.models import Usuario
+
+NOMBRE_CACHE = "relaciones"
+
+RECURSO_ESTUDIANTE = "estudiante"
+RECURSO_SECCION = "seccion"
+RECURSO_MATERIA = "materia"
+
+
+class Recurso(NamedTuple):
+    tipo: str  # "estudiante", "seccion" o "materia"
+    id: UUID
+
+
+class Relaciones(NamedTuple):
+    hijos: FrozenSet[UUID] = frozenset()
+    secciones: FrozenSet[UUID] = frozenset()
+    materias: FrozenSet[UUID] = frozenset()
+
+
+# Copia por worker: id_usuario -> (relaciones, instante de carga)
+_relaciones_cache: Dict[UUID, Tuple[Relaciones, float]] = {}
+# id_usuario -> (rol, o None si el usuario ya no existe; instante de carga)
+_roles_cache: Dict[UUID, Tuple[Optional[str], float]] = {}
+_relaciones_lock = threading.Lock()
+_registrado = False
+# Aumenta con cada invalidación; relaciones leídas mientras cambiaban no se guardan
+_generacion = 0
+
+
+def _registrar() -> None:
+    global _registrado
+    with _relaciones_lock:
+        if _registrado:
+            return
+        _registrado = True
+    obtener_bus().registrar(NOMBRE_CACHE, invalidar=_descartar, limpiar=_limpiar)
+
+
+def _descartar(ids_usuarios: Iterable[str]) -> None:
+    global _generacion
+    with _relaciones_lock:
+        _generacion += 1
+        for id_usuario in ids_usuarios:
+            _relaciones_cache.pop(UUID(id_usuario), None)
+            _roles_cache.pop(UUID(id_usuario), None)
+
+
+def _limpiar() -> None:
+    global _generacion
+    with _relaciones_lock:
+        _generacion += 1
+        _relaciones_cache.clear()
+        _roles_cache.clear()
+
+
+def invalidar_relaciones_al_confirmar(db: Session, *ids_usuarios: Optional[UUID]) -> None:
+    """Descarta las relaciones de estos usuarios en todos los workers cuando `db` confirme"""
+    ids = [str(id_usuario) for id_usuario in ids_usuarios if id_usuario]
+    if ids:
+        _registrar()
+        obtener_bus().invalidar_al_confirmar(db, NOMBRE_CACHE, ids)
+
+
+def _cargar(db: Session, id_usuario: UUID, rol: str) -> Relaciones:
+    if rol == "padre":
+        hijos = db.execute(
+            select(Estudiante.id_estudiante).where(Estudiante.id_padre == id_usuario)
+        ).scalars()
+        return Relaciones(hijos=frozenset(hijos))
+
+    if rol == "profesor":
+        filas = db.execute(union_all(
+            select(literal(RECURSO_SECCION), ProfesorSeccion.id_seccion).where(ProfesorSeccion.id_profesor == id_usuario),
+            select(literal(RECURSO_MATERIA), ProfesorMateria.id_materia).where(ProfesorMateria.id_profesor == id_usuario),
+        )).all()
+        return Relaciones(
+            secciones=frozenset(id_recurso for tipo, id_recurso in filas if tipo == RECURSO_SECCION),
+            materias=frozenset(id_recurso for tipo, id_recurso in filas if tipo == RECURSO_MATERIA),
+        )
+
+    return Relaciones()
+
+
+def obtener_relaciones(db: Session, id_usuario: UUID, rol: str) -> Relaciones:
+    _registrar()
+    with _relaciones_lock:
+        entrada, generacion = _relaciones_cache.get(id_usuario), _generacion
+    if entrada is not None and time.monotonic() - entrada[1] <= settings.AUTORIZACION_CACHE_TTL:
+        return entrada[0]
+
+    relaciones = _cargar(db, id_usuario, rol)
+    with _relaciones_lock:
+        if generacion == _generacion:
+            _relaciones_cache[id_usuario] = (relaciones, time.monotonic())
+    return relaciones
+
+
+def rol_en_cache(id_usuario: UUID) -> Tuple[bool, Optional[str]]:
+    """(encontrado, rol) desde la copia del worker, sin consultar"""
+    _registrar()
+    with _relaciones_lock:
+        entrada = _roles_cache.get(id_usuario)
+    if entrada is not None and time.monotonic() - entrada[1] <= settings.AUTORIZACION_CACHE_TTL:
+        return True, entrada[0]
+    return False, None
+
+
+def rol_vigente(id_usuario: UUID) -> Optional[str]:
+    """Rol actual del usuario o None si ya no existe; consulta con su propia sesión si no está en la copia"""
+    encontrado, rol = rol_en_cache(id_usuario)
+    if encontrado:
+        return rol
+
+    with _relaciones_lock:
+        generacion = _generacion
+    db = SessionLocal()
+    try:
+        rol = db.execute(select(Usuario.rol).where(Usuario.id_usuario == id_usuario)).scalar_one_or_none()
+    finally:
+        db.close()
+    with _relaciones_lock:
+        if generacion == _generacion:
+            _roles_cache[id_usuario] = (rol, time.monotonic())
+    return rol
+
+
+def autorizar(db: Session, usuario, recurso: Recurso) -> bool:
+    """
+    Indica si `usuario` puede acceder a `recurso`: la dirección a todo, un padre a sus
+    hijos y un profesor a las secciones y materias que tiene asignadas
+    """
+    if usuario.rol == "direccion":
+        return True
+
+    relaciones = obtener_relaciones(db, usuario.id_usuario, usuario.rol)
+    if recurso.tipo == RECURSO_ESTUDIANTE:
+        return recurso.id in relaciones.hijos
+    if recurso.tipo == RECURSO_SECCION:
+        return recurso.id in relaciones.secciones
+    if recurso.tipo == RECURSO_MATERIA:
+        return recurso.id in relaciones.materias
+    return False
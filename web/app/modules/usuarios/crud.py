@@ -1,6 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 from app.modules.usuarios.models import Usuario
 from app.modules.usuarios.schemas import UsuarioCreate
+from app.modules.usuarios.autorizacion import invalidar_relaciones_al_confirmar
+from app.core.cache_http import invalidar_al_confirmar
+from app.core.campos import Campos, proyectar
+from app.db.cargadores import obtener_cargador
+from app.db.escritura import actualizar, insertar
 from app.core.security import verificar_password, hashear_password
 from app.core.utils import generar_contrasena_segura
 from typing import Optional, Tuple, List
@@ -8,7 +13,8 @@ import uuid
 
 
 def autenticar_usuario(session: Session, correo: str, contrasena: str) -> Optional[Usuario]:
-    usuario = obtener_usuario_por_correo(session, correo)
+    # contrasena_hash es diferida: se pide en la misma consulta
+    usuario = session.query(Usuario).options(undefer(Usuario.contrasena_hash)).filter(Usuario.correo == correo).first()
     if not usuario:
         return None
     if not verificar_password(contrasena, usuario.contrasena_hash):
@@ -24,12 +30,8 @@ def actualizar_contrasena(session: Session, usuario_id: uuid.UUID, contrasena_ac
     if not verificar_password(contrasena_actual, usuario.contrasena_hash):
         return usuario, False
     
-    usuario.contrasena_hash = hashear_password(nueva_contrasena)
-    
-    session.commit()
-    session.refresh(usuario)
-    session.commit()
-    session.refresh(usuario)
+    usuario = actualizar(session, Usuario, usuario_id, {"contrasena_hash": hashear_password(nueva_contrasena)})
+    session.flush()
     
     return usuario, True
 
@@ -43,36 +45,38 @@ def restaurar_contrasena(session: Session, correo: str) -> Tuple[Usuario, str, b
         return usuario, "", False
     
     nueva_contrasena = generar_contrasena_segura(usuario.correo, usuario.nombre)
-    usuario.contrasena_hash = hashear_password(nueva_contrasena)
-    session.commit()
-    session.refresh(usuario)
+    usuario = actualizar(session, Usuario, usuario.id_usuario, {"contrasena_hash": hashear_password(nueva_contrasena)})
+    session.flush()
     
     return usuario, nueva_contrasena, True
 
 
 def obtener_usuario_por_id(session: Session, usuario_id: uuid.UUID) -> Optional[Usuario]:
-    return session.query(Usuario).filter(Usuario.id_usuario == usuario_id).first()
+    return obtener_cargador(session, Usuario).cargar(usuario_id)
 
 
 def obtener_usuario_por_correo(session: Session, correo: str) -> Optional[Usuario]:
     return session.query(Usuario).filter(Usuario.correo == correo).first()
 
 
-def obtener_usuarios_por_rol(session: Session, rol: str) -> List[Usuario]:
-    return session.query(Usuario).filter(Usuario.rol == rol, Usuario.activo == True).all()
+def obtener_usuarios_por_rol(session: Session, rol: str, campos: Optional[Campos] = None) -> List[Usuario]:
+    query = session.query(Usuario).filter(Usuario.rol == rol, Usuario.activo == True)
+    return proyectar(query, Usuario, campos).all()
 
 
-def get_usuarios_activos(session: Session) -> List[Usuario]:
+def get_usuarios_activos(session: Session, campos: Optional[Campos] = None) -> List[Usuario]:
     """
     Obtiene todos los usuarios activos en el sistema.
     
     Args:
         session: Sesión de la base de datos
+        campos: Columnas a cargar (por defecto todas)
         
     Returns:
         Lista de usuarios activos
     """
-    return session.query(Usuario).filter(Usuario.activo == True).all()
+    query = session.query(Usuario).filter(Usuario.activo == True)
+    return proyectar(query, Usuario, campos).all()
 
 
 def crear_usuario(session: Session, usuario_base: UsuarioCreate) -> Tuple[Usuario, Optional[str]]:
@@ -83,7 +87,9 @@ def crear_usuario(session: Session, usuario_base: UsuarioCreate) -> Tuple[Usuari
     else:
         contrasena = usuario_base.contrasena
     
-    usuario = Usuario(
+    usuario = insertar(
+        session,
+        Usuario,
         id_usuario=uuid.uuid4(),
         nombre=usuario_base.nombre,
         correo=usuario_base.correo,
@@ -92,17 +98,12 @@ def crear_usuario(session: Session, usuario_base: UsuarioCreate) -> Tuple[Usuari
         activo=usuario_base.activo,
         foto=usuario_base.foto
     )
-    
-    session.add(usuario)
-    session.flush()  
 
     if usuario.rol == "profesor":
         from app.modules.usuarios.models import Profesor
-        profesor = Profesor(id_profesor=usuario.id_usuario)
-        session.add(profesor)
+        session.add(Profesor(id_profesor=usuario.id_usuario))
     
-    session.commit()
-    session.refresh(usuario)
+    session.flush()
     
     return usuario, contrasena_generada
 
@@ -111,8 +112,11 @@ def eliminar_usuario_por_id(session: Session, usuario_id: uuid.UUID) -> bool:
     usuario = obtener_usuario_por_id(session, usuario_id)
     if not usuario:
         return False
+    invalidar_relaciones_al_confirmar(session, usuario_id)
+    # El listado de secciones cacheado muestra el nombre del profesor guía
+    invalidar_al_confirmar(session, "secciones")
     session.delete(usuario)
-    session.commit()
+    session.flush()
     return True
 
 
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Boolean, Text, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, String, Boolean, Text, Enum as SQLEnum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 import uuid
 from app.db.base_class import Base
 from enum import Enum as PyEnum
@@ -12,17 +12,23 @@ class Rol(str, PyEnum):
 
 class Usuario(Base):
     __tablename__ = "usuario"
+    __table_args__ = (
+        Index("ix_usuario_rol_nombre_id", "rol", "nombre", "id_usuario"),
+    )
 
     id_usuario = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nombre = Column(String(100), nullable=False)
     correo = Column(String(100), unique=True, nullable=False)
     rol = Column(SQLEnum("direccion", "profesor", "padre", name="rol_enum"), nullable=False)
-    contrasena_hash = Column(Text, nullable=False)
+    # Nunca se devuelve: se carga solo al verificar o cambiar la contraseña
+    contrasena_hash = deferred(Column(Text, nullable=False))
     activo = Column(Boolean, default=False)
     foto = Column(Text, nullable=True)
     
     profesor = relationship("Profesor", back_populates="usuario", uselist=False, cascade="all, delete-orphan")
     notificaciones = relationship("Notificacion", back_populates="usuario", cascade="all, delete-orphan")
+    # Solo para padres; la base de datos deja id_padre en NULL al eliminar el usuario
+    hijos = relationship("Estudiante", back_populates="padre", lazy="raise", passive_deletes=True)
 
 class Profesor(Base):
     __tablename__ = "profesor"
@@ -30,3 +36,5 @@ class Profesor(Base):
     id_profesor = Column(UUID(as_uuid=True), ForeignKey("usuario.id_usuario", ondelete="CASCADE"), primary_key=True)
 
     usuario = relationship("Usuario", back_populates="profesor")
+    materias = relationship("ProfesorMateria", back_populates="profesor", lazy="raise", passive_deletes=True)
+    secciones = relationship("ProfesorSeccion", back_populates="profesor", lazy="raise", passive_deletes=True)
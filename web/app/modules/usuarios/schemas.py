@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, UUID4, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, UUID4, validator
 from typing import Optional, Literal
 
 class UsuarioBase(BaseModel):
@@ -12,8 +12,7 @@ class UsuarioBase(BaseModel):
 class UsuarioOut(UsuarioBase):
     id_usuario: UUID4
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UsuarioLogin(BaseModel):
@@ -0,0 +1,199 @@
+"""
+Medición local de la serialización de respuestas, esquema por esquema de app/modules/*/schemas.py.
+
+    python -m benchmarks.medicion_esquemas                        # 1000 objetos por esquema
+    python -m benchmarks.medicion_esquemas --filas 10000 --modulo notificacion
+
+Toma los esquemas de respuesta (los que tienen `from_attributes`), genera `--filas` objetos
+con atributos, como las instancias ORM que devuelven los crud, y mide el mejor tiempo de
+las repeticiones desde los objetos hasta los bytes JSON por tres caminos:
+
+- "pydantic-core": el de FastAPI con `response_model`: un TypeAdapter(List[esquema])
+  compilado una vez valida desde atributos y vuelca directamente a JSON.
+- "dict + json": validar igual, volcar a tipos JSON en Python (`dump_python`) y
+  codificar con el `json` de la biblioteca estándar, como una JSONResponse.
+- "jsonable_encoder": validar igual y pasar el resultado por `jsonable_encoder` y
+  JSONResponse, el camino de una ruta sin `response_model`.
+
+Comprueba además que los tres produzcan el mismo JSON. Los valores salen de la anotación
+y las restricciones de cada campo; un esquema con campos que no se saben generar (o que
+sus validadores rechazan) se lista aparte.
+"""
+import argparse
+import dataclasses
+import importlib
+import inspect
+import json
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from types import SimpleNamespace
+from typing import (
+    Annotated, Callable, Dict, List, Literal, Optional, Tuple, Type, Union, get_args, get_origin, get_type_hints
+)
+
+from annotated_types import MaxLen, MinLen
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, EmailStr, TypeAdapter, ValidationError
+
+DIRECTORIO_MODULOS = Path(__file__).resolve().parent.parent / "app" / "modules"
+INICIO = datetime(2025, 2, 3, 7, 0)
+
+
+class TipoNoSoportado(Exception):
+    pass
+
+
+def esquemas_de_respuesta(modulo: Optional[str] = None) -> List[Type[BaseModel]]:
+    """Esquemas con `from_attributes` definidos en cada app/modules/*/schemas.py"""
+    esquemas = []
+    for ruta in sorted(DIRECTORIO_MODULOS.glob("*/schemas.py")):
+        if modulo is not None and ruta.parent.name != modulo:
+            continue
+        esquemas_modulo = importlib.import_module(f"app.modules.{ruta.parent.name}.schemas")
+        for clase in vars(esquemas_modulo).values():
+            if (
+                inspect.isclass(clase) and issubclass(clase, BaseModel)
+                and clase.__module__ == esquemas_modulo.__name__ and clase.model_config.get("from_attributes")
+            ):
+                esquemas.append(clase)
+    return esquemas
+
+
+def _texto(nombre: str, indice: int, restricciones: list) -> str:
+    texto = f"{nombre}-{indice}"
+    for restriccion in restricciones:
+        if isinstance(restriccion, MaxLen):
+            texto = texto[:restriccion.max_length]
+        elif isinstance(restriccion, MinLen):
+            texto = texto.ljust(restriccion.min_length, "x")
+    return texto
+
+
+def _valor(nombre: str, anotacion, restricciones: list, indice: int, aleatorio: random.Random):
+    origen = get_origin(anotacion)
+    if origen is Annotated:
+        tipo, *extra = get_args(anotacion)
+        return _valor(nombre, tipo, restricciones + extra, indice, aleatorio)
+    if origen is Union:
+        tipos = [tipo for tipo in get_args(anotacion) if tipo is not type(None)]
+        # Un tercio de los opcionales en None, como las columnas nulas
+        if len(tipos) < len(get_args(anotacion)) and indice % 3 == 2:
+            return None
+        return _valor(nombre, tipos[0], restricciones, indice, aleatorio)
+    if origen in (list, List):
+        return [_valor(nombre, get_args(anotacion)[0], [], indice * 2 + k, aleatorio) for k in range(2)]
+    if origen is Literal:
+        return get_args(anotacion)[0]
+    if anotacion is EmailStr:
+        return f"usuario{indice}@escuela.cr"
+    if not inspect.isclass(anotacion):
+        raise TipoNoSoportado(repr(anotacion))
+    if issubclass(anotacion, BaseModel):
+        return _objeto(anotacion, indice, aleatorio)
+    if dataclasses.is_dataclass(anotacion):
+        # Filas de app/core/filas.py: los crud ya las devuelven construidas
+        tipos = get_type_hints(anotacion)
+        return anotacion(**{
+            campo.name: _valor(campo.name, tipos[campo.name], [], indice, aleatorio)
+            for campo in dataclasses.fields(anotacion)
+        })
+    if issubclass(anotacion, Enum):
+        miembros = list(anotacion)
+        return miembros[indice % len(miembros)]
+    if anotacion is uuid.UUID:
+        return uuid.UUID(int=aleatorio.getrandbits(128), version=4)
+    if anotacion is bool:
+        return indice % 2 == 0
+    if anotacion is int:
+        return indice
+    if anotacion is float:
+        return indice / 10
+    if anotacion is Decimal:
+        return Decimal(indice) / 100
+    if anotacion is datetime:
+        return INICIO + timedelta(minutes=indice)
+    if anotacion is date:
+        return INICIO.date() + timedelta(days=indice % 300)
+    if anotacion is str:
+        return _texto(nombre, indice, restricciones)
+    if anotacion is dict:
+        return {}
+    raise TipoNoSoportado(repr(anotacion))
+
+
+def _objeto(esquema: Type[BaseModel], indice: int, aleatorio: random.Random) -> SimpleNamespace:
+    return SimpleNamespace(**{
+        campo.validation_alias if isinstance(campo.validation_alias, str) else (campo.alias or nombre):
+            _valor(nombre, campo.annotation, campo.metadata, indice, aleatorio)
+        for nombre, campo in esquema.model_fields.items()
+    })
+
+
+def generar_objetos(esquema: Type[BaseModel], cantidad: int, semilla: int = 7) -> List[SimpleNamespace]:
+    aleatorio = random.Random(semilla)
+    return [_objeto(esquema, indice, aleatorio) for indice in range(cantidad)]
+
+
+def caminos(esquema: Type[BaseModel]) -> Dict[str, Callable[[list], bytes]]:
+    adaptador = TypeAdapter(List[esquema])
+
+    def pydantic_core(objetos: list) -> bytes:
+        return adaptador.dump_json(adaptador.validate_python(objetos, from_attributes=True))
+
+    def dict_json(objetos: list) -> bytes:
+        return JSONResponse(adaptador.dump_python(adaptador.validate_python(objetos, from_attributes=True), mode="json")).body
+
+    def codificador(objetos: list) -> bytes:
+        return JSONResponse(jsonable_encoder(adaptador.validate_python(objetos, from_attributes=True))).body
+
+    return {"pydantic-core": pydantic_core, "dict + json": dict_json, "jsonable_encoder": codificador}
+
+
+def medir(funcion: Callable[[list], bytes], objetos: list, repeticiones: int) -> Tuple[float, bytes]:
+    """(mejor tiempo en s, cuerpo)"""
+    cuerpo = funcion(objetos)
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(objetos)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, cuerpo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara la serialización de respuestas por esquema")
+    parser.add_argument("--filas", type=int, default=1000, help="Objetos por esquema")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--modulo", help="Solo los esquemas de app/modules/<modulo>/schemas.py")
+    args = parser.parse_args()
+
+    omitidos = []
+    print(f"{args.filas} objetos por esquema, mejor de {args.repeticiones}\n")
+    print(f"{'esquema':<42}{'pydantic-core':>14}{'dict + json':>14}{'jsonable_encoder':>18}{'JSON':>11}")
+    for esquema in esquemas_de_respuesta(args.modulo):
+        nombre = f"{esquema.__module__.split('.')[2]}.{esquema.__name__}"
+        try:
+            objetos = generar_objetos(esquema, args.filas)
+            resultados = {camino: medir(funcion, objetos, args.repeticiones) for camino, funcion in caminos(esquema).items()}
+        except (TipoNoSoportado, ValidationError) as e:
+            omitidos.append(f"{nombre}: {e.__class__.__name__} {str(e).splitlines()[0]}")
+            continue
+        cuerpos = [json.loads(cuerpo) for _, cuerpo in resultados.values()]
+        marca = "" if all(cuerpo == cuerpos[0] for cuerpo in cuerpos) else "  (JSON distinto)"
+        tiempos = [f"{segundos * 1000:.1f} ms" for segundos, _ in resultados.values()]
+        tamano = len(resultados["pydantic-core"][1]) / 1024
+        print(f"{nombre:<42}{tiempos[0]:>14}{tiempos[1]:>14}{tiempos[2]:>18}{tamano:>8.0f} KB{marca}")
+    if omitidos:
+        print("\nOmitidos:")
+        for omitido in omitidos:
+            print(f"  {omitido}")
+
+
+if __name__ == "__main__":
+    main()
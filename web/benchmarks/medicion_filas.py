@@ -0,0 +1,108 @@
+"""
+Medición local de la serialización de listados: filas con `__slots__` y `responder_filas`
+frente al camino anterior (un diccionario por fila validado contra el `response_model`).
+
+    python -m benchmarks.medicion_filas                    # 100 000 asistencias, 5 repeticiones
+    python -m benchmarks.medicion_filas --filas 20000 --repeticiones 3
+
+Las filas son tuplas con las columnas de la consulta de asistencias de un estudiante
+(uuid, str, date y texto nulo), como las `Row` que devuelve la base de datos. Para cada
+camino mide el mejor tiempo de las repeticiones y el pico de memoria (tracemalloc) desde
+la fila hasta los bytes JSON de la respuesta, y comprueba que los dos cuerpos sean
+idénticos byte a byte.
+
+- "diccionarios": lo que hacía FastAPI con `return [dict, ...]`: validar la lista con el
+  `response_model` (List[AsistenciaEstudiante]), volcarla a tipos JSON y codificarla
+  como JSONResponse.
+- "filas": `AsistenciaFila(*fila)` por fila y `responder_filas` (TypeAdapter cacheado).
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+from typing import Callable, List, Tuple
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.filas import responder_filas
+from app.modules.padres.schemas import AsistenciaEstudiante, AsistenciaFila
+
+ESTADOS = ("presente", "ausente", "tardía", "justificada")
+MATERIAS = ("Matemáticas", "Español", "Ciencias", "Estudios Sociales", "Inglés", "Música")
+
+
+def generar_filas(cantidad: int, semilla: int = 7) -> List[tuple]:
+    aleatorio = random.Random(semilla)
+    id_estudiante = uuid.UUID(int=aleatorio.getrandbits(128), version=4)
+    materias = [(uuid.UUID(int=aleatorio.getrandbits(128), version=4), nombre) for nombre in MATERIAS]
+    inicio = date(2025, 2, 3)
+    filas = []
+    for indice in range(cantidad):
+        id_materia, nombre_materia = materias[indice % len(materias)]
+        filas.append((
+            uuid.UUID(int=aleatorio.getrandbits(128), version=4),
+            id_estudiante,
+            id_materia,
+            nombre_materia,
+            inicio + timedelta(days=indice % 200),
+            aleatorio.choice(ESTADOS),
+            "Llegó con justificación" if aleatorio.random() < 0.2 else None,
+        ))
+    return filas
+
+
+def con_diccionarios(filas: List[tuple]) -> bytes:
+    campos = list(AsistenciaEstudiante.model_fields)
+    diccionarios = [dict(zip(campos, fila)) for fila in filas]
+    adaptador = TypeAdapter(List[AsistenciaEstudiante])
+    validadas = adaptador.validate_python(diccionarios)
+    return JSONResponse(adaptador.dump_python(validadas, mode="json")).body
+
+
+def con_filas(filas: List[tuple]) -> bytes:
+    return responder_filas([AsistenciaFila(*fila) for fila in filas], AsistenciaFila).body
+
+
+def medir(funcion: Callable[[List[tuple]], bytes], filas: List[tuple], repeticiones: int) -> Tuple[float, int, bytes]:
+    """(mejor tiempo en s, pico de memoria en bytes, cuerpo)"""
+    cuerpo = funcion(filas)  # calienta cachés (TypeAdapter, esquemas)
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(filas)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    tracemalloc.start()
+    funcion(filas)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mejor, pico, cuerpo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara la serialización de listados por filas y por diccionarios")
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    filas = generar_filas(args.filas)
+    resultados = {
+        "diccionarios": medir(con_diccionarios, filas, args.repeticiones),
+        "filas": medir(con_filas, filas, args.repeticiones),
+    }
+    print(f"{args.filas} filas, mejor de {args.repeticiones}")
+    for nombre, (segundos, pico, cuerpo) in resultados.items():
+        print(f"  {nombre:<13} {segundos:7.3f} s  {pico / 2 ** 20:7.1f} MiB pico  {len(cuerpo) / 2 ** 20:6.1f} MiB JSON")
+    cuerpos = [cuerpo for _, _, cuerpo in resultados.values()]
+    identicos = cuerpos[0] == cuerpos[1]
+    print(f"  cuerpos idénticos: {'sí' if identicos else 'no'}")
+    if not identicos:
+        # Misma información con distinto formato (por ejemplo, escapes de caracteres)
+        print(f"  mismo JSON al decodificar: {'sí' if json.loads(cuerpos[0]) == json.loads(cuerpos[1]) else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
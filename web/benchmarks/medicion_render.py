@@ -0,0 +1,359 @@
+"""
+Medición local del camino crítico de render de una página pública, al estilo de la
+simulación de Lighthouse (móvil, Slow 4G).
+
+    python -m benchmarks.medicion_render                 # portada, modo normal vs optimizado
+    python -m benchmarks.medicion_render --url http://localhost:8000/
+
+Sin `--url` renderiza la página en proceso con los dos valores de RENDER_OPTIMIZADO
+(requiere el build de `python -m app.core.estaticos`); con `--url` mide lo que sirve
+ese servidor. Lee el HTML, identifica el CSS/JS que bloquea el render, las imágenes que
+se piden al inicio (eligiendo de cada `srcset` la variante que bajaría un teléfono de
+412 px y DPR 1.75) y las precargas, pide cada recurso con `Accept-Encoding: gzip` para
+saber los bytes transferidos, y estima FCP y LCP con un modelo simple: cada recurso
+cuesta un RTT más sus bytes, y los que se descargan a la vez comparten el ancho de
+banda. Los recursos de otros dominios (CDN de Tailwind, Font Awesome) no se miden: se
+listan aparte y son iguales en los dos modos.
+"""
+import argparse
+import gzip
+import re
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+# Perfil móvil de Lighthouse
+RTT_MS = 150
+KBPS = 1638.4
+ANCHO_VIEWPORT = 412
+DPR = 1.75
+# Formatos de imagen que se asumen soportados, en el orden de <source>
+FORMATOS_SOPORTADOS = ("image/avif", "image/webp", "image/jpeg", "image/png", "")
+
+
+@dataclass
+class Imagen:
+    url: str
+    slot: float
+    diferida: bool
+    prioridad_alta: bool
+
+
+@dataclass
+class Pagina:
+    css_bloqueante: List[str] = field(default_factory=list)
+    js_bloqueante: List[str] = field(default_factory=list)
+    externos: List[str] = field(default_factory=list)
+    imagenes: List[Imagen] = field(default_factory=list)
+    precargas: List[str] = field(default_factory=list)
+    css_en_linea: int = 0
+
+
+def _ancho_slot(sizes: Optional[str], viewport: int) -> float:
+    """Ancho en px CSS que `sizes` asigna a la imagen en un viewport de `viewport` px"""
+    for entrada in (sizes or "100vw").split(","):
+        entrada = entrada.strip()
+        condicion = re.match(r"\((min|max)-width:\s*(\d+)px\)\s*(.+)", entrada)
+        if condicion:
+            limite = int(condicion.group(2))
+            if (viewport >= limite) if condicion.group(1) == "min" else (viewport <= limite):
+                return _longitud(condicion.group(3), viewport)
+            continue
+        return _longitud(entrada, viewport)
+    return viewport
+
+
+def _longitud(valor: str, viewport: int) -> float:
+    numero = float(re.match(r"[\d.]+", valor).group())
+    return numero * viewport / 100 if valor.endswith("vw") else numero
+
+
+def elegir_candidato(srcset: str, slot: float, dpr: float) -> str:
+    """Variante de `srcset` que elegiría el navegador: la menor que cubre slot × DPR"""
+    candidatos = []
+    for parte in srcset.split(","):
+        url, _, descriptor = parte.strip().partition(" ")
+        ancho = int(descriptor.strip()[:-1]) if descriptor.strip().endswith("w") else 0
+        candidatos.append((ancho, url))
+    candidatos.sort()
+    necesario = slot * dpr
+    for ancho, url in candidatos:
+        if ancho >= necesario:
+            return url
+    return candidatos[-1][1]
+
+
+class _Analizador(HTMLParser):
+    def __init__(self, base: str, viewport: int, dpr: float):
+        super().__init__()
+        self.base, self.viewport, self.dpr = base, viewport, dpr
+        self.pagina = Pagina()
+        self._fuentes: Optional[List[Dict[str, str]]] = None
+        self._en_style = False
+        self._en_noscript = False
+
+    def _agregar(self, lista: List[str], url: str) -> None:
+        absoluta = urljoin(self.base, url)
+        if urlsplit(absoluta).netloc != urlsplit(self.base).netloc:
+            self.pagina.externos.append(absoluta)
+        else:
+            lista.append(absoluta)
+
+    def handle_starttag(self, etiqueta, attrs):
+        a = {nombre: valor or "" for nombre, valor in attrs}
+        if etiqueta == "noscript":
+            self._en_noscript = True
+        elif self._en_noscript:
+            return
+        elif etiqueta == "style":
+            self._en_style = True
+        elif etiqueta == "link" and a.get("rel") == "stylesheet" and a.get("media", "all") != "print":
+            self._agregar(self.pagina.css_bloqueante, a["href"])
+        elif etiqueta == "link" and a.get("rel") == "preload" and a.get("as") == "image":
+            url = a.get("href") or elegir_candidato(
+                a["imagesrcset"], _ancho_slot(a.get("imagesizes"), self.viewport), self.dpr
+            )
+            self._agregar(self.pagina.precargas, url)
+        elif etiqueta == "script" and a.get("src") and not ({"defer", "async"} & a.keys()) and a.get("type") != "module":
+            self._agregar(self.pagina.js_bloqueante, a["src"])
+        elif etiqueta == "picture":
+            self._fuentes = []
+        elif etiqueta == "source" and self._fuentes is not None:
+            self._fuentes.append(a)
+        elif etiqueta == "img":
+            self._imagen(a)
+
+    def handle_endtag(self, etiqueta):
+        if etiqueta == "picture":
+            self._fuentes = None
+        elif etiqueta == "style":
+            self._en_style = False
+        elif etiqueta == "noscript":
+            self._en_noscript = False
+
+    def handle_data(self, datos):
+        if self._en_style:
+            self.pagina.css_en_linea += len(datos.encode("utf-8"))
+
+    def _imagen(self, a: Dict[str, str]) -> None:
+        candidatas = [
+            fuente for fuente in (self._fuentes or []) if fuente.get("type", "") in FORMATOS_SOPORTADOS
+        ] + [a]
+        elegida = candidatas[0]
+        slot = _ancho_slot(elegida.get("sizes"), self.viewport)
+        url = elegir_candidato(elegida["srcset"], slot, self.dpr) if elegida.get("srcset") else a["src"]
+        absoluta = urljoin(self.base, url)
+        if urlsplit(absoluta).netloc != urlsplit(self.base).netloc:
+            self.pagina.externos.append(absoluta)
+            return
+        self.pagina.imagenes.append(
+            Imagen(absoluta, slot, a.get("loading") == "lazy", a.get("fetchpriority") == "high")
+        )
+
+
+def analizar(html: str, base: str, viewport: int = ANCHO_VIEWPORT, dpr: float = DPR) -> Pagina:
+    analizador = _Analizador(base, viewport, dpr)
+    analizador.feed(html)
+    return analizador.pagina
+
+
+@dataclass
+class Resultado:
+    html: int
+    css: int
+    js: int
+    imagenes: int
+    n_css: int
+    n_js: int
+    n_imagenes: int
+    css_en_linea: int
+    lcp_bytes: int
+    fcp_ms: float
+    lcp_ms: float
+    externos: List[str]
+
+    @property
+    def total(self) -> int:
+        return self.html + self.css + self.js + self.imagenes
+
+
+def simular(
+    pagina: Pagina, html_bytes: int, tamanos: Dict[str, int], rtt: float = RTT_MS, kbps: float = KBPS
+) -> Resultado:
+    """
+    FCP/LCP estimados: el HTML llega tras 3 RTT (conexión y petición) más su descarga;
+    el CSS/JS bloqueante se pide al leer el <head> y el primer pintado espera a que
+    termine. La imagen LCP (la mayor en pantalla, la primera si empatan) compite por el
+    ancho de banda con lo que se descarga a la vez: con precarga y prioridad alta solo
+    con lo bloqueante, sin ellas con todas las imágenes iniciales, después del CSS.
+    """
+    bytes_por_ms = kbps * 1000 / 8 / 1000
+    ttfb = 3 * rtt
+    fin_html = ttfb + html_bytes / bytes_por_ms
+
+    bloqueantes = [tamanos[url] for url in pagina.css_bloqueante + pagina.js_bloqueante]
+    iniciales = [imagen for imagen in pagina.imagenes if not imagen.diferida]
+    precargadas = set(pagina.precargas)
+
+    lcp_imagen = max(iniciales, key=lambda imagen: imagen.slot, default=None)
+    fin_bloqueo = ttfb + (rtt + sum(bloqueantes) / bytes_por_ms if bloqueantes else 0)
+    fcp = max(fin_html, fin_bloqueo)
+
+    lcp = fcp
+    lcp_bytes = html_bytes + sum(bloqueantes)
+    if lcp_imagen is not None:
+        propio = tamanos[lcp_imagen.url]
+        if lcp_imagen.url in precargadas or lcp_imagen.prioridad_alta:
+            inicio = ttfb if lcp_imagen.url in precargadas else fin_html
+            compartidos = sum(min(propio, tamano) for tamano in bloqueantes)
+            lcp_bytes += propio
+        else:
+            inicio = fin_bloqueo
+            otras = [tamanos[imagen.url] for imagen in iniciales if imagen.url != lcp_imagen.url]
+            compartidos = sum(min(propio, tamano) for tamano in otras)
+            lcp_bytes += propio + compartidos
+        lcp = max(fcp, inicio + rtt + (propio + compartidos) / bytes_por_ms)
+
+    urls_imagenes = {imagen.url for imagen in iniciales} | precargadas
+    return Resultado(
+        html=html_bytes,
+        css=sum(tamanos[url] for url in pagina.css_bloqueante),
+        js=sum(tamanos[url] for url in pagina.js_bloqueante),
+        imagenes=sum(tamanos[url] for url in urls_imagenes),
+        n_css=len(pagina.css_bloqueante),
+        n_js=len(pagina.js_bloqueante),
+        n_imagenes=len(urls_imagenes),
+        css_en_linea=pagina.css_en_linea,
+        lcp_bytes=lcp_bytes,
+        fcp_ms=fcp,
+        lcp_ms=lcp,
+        externos=sorted(set(pagina.externos)),
+    )
+
+
+# Obtener: url -> (bytes transferidos, cuerpo descomprimido)
+Obtener = Callable[[str], Tuple[int, bytes]]
+
+
+def obtener_http(url: str) -> Tuple[int, bytes]:
+    peticion = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+    with urllib.request.urlopen(peticion) as respuesta:
+        datos = respuesta.read()
+        cuerpo = gzip.decompress(datos) if respuesta.headers.get("Content-Encoding") == "gzip" else datos
+    return len(datos), cuerpo
+
+
+def obtener_en_proceso() -> Obtener:
+    """
+    Cliente de prueba sobre la app, sin lifespan. Las páginas públicas leen noticias y
+    eventos, así que usa la base de datos de DATABASE_URL.
+    """
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    cliente = TestClient(app)
+
+    def obtener(url: str) -> Tuple[int, bytes]:
+        partes = urlsplit(url)
+        respuesta = cliente.get(partes.path + (f"?{partes.query}" if partes.query else ""),
+                                headers={"Accept-Encoding": "gzip"})
+        respuesta.raise_for_status()
+        transferidos = int(respuesta.headers.get("content-length", len(respuesta.content)))
+        return transferidos, respuesta.content
+
+    return obtener
+
+
+# Nombre de cada columna de la comparación en proceso y su valor de RENDER_OPTIMIZADO
+MODOS = (("normal", False), ("optimizado", True))
+
+
+@contextmanager
+def modo_render(optimizado: bool) -> Iterator[None]:
+    """
+    RENDER_OPTIMIZADO = `optimizado` dentro del bloque, con la caché de páginas apagada:
+    con ella el segundo modo recibiría el HTML que guardó el primero.
+    """
+    from app.core.configs import settings
+
+    originales = settings.RENDER_OPTIMIZADO, settings.PAGINAS_CACHE_ACTIVA
+    settings.RENDER_OPTIMIZADO, settings.PAGINAS_CACHE_ACTIVA = optimizado, False
+    try:
+        yield
+    finally:
+        settings.RENDER_OPTIMIZADO, settings.PAGINAS_CACHE_ACTIVA = originales
+
+
+def medir(url: str, obtener: Obtener, rtt: float = RTT_MS, kbps: float = KBPS) -> Resultado:
+    html_bytes, html = obtener(url)
+    pagina = analizar(html.decode("utf-8"), url)
+    urls = set(pagina.css_bloqueante + pagina.js_bloqueante + pagina.precargas)
+    urls.update(imagen.url for imagen in pagina.imagenes if not imagen.diferida)
+    tamanos = {recurso: obtener(recurso)[0] for recurso in urls}
+    return simular(pagina, html_bytes, tamanos, rtt, kbps)
+
+
+def _kb(valor: float) -> str:
+    return f"{valor / 1024:.1f} KB"
+
+
+FILAS = (
+    ("HTML", lambda r: _kb(r.html)),
+    ("CSS en línea", lambda r: _kb(r.css_en_linea)),
+    ("CSS bloqueante", lambda r: f"{r.n_css} archivos, {_kb(r.css)}"),
+    ("JS bloqueante", lambda r: f"{r.n_js} archivos, {_kb(r.js)}"),
+    ("Imágenes iniciales", lambda r: f"{r.n_imagenes}, {_kb(r.imagenes)}"),
+    ("Bytes hasta LCP", lambda r: _kb(r.lcp_bytes)),
+    ("Bytes iniciales", lambda r: _kb(r.total)),
+    ("FCP estimado", lambda r: f"{r.fcp_ms / 1000:.2f} s"),
+    ("LCP estimado", lambda r: f"{r.lcp_ms / 1000:.2f} s"),
+)
+
+
+def imprimir(resultados: Dict[str, Resultado]) -> None:
+    columnas = list(resultados)
+    print(f"{'':<20}" + "".join(f"{columna:>26}" for columna in columnas))
+    for nombre, formato in FILAS:
+        print(f"{nombre:<20}" + "".join(f"{formato(resultados[c]):>26}" for c in columnas))
+    externos = sorted({url for resultado in resultados.values() for url in resultado.externos})
+    if externos:
+        print("\nNo medidos (otros dominios):")
+        for url in externos:
+            print(f"  {url}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Medición simulada (Slow 4G) del render de una página pública")
+    parser.add_argument("--url", help="Página de un servidor en marcha; sin ella se comparan los dos modos en proceso")
+    parser.add_argument("--ruta", default="/", help="Ruta a medir en proceso (por defecto la portada)")
+    parser.add_argument("--rtt", type=float, default=RTT_MS, help="RTT en ms")
+    parser.add_argument("--kbps", type=float, default=KBPS, help="Ancho de banda de bajada en kbps")
+    args = parser.parse_args()
+
+    if args.url:
+        inicio = time.perf_counter()
+        resultado = medir(args.url, obtener_http, args.rtt, args.kbps)
+        imprimir({args.url: resultado})
+        print(f"\nMedido en {time.perf_counter() - inicio:.1f} s")
+        return
+
+    from app.core.estaticos import cargar_manifiesto
+
+    if "css_critico" not in cargar_manifiesto():
+        print("Sin build de estáticos: ejecutar antes `python -m app.core.estaticos`")
+    obtener = obtener_en_proceso()
+    resultados = {}
+    for nombre, optimizado in MODOS:
+        with modo_render(optimizado):
+            resultados[nombre] = medir(f"http://testserver{args.ruta}", obtener, args.rtt, args.kbps)
+    print(f"Simulación: RTT {args.rtt:.0f} ms, {args.kbps:.0f} kbps, viewport {ANCHO_VIEWPORT}px @ {DPR}x\n")
+    imprimir(resultados)
+
+
+if __name__ == "__main__":
+    main()
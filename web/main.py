@@ -1,14 +1,54 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI, Request
+from typing import Optional
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from datetime import datetime
+from sqlalchemy.orm import Session
 
-from app.api.v1.api_router import api_router
+from app.api.v1.api_router import RUTAS_CACHE_HTTP, api_router
+from app.api.v1.deps import get_current_user, get_db
+from app.core.cache_http import MiddlewareCacheHttp
+from app.core.cache_paginas import MiddlewareCachePaginas, caducar_pagina_en, metricas as metricas_cache_paginas
+from app.core.campos import CamposInvalidos
+from app.core.compresion import MiddlewareCompresion
+from app.core.estaticos import ArchivosEstaticos
+from app.core.paginacion import CABECERA_CURSOR, CursorInvalido
+from app.core.plantillas import precompilar_plantillas, templates
+from app.db.cache_consultas import metricas as metricas_cache_consultas
+from app.db.conexiones import CABECERA_CHECKOUTS, CABECERA_COMMITS, MiddlewareConexiones, metricas as metricas_conexiones
+from app.db.snapshot_referencia import resumen_snapshot
+from app.modules.eventos import crud as eventos_crud
+from app.modules.junta_patronato import crud as junta_patronato_crud
+from app.modules.noticias import crud as noticias_crud
+from app.modules.notificacion.buffer_lectura import vaciar_buffer_lecturas
+from app.modules.usuarios.schemas import UsuarioOut
 
-app = FastAPI(title="Sistema Escolar - Escuela Manuela Santamaría")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Todas las plantillas compiladas antes de la primera petición
+    precompilar_plantillas()
+    yield
+    # No perder las marcas de lectura que estén esperando en el buffer
+    await vaciar_buffer_lecturas()
+
+
+app = FastAPI(title="Sistema Escolar - Escuela Manuela Santamaría", lifespan=lifespan)
+
+app.add_middleware(MiddlewareCacheHttp, rutas=RUTAS_CACHE_HTTP)
+
+# Páginas públicas servidas desde memoria, ya comprimidas; ruta -> claves sustitutas para purgar
+# (las claves "noticias", "eventos" y "junta_patronato" las purgan los crud al publicar)
+PAGINAS_CACHEADAS = {
+    "/": ("inicio", noticias_crud.CLAVE_PAGINAS, eventos_crud.CLAVE_PAGINAS),
+    "/noticias": (noticias_crud.CLAVE_PAGINAS,),
+    "/junta-patronato": (junta_patronato_crud.CLAVE_PAGINAS,),
+}
+app.add_middleware(MiddlewareCachePaginas, rutas=PAGINAS_CACHEADAS)
+
+# Fuera de la caché HTTP: las respuestas servidas desde ella también llevan X-DB-Checkouts/X-DB-Commits
+app.add_middleware(MiddlewareConexiones)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,39 +56,87 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CABECERA_CURSOR, CABECERA_CHECKOUTS, CABECERA_COMMITS],
 )
 
+# El más externo: comprime la respuesta final (API, páginas y estáticos no precomprimidos)
+app.add_middleware(MiddlewareCompresion)
+
+
+@app.exception_handler(CursorInvalido)
+async def cursor_invalido(request: Request, exc: CursorInvalido):
+    return JSONResponse(status_code=400, content={"detail": "Cursor de paginación inválido"})
+
+
+@app.exception_handler(CamposInvalidos)
+async def campos_invalidos(request: Request, exc: CamposInvalidos):
+    return JSONResponse(status_code=400, content={"detail": f"Campos desconocidos en fields: {exc}"})
+
+
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "app" / "static"
-TEMPLATES_DIR = BASE_DIR / "app" / "templates"
 
 
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
-templates.env.globals["now"] = datetime.utcnow
+# Sirve los .br/.gz generados por `python -m app.core.estaticos` y cachea para siempre los archivos con huella
+app.mount("/static", ArchivosEstaticos(directory=str(STATIC_DIR)), name="static")
+
 
+# Elementos del feed en cada página pública
+NOTICIAS_PORTADA = 3
+EVENTOS_PORTADA = 3
+NOTICIAS_POR_PAGINA = 10
+INFORMES_POR_PAGINA = 10
 
+
+# Las páginas públicas leen el contenido de la base de datos por los feeds paginados
+# (caché de consultas) y el HTML resultante queda en la caché de páginas hasta que se publica algo
 @app.get("/", response_class=HTMLResponse, tags=["Frontend"])
-async def home(request: Request):
-    return templates.TemplateResponse(
+def home(request: Request, db: Session = Depends(get_db)):
+    noticias, _ = noticias_crud.get_noticias(db, limit=NOTICIAS_PORTADA)
+    eventos, _ = eventos_crud.get_eventos(db, limit=EVENTOS_PORTADA, solo_publicos=True, solo_proximos=True)
+    respuesta = templates.TemplateResponse(
+        request,
         "home.html",
-        {"request": request, "title": "Inicio • Escuela Manuela Santamaría"},
+        {"title": "Inicio • Escuela Manuela Santamaría", "noticias": noticias, "eventos": eventos},
     )
+    if eventos:
+        # Cuando empieza el primer evento deja de ser próximo: la página cacheada caduca entonces
+        caducar_pagina_en(respuesta, eventos[0].fecha_hora)
+    return respuesta
 
-# Placeholder: Junta y Patronato
-@app.get("/junta-patronato", response_class=HTMLResponse, name="junta_patronato")
-async def junta_patronato(request: Request):
+@app.get("/noticias", response_class=HTMLResponse, name="noticias", tags=["Frontend"])
+def noticias(request: Request, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    noticias, next_cursor = noticias_crud.get_noticias(db, limit=NOTICIAS_POR_PAGINA, cursor=cursor)
     return templates.TemplateResponse(
+        request,
+        "noticias.html",
+        {"page_title": "Noticias", "noticias": noticias, "next_cursor": next_cursor, "primera_pagina": cursor is None}
+    )
+
+@app.get("/junta-patronato", response_class=HTMLResponse, name="junta_patronato", tags=["Frontend"])
+def junta_patronato(request: Request, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    miembros = junta_patronato_crud.get_miembros(db)
+    informes, next_cursor = junta_patronato_crud.get_informes(db, limit=INFORMES_POR_PAGINA, cursor=cursor)
+    return templates.TemplateResponse(
+        request,
         "junta_patronato.html",
-        {"request": request, "page_title": "Junta y Patronato"}
+        {
+            "page_title": "Junta y Patronato",
+            "junta": [miembro for miembro in miembros if miembro.tipo == "junta"],
+            "patronato": [miembro for miembro in miembros if miembro.tipo == "patronato"],
+            "informes": informes,
+            "next_cursor": next_cursor,
+            "cuentas": junta_patronato_crud.get_cuentas_donacion(db, solo_activas=True),
+        }
     )
 
 # Placeholder: Login
 @app.get("/login", response_class=HTMLResponse, name="login")
 async def login(request: Request):
     return templates.TemplateResponse(
+        request,
         "login.html",
-        {"request": request, "page_title": "Acceder al Portal"}
+        {"page_title": "Acceder al Portal"}
     )
 
 # Salud JSON para monitoreo
@@ -56,5 +144,22 @@ async def login(request: Request):
 def health():
     return JSONResponse({"status": "ok", "service": "escuela-api"})
 
+# Métricas de la caché de consultas ORM (aciertos por consulta), estado del snapshot de referencia,
+# conexiones tomadas del pool por las peticiones de este worker y caché de páginas públicas.
+# Solo para la dirección: expone consultas y rutas internas
+@app.get("/api/health/cache", tags=["Base"])
+def health_cache(current_user: UsuarioOut = Depends(get_current_user)):
+    if current_user.rol != "direccion":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tiene permisos para ver las métricas"
+        )
+    return JSONResponse({
+        **metricas_cache_consultas.resumen(),
+        "snapshot_referencia": resumen_snapshot(),
+        "conexiones": metricas_conexiones.resumen(),
+        "paginas": metricas_cache_paginas.resumen(),
+    })
+
 # Rutas de API existentes
 app.include_router(api_router)
@@ -0,0 +1,59 @@
+"""
+Las pruebas corren contra la base de datos de TEST_DATABASE_URL o, si no está definida,
+contra una SQLite temporal; nunca contra la de DATABASE_URL. Las tablas se crean desde
+los modelos al inicio de la sesión.
+"""
+import os
+import tempfile
+import uuid
+from typing import Callable, Dict, Tuple
+
+import pytest
+
+_DIRECTORIO = tempfile.mkdtemp(prefix="escuela-pruebas-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{_DIRECTORIO}/pruebas.db")
+os.environ.setdefault("JWT_SECRET_KEY", "pruebas")
+os.environ["REFERENCIA_SNAPSHOT_DIR"] = _DIRECTORIO
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.security import crear_token_acceso  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.modules.usuarios.models import Usuario  # noqa: E402
+from main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tablas():
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def cliente() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def crear_usuario() -> Callable[..., Tuple[uuid.UUID, Dict[str, str]]]:
+    """Crea un usuario activo y devuelve (id, cabeceras con su token)"""
+
+    def crear(rol: str = "direccion", nombre: str = "Usuario de prueba") -> Tuple[uuid.UUID, Dict[str, str]]:
+        with SessionLocal() as db:
+            usuario = Usuario(
+                id_usuario=uuid.uuid4(),
+                nombre=nombre,
+                correo=f"{uuid.uuid4().hex[:12]}@pruebas.com",
+                rol=rol,
+                contrasena_hash="x",
+                activo=True,
+            )
+            db.add(usuario)
+            db.commit()
+            id_usuario = usuario.id_usuario
+        token = crear_token_acceso({"sub": str(id_usuario), "rol": rol})
+        return id_usuario, {"Authorization": f"Bearer {token}"}
+
+    return crear
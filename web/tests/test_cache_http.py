@@ -0,0 +1,22 @@
+RUTA = "/materias/obtener-materias"
+
+
+def test_usuario_eliminado_no_recibe_la_respuesta_cacheada(cliente, crear_usuario):
+    _, cabeceras_direccion = crear_usuario("direccion")
+    id_profesor, cabeceras = crear_usuario("profesor")
+
+    primera = cliente.get(RUTA, headers=cabeceras)
+    assert primera.status_code == 200
+    # La segunda sale de la caché: un If-None-Match que coincide recibe 304
+    segunda = cliente.get(RUTA, headers={**cabeceras, "If-None-Match": primera.headers["etag"]})
+    assert segunda.status_code == 304
+
+    respuesta = cliente.delete(f"/usuarios/eliminar/{id_profesor}", headers=cabeceras_direccion)
+    assert respuesta.status_code == 200
+
+    # El token sigue vigente, pero el usuario ya no existe
+    assert cliente.get(RUTA, headers=cabeceras).status_code == 401
+    assert cliente.get(RUTA, headers={**cabeceras, "If-None-Match": primera.headers["etag"]}).status_code == 401
+    # Los demás usuarios con ese rol siguen usando la caché
+    _, otras = crear_usuario("profesor")
+    assert cliente.get(RUTA, headers={**otras, "If-None-Match": primera.headers["etag"]}).status_code == 304
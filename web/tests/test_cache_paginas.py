@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+
+from app.core.cache_paginas import CABECERA_CADUCA, MiddlewareCachePaginas, caducar_pagina_en, purgar_paginas
+from app.core.configs import settings
+
+
+def _app_con_pagina(estado: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/pagina")
+    def pagina():
+        respuesta = HTMLResponse("<p>Próximo evento</p>", status_code=estado)
+        caducar_pagina_en(respuesta, datetime.now() + timedelta(minutes=5))
+        return respuesta
+
+    app.add_middleware(MiddlewareCachePaginas, rutas={"/pagina": ("prueba",)})
+    return app
+
+
+@pytest.mark.parametrize("cache_activa, estado", [(True, 200), (True, 404), (False, 200)])
+def test_cabecera_caduca_no_llega_al_cliente(monkeypatch, cache_activa, estado):
+    monkeypatch.setattr(settings, "PAGINAS_CACHE_ACTIVA", cache_activa)
+    purgar_paginas("prueba")
+    respuesta = TestClient(_app_con_pagina(estado)).get("/pagina")
+    assert respuesta.status_code == estado
+    assert CABECERA_CADUCA not in respuesta.headers
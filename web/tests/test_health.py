@@ -0,0 +1,16 @@
+import pytest
+
+RUTA = "/api/health/cache"
+
+
+def test_metricas_sin_token(cliente):
+    assert cliente.get(RUTA).status_code == 401
+
+
+@pytest.mark.parametrize("rol, estado", [("direccion", 200), ("profesor", 403), ("padre", 403)])
+def test_metricas_solo_para_direccion(cliente, crear_usuario, rol, estado):
+    _, cabeceras = crear_usuario(rol)
+    respuesta = cliente.get(RUTA, headers=cabeceras)
+    assert respuesta.status_code == estado
+    if estado == 200:
+        assert "conexiones" in respuesta.json()
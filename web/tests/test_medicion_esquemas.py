@@ -0,0 +1,20 @@
+import json
+
+import pytest
+
+from benchmarks import medicion_esquemas
+
+ESQUEMAS = medicion_esquemas.esquemas_de_respuesta()
+
+
+def test_encuentra_los_esquemas_de_respuesta():
+    nombres = {esquema.__name__ for esquema in ESQUEMAS}
+    assert {"NotificacionOut", "UsuarioOut", "Seccion", "AsistenciaEstudiante"} <= nombres
+
+
+@pytest.mark.parametrize("esquema", ESQUEMAS, ids=lambda esquema: f"{esquema.__module__.split('.')[2]}.{esquema.__name__}")
+def test_los_caminos_producen_el_mismo_json(esquema):
+    objetos = medicion_esquemas.generar_objetos(esquema, 5)
+    cuerpos = [json.loads(funcion(objetos)) for funcion in medicion_esquemas.caminos(esquema).values()]
+    assert len(cuerpos[0]) == 5
+    assert all(cuerpo == cuerpos[0] for cuerpo in cuerpos)
@@ -0,0 +1,23 @@
+import pytest
+
+from app.core.estaticos import cargar_manifiesto
+from benchmarks import medicion_render
+
+
+def test_los_dos_modos_comparan_html_distinto(cliente):
+    if "css_critico" not in cargar_manifiesto():
+        pytest.skip("Sin build de estáticos: ejecutar antes `python -m app.core.estaticos`")
+    # La portada queda en la caché de páginas antes de comparar
+    assert cliente.get("/").status_code == 200
+
+    obtener = medicion_render.obtener_en_proceso()
+    html = {}
+    for nombre, optimizado in medicion_render.MODOS:
+        with medicion_render.modo_render(optimizado):
+            html[nombre] = obtener("http://testserver/")[1].decode("utf-8")
+
+    assert html["normal"] != html["optimizado"]
+    normal = medicion_render.analizar(html["normal"], "http://testserver/")
+    optimizado = medicion_render.analizar(html["optimizado"], "http://testserver/")
+    assert len(optimizado.css_bloqueante) < len(normal.css_bloqueante)
+    assert optimizado.css_en_linea > normal.css_en_linea
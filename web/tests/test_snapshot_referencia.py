@@ -0,0 +1,87 @@
+import os
+import struct
+import uuid
+from datetime import date
+
+import pytest
+
+from app.db.escritura import actualizar, insertar
+from app.db.session import SessionLocal
+from app.db.snapshot_referencia import (
+    MAGIA, SnapshotReferencia, _archivo_vigente, _serializar, obtener_snapshot, ruta_snapshot
+)
+from app.modules.profesores import crud as profesores_crud
+from app.modules.usuarios import crud as usuarios_crud
+from app.modules.usuarios.models import Profesor, Usuario
+
+MATERIA = (uuid.uuid4(), "Matemáticas")
+ANIO = (uuid.uuid4(), "2026", date(2026, 2, 2), date(2026, 12, 4), True)
+PROFESOR = (uuid.uuid4(), "Ana Solís", "ana@escuela.cr")
+SECCION = (uuid.uuid4(), "4-1", "Cuarto", PROFESOR[0], ANIO[0])
+
+
+def test_busquedas_por_id(tmp_path):
+    ruta = tmp_path / "referencia.snap"
+    ruta.write_bytes(_serializar([MATERIA], [SECCION, (uuid.uuid4(), "4-2", "Cuarto", None, ANIO[0])], [ANIO], [PROFESOR]))
+    snapshot = SnapshotReferencia(str(ruta))
+
+    assert tuple(snapshot.materia(MATERIA[0])) == MATERIA
+    assert tuple(snapshot.seccion(SECCION[0])) == SECCION
+    assert tuple(snapshot.anio_lectivo(ANIO[0])) == ANIO
+    assert tuple(snapshot.profesor(PROFESOR[0])) == PROFESOR
+    assert snapshot.materia(uuid.uuid4()) is None
+    assert snapshot.resumen()["secciones"] == 2
+
+
+def test_archivo_de_otro_formato_se_reconstruye(tmp_path):
+    ruta = tmp_path / "referencia.snap"
+    assert not _archivo_vigente(str(ruta))
+    ruta.write_bytes(_serializar([MATERIA], [], [], []))
+    assert _archivo_vigente(str(ruta))
+    ruta.write_bytes(struct.pack("<4sH", MAGIA, 1) + ruta.read_bytes()[6:])
+    assert not _archivo_vigente(str(ruta))
+
+
+def _descarta_snapshot(escribir) -> bool:
+    """Indica si confirmar la escritura borró el archivo del snapshot"""
+    assert obtener_snapshot() is not None and os.path.exists(ruta_snapshot())
+    with SessionLocal() as db:
+        escribir(db)
+        db.commit()
+    return not os.path.exists(ruta_snapshot())
+
+
+@pytest.fixture
+def profesor(crear_usuario):
+    # Como crear_usuario con rol profesor (usuarios/crud.py): también su fila en `profesor`
+    id_profesor, _ = crear_usuario("profesor", "Ana Solís")
+    with SessionLocal() as db:
+        db.add(Profesor(id_profesor=id_profesor))
+        db.commit()
+    return id_profesor
+
+
+def test_cambios_de_profesores_descartan_el_snapshot():
+    id_profesor = None
+
+    def alta(db):
+        nonlocal id_profesor
+        usuario = insertar(db, Usuario, nombre="Ana Solís", correo="ana@escuela.cr", rol="profesor", contrasena_hash="x")
+        id_profesor = usuario.id_usuario
+        db.add(Profesor(id_profesor=id_profesor))
+
+    assert _descarta_snapshot(alta)
+    assert obtener_snapshot().profesor(id_profesor).nombre == "Ana Solís"
+    assert _descarta_snapshot(lambda db: profesores_crud.actualizar_profesor(db, id_profesor, "Ana Solís Mora", "ana@escuela.cr"))
+    assert obtener_snapshot().profesor(id_profesor).nombre == "Ana Solís Mora"
+    assert _descarta_snapshot(lambda db: profesores_crud.eliminar_profesor(db, id_profesor))
+    assert obtener_snapshot().profesor(id_profesor) is None
+
+
+def test_otras_escrituras_en_usuario_no_descartan_el_snapshot(profesor, crear_usuario):
+    assert obtener_snapshot().profesor(profesor) is not None
+    # La sentencia de actualizar_contrasena y restaurar_contrasena
+    assert not _descarta_snapshot(lambda db: actualizar(db, Usuario, profesor, {"contrasena_hash": "y"}))
+    assert not _descarta_snapshot(lambda db: insertar(db, Usuario, nombre="Luis", correo="luis@escuela.cr", rol="padre", contrasena_hash="x"))
+    id_padre, _ = crear_usuario("padre")
+    assert not _descarta_snapshot(lambda db: usuarios_crud.eliminar_usuario_por_id(db, id_padre))
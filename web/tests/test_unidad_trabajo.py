@@ -0,0 +1,28 @@
+from app.core.pubsub import obtener_transporte
+from app.db.conexiones import CABECERA_COMMITS
+from app.modules.notificacion.eventos import CANAL_NOTIFICACIONES
+
+AVISO = {"titulo": "Reunión", "contenido": "Reunión de padres", "fecha_envio": "2026-03-02T08:00:00"}
+
+
+def test_aviso_que_notifica_confirma_una_vez(cliente, crear_usuario):
+    _, cabeceras = crear_usuario("direccion")
+    id_profesor, _ = crear_usuario("profesor")
+    publicados = []
+    obtener_transporte().suscribir(CANAL_NOTIFICACIONES, publicados.append)
+
+    for numero in (1, 2):
+        respuesta = cliente.post("/avisos/crear-aviso", headers=cabeceras, json={**AVISO, "destinatario": "profesores"})
+        assert respuesta.status_code == 201
+        assert respuesta.headers[CABECERA_COMMITS] == "1"
+
+        # Las notificaciones se crearon y salieron numeradas en la misma transacción
+        destinos = {id_usuario: id_evento for id_usuario, _, id_evento in publicados[-1]["destinos"]}
+        assert destinos[str(id_profesor)] == numero
+
+
+def test_lectura_no_confirma(cliente, crear_usuario):
+    _, cabeceras = crear_usuario("direccion")
+    respuesta = cliente.get("/avisos/obtener-avisos", headers=cabeceras)
+    assert respuesta.status_code == 200
+    assert respuesta.headers[CABECERA_COMMITS] == "0"